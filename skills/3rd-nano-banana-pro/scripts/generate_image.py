@@ -11,13 +11,23 @@ Generate images using Google's Nano Banana Pro (Gemini 3 Pro Image) API.
 
 Usage:
     uv run generate_image.py --prompt "your image description" --filename "output.png" [--resolution 1K|2K|4K] [--api-key KEY]
+    uv run generate_image.py --server  # one JSON request per stdin line, one JSON reply per stdout line
 """
 
 import argparse
+import contextlib
+import io
+import json
 import os
 import sys
 from pathlib import Path
 
+DEFAULT_MODEL = "models/gemini-3-pro-image-preview"
+
+
+class ImageGenerationError(RuntimeError):
+    """Generation failed; the message is ready to show to the user."""
+
 
 def get_api_key(provided_key: str | None) -> str | None:
     """Get API key from argument first, then environment."""
@@ -26,18 +36,161 @@ def get_api_key(provided_key: str | None) -> str | None:
     return os.environ.get("GEMINI_API_KEY")
 
 
+def response_parts(response):
+    """Return the content parts of a response, looking into candidates if needed."""
+    parts = getattr(response, "parts", None)
+    if not parts and getattr(response, "candidates", None):
+        for candidate in response.candidates:
+            content = getattr(candidate, "content", None)
+            if content and getattr(content, "parts", None):
+                return content.parts
+    return parts
+
+
+def generate_image(
+    client,
+    prompt: str,
+    filename: str,
+    input_image: list[str] | None = None,
+    resolution: str = "1K",
+    model: str = DEFAULT_MODEL,
+) -> Path:
+    """Generate (or edit) one image and save it as PNG. Returns the output path."""
+    from google.genai import types
+    from PIL import Image as PILImage
+
+    # Set up output path
+    output_path = Path(filename)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Load input image if provided
+    input_images = []
+    output_resolution = resolution
+    if input_image:
+        try:
+            for image_path in input_image:
+                image = PILImage.open(image_path)
+                input_images.append(image)
+                print(f"Loaded input image: {image_path}")
+
+            # Auto-detect resolution if not explicitly set by user
+            if resolution == "1K":  # Default value
+                # Map input image size to resolution
+                max_dim = 0
+                for image in input_images:
+                    width, height = image.size
+                    max_dim = max(max_dim, width, height)
+                if max_dim >= 3000:
+                    output_resolution = "4K"
+                elif max_dim >= 1500:
+                    output_resolution = "2K"
+                else:
+                    output_resolution = "1K"
+                print(f"Auto-detected resolution: {output_resolution} (from input max dim {max_dim}px)")
+        except Exception as e:
+            raise ImageGenerationError(f"Error loading input image: {e}") from e
+
+    # Build contents (image first if editing, prompt only if generating)
+    if input_images:
+        contents = input_images + [prompt]
+        print(f"Editing image with resolution {output_resolution}...")
+    else:
+        contents = prompt
+        print(f"Generating image with resolution {output_resolution}...")
+
+    config = types.GenerateContentConfig(response_modalities=["TEXT", "IMAGE"])
+    response = client.models.generate_content(model=model, contents=contents, config=config)
+
+    # Process response and convert to PNG
+    image_saved = False
+    parts = response_parts(response)
+    if not parts:
+        # Retry once to reduce transient failures.
+        response = client.models.generate_content(model=model, contents=contents, config=config)
+        parts = response_parts(response)
+    if not parts:
+        try:
+            print(f"Response debug: {response}", file=sys.stderr)
+            if hasattr(response, "model_dump"):
+                print(f"Response dump: {response.model_dump()}", file=sys.stderr)
+        except Exception:
+            pass
+        raise ImageGenerationError("Error: No response parts found in model output.")
+    for part in parts:
+        if part.text is not None:
+            print(f"Model response: {part.text}")
+        elif part.inline_data is not None:
+            # Convert inline data to PIL Image and save as PNG
+            # inline_data.data is already bytes, not base64
+            image_data = part.inline_data.data
+            if isinstance(image_data, str):
+                # If it's a string, it might be base64
+                import base64
+                image_data = base64.b64decode(image_data)
+
+            image = PILImage.open(io.BytesIO(image_data))
+
+            # Ensure RGB mode for PNG (convert RGBA to RGB with white background if needed)
+            if image.mode == 'RGBA':
+                rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
+                rgb_image.paste(image, mask=image.split()[3])
+                rgb_image.save(str(output_path), 'PNG')
+            elif image.mode == 'RGB':
+                image.save(str(output_path), 'PNG')
+            else:
+                image.convert('RGB').save(str(output_path), 'PNG')
+            image_saved = True
+
+    if not image_saved:
+        raise ImageGenerationError("Error: No image was generated in the response.")
+    return output_path
+
+
+def serve(client, resolution: str, model: str) -> None:
+    """Answer generation requests from stdin until it is closed.
+
+    Each request is a JSON object with "prompt", "filename" and optionally
+    "input_image" (path or list of paths), "resolution" and "model". Each reply
+    is {"ok": true, "path": ...} or {"ok": false, "error": ...}.
+    """
+    out = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            input_image = request.get("input_image")
+            if isinstance(input_image, str):
+                input_image = [input_image]
+            # Progress chatter would corrupt the reply stream.
+            with contextlib.redirect_stdout(io.StringIO()):
+                output_path = generate_image(
+                    client,
+                    request["prompt"],
+                    request["filename"],
+                    input_image=input_image,
+                    resolution=request.get("resolution", resolution),
+                    model=request.get("model", model),
+                )
+            reply = {"ok": True, "path": str(output_path.resolve())}
+        except ImageGenerationError as e:
+            reply = {"ok": False, "error": str(e)}
+        except Exception as e:
+            reply = {"ok": False, "error": f"Error generating image: {e}"}
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate images using Nano Banana Pro (Gemini 3 Pro Image)"
     )
     parser.add_argument(
         "--prompt", "-p",
-        required=True,
         help="Image description/prompt"
     )
     parser.add_argument(
         "--filename", "-f",
-        required=True,
         help="Output filename (e.g., sunset-mountains.png)"
     )
     parser.add_argument(
@@ -53,15 +206,22 @@ def main():
     )
     parser.add_argument(
         "--model",
-        default="models/gemini-3-pro-image-preview",
-        help="Model name (default: models/gemini-3-pro-image-preview)"
+        default=DEFAULT_MODEL,
+        help=f"Model name (default: {DEFAULT_MODEL})"
     )
     parser.add_argument(
         "--api-key", "-k",
         help="Gemini API key (overrides GEMINI_API_KEY env var)"
     )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Keep running and serve JSON-line requests from stdin (reuses one client)"
+    )
 
     args = parser.parse_args()
+    if not args.server and not (args.prompt and args.filename):
+        parser.error("--prompt and --filename are required unless --server is used")
 
     # Get API key
     api_key = get_api_key(args.api_key)
@@ -74,129 +234,33 @@ def main():
 
     # Import here after checking API key to avoid slow import on error
     from google import genai
-    from google.genai import types
-    from PIL import Image as PILImage
 
     # Initialise client
     client = genai.Client(api_key=api_key)
 
-    # Set up output path
-    output_path = Path(args.filename)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Load input image if provided
-    input_images = []
-    output_resolution = args.resolution
-    if args.input_image:
-        try:
-            for image_path in args.input_image:
-                image = PILImage.open(image_path)
-                input_images.append(image)
-                print(f"Loaded input image: {image_path}")
-
-            # Auto-detect resolution if not explicitly set by user
-            if args.resolution == "1K":  # Default value
-                # Map input image size to resolution
-                max_dim = 0
-                for image in input_images:
-                    width, height = image.size
-                    max_dim = max(max_dim, width, height)
-                if max_dim >= 3000:
-                    output_resolution = "4K"
-                elif max_dim >= 1500:
-                    output_resolution = "2K"
-                else:
-                    output_resolution = "1K"
-                print(f"Auto-detected resolution: {output_resolution} (from input max dim {max_dim}px)")
-        except Exception as e:
-            print(f"Error loading input image: {e}", file=sys.stderr)
-            sys.exit(1)
-
-    # Build contents (image first if editing, prompt only if generating)
-    if input_images:
-        contents = input_images + [args.prompt]
-        print(f"Editing image with resolution {output_resolution}...")
-    else:
-        contents = args.prompt
-        print(f"Generating image with resolution {output_resolution}...")
+    if args.server:
+        serve(client, args.resolution, args.model)
+        return
 
     try:
-        response = client.models.generate_content(
+        output_path = generate_image(
+            client,
+            args.prompt,
+            args.filename,
+            input_image=args.input_image,
+            resolution=args.resolution,
             model=args.model,
-            contents=contents,
-            config=types.GenerateContentConfig(response_modalities=["TEXT", "IMAGE"]),
         )
-
-        # Process response and convert to PNG
-        image_saved = False
-        parts = getattr(response, "parts", None)
-        if not parts and getattr(response, "candidates", None):
-            for candidate in response.candidates:
-                content = getattr(candidate, "content", None)
-                if content and getattr(content, "parts", None):
-                    parts = content.parts
-                    break
-        if not parts:
-            # Retry once to reduce transient failures.
-            response = client.models.generate_content(
-                model=args.model,
-                contents=contents,
-                config=types.GenerateContentConfig(response_modalities=["TEXT", "IMAGE"]),
-            )
-            parts = getattr(response, "parts", None)
-            if not parts and getattr(response, "candidates", None):
-                for candidate in response.candidates:
-                    content = getattr(candidate, "content", None)
-                    if content and getattr(content, "parts", None):
-                        parts = content.parts
-                        break
-        if not parts:
-            print("Error: No response parts found in model output.", file=sys.stderr)
-            try:
-                print(f"Response debug: {response}", file=sys.stderr)
-                if hasattr(response, "model_dump"):
-                    print(f"Response dump: {response.model_dump()}", file=sys.stderr)
-            except Exception:
-                pass
-            sys.exit(1)
-        for part in parts:
-            if part.text is not None:
-                print(f"Model response: {part.text}")
-            elif part.inline_data is not None:
-                # Convert inline data to PIL Image and save as PNG
-                from io import BytesIO
-
-                # inline_data.data is already bytes, not base64
-                image_data = part.inline_data.data
-                if isinstance(image_data, str):
-                    # If it's a string, it might be base64
-                    import base64
-                    image_data = base64.b64decode(image_data)
-
-                image = PILImage.open(BytesIO(image_data))
-
-                # Ensure RGB mode for PNG (convert RGBA to RGB with white background if needed)
-                if image.mode == 'RGBA':
-                    rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
-                    rgb_image.paste(image, mask=image.split()[3])
-                    rgb_image.save(str(output_path), 'PNG')
-                elif image.mode == 'RGB':
-                    image.save(str(output_path), 'PNG')
-                else:
-                    image.convert('RGB').save(str(output_path), 'PNG')
-                image_saved = True
-
-        if image_saved:
-            full_path = output_path.resolve()
-            print(f"\nImage saved: {full_path}")
-        else:
-            print("Error: No image was generated in the response.", file=sys.stderr)
-            sys.exit(1)
-
+    except ImageGenerationError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"Error generating image: {e}", file=sys.stderr)
         sys.exit(1)
 
+    full_path = output_path.resolve()
+    print(f"\nImage saved: {full_path}")
+
 
 if __name__ == "__main__":
     main()
@@ -2,16 +2,69 @@
 """Daily brief for X using bird CLI."""
 
 import argparse
+import heapq
 import json
 import os
+import re
 import subprocess
-import urllib.parse
+import sys
 import tempfile
-from datetime import datetime
-from typing import List, Dict, Any
-
-DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+import urllib.parse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Iterable, Iterator
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    ijson = None
+
+MIN_DATE = datetime.min.replace(tzinfo=timezone.utc)
 SKILLS_CONFIG_PATH = os.path.expanduser("~/.config/skills/config.json")
+# Whitespace-delimited tokens made only of letters/digits (same as str.split() + isalnum()).
+HEADLINE_WORD_RE = re.compile(r"(?<!\S)[^\W_]+(?!\S)")
+
+
+def json_loads(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_json(path: str, data: Any) -> None:
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+@dataclass(slots=True)
+class HomeItem:
+    id: str | None
+    text: str
+    created_at: str | None
+    score: int
+    relevance: int
+    author: str | None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "text": self.text,
+            "createdAt": self.created_at,
+            "score": self.score,
+            "relevance": self.relevance,
+            "author": self.author,
+        }
 
 
 def run_bird(args: List[str]) -> str:
@@ -22,15 +75,39 @@ def run_bird(args: List[str]) -> str:
 
 
 def run_bird_json(args: List[str]) -> Any:
-    with tempfile.NamedTemporaryFile(mode="w+", encoding="utf-8", suffix=".json", delete=False) as tmp:
-        tmp_path = tmp.name
-        proc = subprocess.run(["bird", *args], stdout=tmp, stderr=subprocess.PIPE, text=True)
+    proc = subprocess.run(["bird", *args], capture_output=True)
     if proc.returncode != 0:
-        raise RuntimeError(proc.stderr.strip() or "bird command failed")
-    with open(tmp_path, "r", encoding="utf-8") as f:
-        raw = f.read()
-    os.unlink(tmp_path)
-    return json.loads(raw)
+        raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip() or "bird command failed")
+    raw = proc.stdout.lstrip()
+    if not raw:
+        return []
+    if raw[:1] not in (b"[", b"{"):
+        raise RuntimeError(f"bird returned non-JSON output: {raw[:80].decode('utf-8', 'replace')}")
+    return json_loads(raw)
+
+
+def iter_bird_json(args: List[str]) -> Iterator[Dict[str, Any]]:
+    """Yield the items of bird's top-level JSON array, streaming them when ijson is installed."""
+    if ijson is None:
+        yield from run_bird_json(args)
+        return
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(["bird", *args], stdout=subprocess.PIPE, stderr=err)
+        try:
+            # Skip leading whitespace; empty output is no items, as in run_bird_json.
+            while (head := proc.stdout.peek()) and not head.lstrip():
+                proc.stdout.read(len(head))
+            if head:
+                yield from ijson.items(proc.stdout, "item", use_float=True)
+        except ijson.JSONError as exc:
+            if proc.wait() == 0:
+                raise RuntimeError(f"bird returned invalid JSON: {exc}") from exc
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            err.seek(0)
+            raise RuntimeError(err.read().decode("utf-8", "replace").strip() or "bird command failed")
 
 
 def base_args(opts: argparse.Namespace) -> List[str]:
@@ -50,8 +127,8 @@ def base_args(opts: argparse.Namespace) -> List[str]:
 
 def load_skills_config() -> Dict[str, Any]:
     try:
-        with open(SKILLS_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(SKILLS_CONFIG_PATH, "rb") as f:
+            data = json_loads(f.read())
             return data if isinstance(data, dict) else {}
     except FileNotFoundError:
         return {}
@@ -59,13 +136,15 @@ def load_skills_config() -> Dict[str, Any]:
         return {}
 
 
+@lru_cache(maxsize=1024)
 def parse_date(value: str | None) -> datetime:
+    # X timestamps ("Wed Nov 20 10:30:00 +0000 2024") are accepted by the RFC 2822 parser.
     if not value:
-        return datetime.min
+        return MIN_DATE
     try:
-        return datetime.strptime(value, DATE_FORMAT)
-    except ValueError:
-        return datetime.min
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return MIN_DATE
 
 
 def is_retweet(text: str) -> bool:
@@ -73,14 +152,23 @@ def is_retweet(text: str) -> bool:
 
 
 def engagement_score(item: Dict[str, Any]) -> int:
-    likes = int(item.get("likeCount", 0) or 0)
-    rts = int(item.get("retweetCount", 0) or 0)
-    replies = int(item.get("replyCount", 0) or 0)
+    get = item.get
+    likes = int(get("likeCount", 0) or 0)
+    rts = int(get("retweetCount", 0) or 0)
+    replies = int(get("replyCount", 0) or 0)
     return likes + (2 * rts) + (3 * replies)
 
 
-def pick_top(items: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
-    return items[:limit] if limit and limit > 0 else items
+def pick_top(items: Iterable[Any], limit: int, key: Callable[[Any], Any]) -> List[Any]:
+    """Highest-keyed items first, like sorted(..., reverse=True)[:limit] without sorting everything."""
+    if limit and limit > 0:
+        return heapq.nlargest(limit, items, key=key)
+    return sorted(items, key=key, reverse=True)
+
+
+def author_username(item: Dict[str, Any]) -> str | None:
+    author = item.get("author")
+    return author.get("username") if isinstance(author, dict) else None
 
 
 def format_url(author: str | None, tid: str | None) -> str:
@@ -90,10 +178,7 @@ def format_url(author: str | None, tid: str | None) -> str:
 
 
 def headline_key(headline: str) -> str:
-    words = [w for w in headline.lower().replace("'", "").split() if w.isalnum()]
-    if not words:
-        return ""
-    return " ".join(words[:6])
+    return " ".join(HEADLINE_WORD_RE.findall(headline.replace("'", ""))[:6]).lower()
 
 
 def search_url(headline: str) -> str:
@@ -106,7 +191,7 @@ def extract_headline(item: Dict[str, Any]) -> str:
     return item.get("headline") or item.get("title") or item.get("name") or ""
 
 
-def load_news(opts: argparse.Namespace) -> List[Dict[str, Any]]:
+def load_news(opts: argparse.Namespace) -> Iterator[Dict[str, Any]]:
     args = base_args(opts) + [
         "news",
         "--ai-only",
@@ -115,14 +200,14 @@ def load_news(opts: argparse.Namespace) -> List[Dict[str, Any]]:
         str(opts.news_tweets),
         "--json",
     ]
-    return run_bird_json(args)
+    return iter_bird_json(args)
 
 
-def load_home(opts: argparse.Namespace) -> List[Dict[str, Any]]:
+def load_home(opts: argparse.Namespace) -> Iterator[Dict[str, Any]]:
     args = base_args(opts) + ["home", "-n", str(opts.home_count), "--json"]
     if opts.following_only:
         args.insert(len(args) - 1, "--following")
-    return run_bird_json(args)
+    return iter_bird_json(args)
 
 
 def build_search_query(headline: str, min_faves: int) -> str:
@@ -138,8 +223,7 @@ def search_news_links(opts: argparse.Namespace, headline: str, limit: int) -> Li
     results = run_bird_json(args)
     links = []
     for t in results[:limit]:
-        author = (t.get("author", {}) or {}).get("username")
-        url = format_url(author, t.get("id"))
+        url = format_url(author_username(t), t.get("id"))
         if url:
             links.append(url)
     return links
@@ -179,11 +263,7 @@ def main() -> int:
     for item in news:
         headline = extract_headline(item)
         tweets = item.get("tweets", [])
-        best_score = 0
-        for t in tweets:
-            score = engagement_score(t)
-            if score > best_score:
-                best_score = score
+        best_score = max(map(engagement_score, tweets), default=0)
         key = headline_key(headline)
         if key and key in seen_news_keys:
             continue
@@ -200,73 +280,68 @@ def main() -> int:
             "_score": best_score,
         })
 
-    news_items.sort(key=lambda r: r.get("_score", 0), reverse=True)
-    news_items = pick_top(news_items, opts.news_count)
-
-    home_items = []
-    for t in home:
-        text = t.get("text", "")
-        if not text:
-            continue
-        if is_retweet(text):
-            continue
-        score = engagement_score(t)
-        home_items.append({
-            "id": t.get("id"),
-            "text": text.replace("\n", " "),
-            "createdAt": t.get("createdAt"),
-            "score": score,
-            "relevance": score,
-            "author": (t.get("author", {}) or {}).get("username"),
-        })
+    news_items = pick_top(news_items, opts.news_count, key=lambda r: r.get("_score", 0))
 
-    home_items.sort(key=lambda r: (r["relevance"], parse_date(r.get("createdAt"))), reverse=True)
-    home_items = pick_top(home_items, opts.home_results)
+    def home_candidates() -> Iterator[HomeItem]:
+        for t in home:
+            text = t.get("text", "")
+            if not text or is_retweet(text):
+                continue
+            score = engagement_score(t)
+            yield HomeItem(
+                id=t.get("id"),
+                text=text.replace("\n", " "),
+                created_at=t.get("createdAt"),
+                score=score,
+                relevance=score,
+                author=author_username(t),
+            )
+
+    home_items = pick_top(
+        home_candidates(),
+        opts.home_results,
+        key=lambda r: (r.relevance, parse_date(r.created_at)),
+    )
 
     if opts.json_out:
         payload = {
             "news": news_items,
-            "home": home_items,
+            "home": [item.to_json() for item in home_items],
         }
         os.makedirs(os.path.dirname(opts.json_out), exist_ok=True)
-        with open(opts.json_out, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        write_json(opts.json_out, payload)
 
-    print("== AI dev news ==\n")
+    out: List[str] = ["== AI dev news ==\n\n"]
     for item in news_items:
-        headline = extract_headline(item)
+        headline = item["headline"]
         category = item.get("category")
         time_ago = item.get("timeAgo")
         topic_url = item.get("url") or ""
-        print(f"- {headline} ({category}) {time_ago or ''}".rstrip())
+        out.append(f"- {headline} ({category}) {time_ago or ''}".rstrip() + "\n")
         if topic_url:
-            print(f"  topic: {topic_url}")
-        search = item.get("searchUrl") or search_url(headline)
+            out.append(f"  topic: {topic_url}\n")
+        search = item["searchUrl"]
         if search:
-            print(f"  search: {search}")
+            out.append(f"  search: {search}\n")
         tweet_links = []
         for t in item.get("tweets", [])[: opts.news_tweets]:
-            author = (t.get("author", {}) or {}).get("username")
-            url = format_url(author, t.get("id"))
+            url = format_url(author_username(t), t.get("id"))
             if url:
                 tweet_links.append(url)
         if not tweet_links:
             tweet_links = search_news_links(opts, headline, opts.news_tweets)
-        for url in tweet_links:
-            print(f"  {url}")
-        print()
+        out.extend(f"  {url}\n" for url in tweet_links)
+        out.append("\n")
 
-    print("== Home candidates ==\n")
+    out.append("== Home candidates ==\n\n")
     for idx, item in enumerate(home_items, start=1):
-        url = format_url(item.get("author"), item.get("id"))
-        print(f"{idx}) {url}")
-        print(f"   {item.get('text')[:220]}")
-        print()
+        url = format_url(item.author, item.id)
+        out.append(f"{idx}) {url}\n   {item.text[:220]}\n\n")
 
     if opts.debug:
-        print(f"News items: {len(news_items)}")
-        print(f"Home candidates: {len(home_items)}")
+        out.append(f"News items: {len(news_items)}\nHome candidates: {len(home_items)}\n")
 
+    sys.stdout.write("".join(out))
     return 0
 
 
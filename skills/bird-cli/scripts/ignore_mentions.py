@@ -6,7 +6,13 @@ import json
 import os
 import sys
 
-DEFAULT_IGNORE_PATH = os.path.expanduser("~/.config/bird/ignored_mentions.json")
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
+DEFAULT_IGNORE_DIR = os.path.expanduser("~/.config/bird/ignored_mentions")
+LEGACY_IGNORE_PATH = os.path.expanduser("~/.config/bird/ignored_mentions.json")
 
 
 def die(msg):
@@ -16,45 +22,92 @@ def die(msg):
 
 def load_json(path):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
     except FileNotFoundError:
         return {}
     except json.JSONDecodeError:
         return {}
 
 
-def save_json(path, data):
+def ignore_path(ignore_dir, username):
+    return os.path.join(ignore_dir, f"{username}.txt")
+
+
+def load_legacy_ids(path, username):
+    data = load_json(path)
+    if not isinstance(data, dict):
+        return []
+    entries = data.get(username, [])
+    if isinstance(entries, dict):
+        return [str(item) for item in entries]
+    if isinstance(entries, list):
+        return [str(item) for item in entries]
+    return []
+
+
+def load_ids(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().split()
+    except FileNotFoundError:
+        return []
+
+
+def append_ids(path, ids):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(f"{mid}\n" for mid in ids)
+
+
+def write_ids(path, ids):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(f"{mid}\n" for mid in ids)
+    os.replace(tmp, path)
+
+
+def read_id_file(path):
+    if path == "-":
+        return sys.stdin.read().split()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().split()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Ignore mentions by id")
     parser.add_argument("--username", required=True, help="Account username")
-    parser.add_argument("--ignore-file", default=DEFAULT_IGNORE_PATH)
-    parser.add_argument("--id", action="append", dest="ids", required=True, help="Mention id (repeatable)")
+    parser.add_argument("--ignore-dir", default=DEFAULT_IGNORE_DIR, help="Directory with one <username>.txt per account")
+    parser.add_argument("--ignore-file", default=LEGACY_IGNORE_PATH, help="Legacy JSON ignore file (imported once)")
+    parser.add_argument("--id", action="append", dest="ids", default=[], help="Mention id (repeatable)")
+    parser.add_argument("--id-file", help="File with mention ids, one per line ('-' reads stdin)")
+    parser.add_argument("--compact", action="store_true", help="Rewrite the ignore file without duplicates")
     args = parser.parse_args()
 
-    data = load_json(args.ignore_file)
-    if not isinstance(data, dict):
-        data = {}
+    ids = [str(mid) for mid in args.ids]
+    if args.id_file:
+        ids += read_id_file(args.id_file)
+    if not ids and not args.compact:
+        die("Provide at least one --id or --id-file (or --compact)")
 
     username = args.username.lower()
-    existing = data.get(username, {})
-    if isinstance(existing, list):
-        existing = {str(item): True for item in existing}
-    if not isinstance(existing, dict):
-        existing = {}
+    path = ignore_path(args.ignore_dir, username)
+    count = len(ids)
 
-    for mid in args.ids:
-        existing[str(mid)] = True
+    if not os.path.exists(path):
+        # First write for this account: carry over entries from the legacy JSON file.
+        ids = load_legacy_ids(args.ignore_file, username) + ids
 
-    data[username] = existing
-    save_json(args.ignore_file, data)
+    if args.compact:
+        write_ids(path, dict.fromkeys(load_ids(path) + ids))
+    else:
+        append_ids(path, ids)
 
-    print(f"Ignored {len(args.ids)} mention(s) for @{username}")
+    print(f"Ignored {count} mention(s) for @{username}")
 
 
 if __name__ == "__main__":
@@ -2,16 +2,48 @@
 """List unanswered mentions for a given X account via bird CLI."""
 
 import argparse
+import hashlib
 import json
 import os
 import re
 import subprocess
-from datetime import datetime
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import List, Dict, Any
 
-DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
-DEFAULT_IGNORE_PATH = os.path.expanduser("~/.config/bird/ignored_mentions.json")
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
+DEFAULT_IGNORE_DIR = os.path.expanduser("~/.config/bird/ignored_mentions")
+LEGACY_IGNORE_PATH = os.path.expanduser("~/.config/bird/ignored_mentions.json")
 SKILLS_CONFIG_PATH = os.path.expanduser("~/.config/skills/config.json")
+DEFAULT_REPLIES_CACHE_DIR = os.path.expanduser("~/.cache/bird/replies")
+WHOAMI_CACHE_PATH = os.path.expanduser("~/.cache/bird/whoami.json")
+WHOAMI_CACHE_TTL = 7 * 24 * 3600
+MONTHS = {name: idx for idx, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1
+)}
+MIN_DATE = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def json_loads(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_json(path: str, data: Any) -> None:
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 def run_bird(args: List[str]) -> str:
@@ -21,6 +53,18 @@ def run_bird(args: List[str]) -> str:
     return proc.stdout
 
 
+def run_bird_json(args: List[str]) -> Any:
+    proc = subprocess.run(["bird", *args], capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip() or "bird command failed")
+    raw = proc.stdout.lstrip()
+    if not raw:
+        return []
+    if raw[:1] not in (b"[", b"{"):
+        raise RuntimeError(f"bird returned non-JSON output: {raw[:80].decode('utf-8', 'replace')}")
+    return json_loads(raw)
+
+
 def base_args(opts: argparse.Namespace) -> List[str]:
     args: List[str] = []
     if opts.auth_token:
@@ -38,8 +82,8 @@ def base_args(opts: argparse.Namespace) -> List[str]:
 
 def load_skills_config() -> Dict[str, Any]:
     try:
-        with open(SKILLS_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(SKILLS_CONFIG_PATH, "rb") as f:
+            data = json_loads(f.read())
             return data if isinstance(data, dict) else {}
     except FileNotFoundError:
         return {}
@@ -54,24 +98,105 @@ def parse_username_from_whoami(output: str) -> str:
     return match.group(1)
 
 
+def resolve_username(opts: argparse.Namespace) -> str:
+    """Run `bird whoami`, reusing the result cached for the same cookie source/profile."""
+    # Hash the bird args so auth tokens never land in the cache file in clear text.
+    key = hashlib.sha256("\0".join(opts.bird_args).encode("utf-8")).hexdigest()
+    cache: Dict[str, Any] = {}
+    if not opts.no_cache:
+        try:
+            with open(WHOAMI_CACHE_PATH, "rb") as f:
+                cache = json_loads(f.read())
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        entry = cache.get(key)
+        if isinstance(entry, dict) and time.time() - entry.get("checkedAt", 0) < WHOAMI_CACHE_TTL:
+            cached_username = entry.get("username")
+            if isinstance(cached_username, str) and cached_username:
+                return cached_username
+
+    whoami = run_bird(opts.bird_args + ["whoami", "--plain"])
+    username = parse_username_from_whoami(whoami).lower()
+    cache[key] = {"username": username, "checkedAt": time.time()}
+    os.makedirs(os.path.dirname(WHOAMI_CACHE_PATH), exist_ok=True)
+    write_json(WHOAMI_CACHE_PATH, cache)
+    return username
+
+
 def load_mentions(opts: argparse.Namespace) -> List[Dict[str, Any]]:
     args = base_args(opts) + ["mentions", "--json"]
-    return json.loads(run_bird(args))
+    return run_bird_json(args)
 
 
 def load_replies(opts: argparse.Namespace, tweet_id: str) -> List[Dict[str, Any]]:
-    args = base_args(opts) + ["replies", tweet_id, "--json"]
-    return json.loads(run_bird(args))
+    # bird has no multi-id replies command, so each lookup is its own process;
+    # main() overlaps them with a thread pool and the cache avoids repeats.
+    args = opts.bird_args + ["replies", tweet_id, "--json"]
+    return run_bird_json(args)
+
+
+def author_username(item: Dict[str, Any]) -> str | None:
+    author = item.get("author")
+    return author.get("username") if isinstance(author, dict) else None
+
+
+def replied_by(replies: List[Dict[str, Any]], username: str) -> bool:
+    return any((author_username(r) or "").lower() == username for r in replies)
+
+
+def cached_load_replies(opts: argparse.Namespace, tweet_id: str, username: str) -> List[Dict[str, Any]]:
+    """Return replies from the on-disk cache; answered mentions never expire."""
+    if opts.no_cache:
+        return load_replies(opts, tweet_id)
+    path = os.path.join(opts.cache_dir, f"{tweet_id}.json")
+    try:
+        age = time.time() - os.stat(path).st_mtime
+        with open(path, "rb") as f:
+            cached = json_loads(f.read())
+        if isinstance(cached, list) and (age < opts.cache_ttl or replied_by(cached, username)):
+            return cached
+    except (OSError, ValueError):
+        pass
+    replies = load_replies(opts, tweet_id)
+    os.makedirs(opts.cache_dir, exist_ok=True)
+    write_json(path, replies)
+    return replies
 
 
 def parse_date(value: str) -> datetime:
-    return datetime.strptime(value, DATE_FORMAT)
+    # Fast path for X's fixed layout ("Wed Nov 20 10:30:00 +0000 2024"); the RFC 2822 parser handles the rest.
+    try:
+        _, month, day, clock, offset, year = value.split()
+        hour, minute, second = clock.split(":")
+        if offset == "+0000":
+            tz = timezone.utc
+        else:
+            delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+            tz = timezone(-delta if offset[0] == "-" else delta)
+        return datetime(int(year), MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=tz)
+    except (KeyError, ValueError):
+        pass
+    try:
+        return parsedate_to_datetime(value)
+    except TypeError as exc:
+        raise ValueError(f"Unrecognized date: {value}") from exc
 
 
-def load_ignored_ids(path: str, username: str) -> set:
+def safe_parse_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def load_legacy_ignored_ids(path: str, username: str) -> set:
+    try:
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
     except FileNotFoundError:
         return set()
     except json.JSONDecodeError:
@@ -88,6 +213,14 @@ def load_ignored_ids(path: str, username: str) -> set:
     return set()
 
 
+def load_ignored_ids(ignore_dir: str, legacy_path: str, username: str) -> set:
+    try:
+        with open(os.path.join(ignore_dir, f"{username}.txt"), "r", encoding="utf-8") as f:
+            return set(f.read().split())
+    except FileNotFoundError:
+        return load_legacy_ignored_ids(legacy_path, username)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="List unanswered mentions via bird CLI")
     parser.add_argument("--cookie-source", default="chrome", help="Cookie source for bird (default: chrome)")
@@ -100,9 +233,14 @@ def main() -> int:
     parser.add_argument("--show-text", action="store_true", help="Include mention text")
     parser.add_argument("--include-unknown", action="store_true", help="Include items with reply check errors")
     parser.add_argument("--json-out", help="Write results to JSON file")
-    parser.add_argument("--ignore-file", default=DEFAULT_IGNORE_PATH, help="Path to ignored mentions JSON")
+    parser.add_argument("--ignore-dir", default=DEFAULT_IGNORE_DIR, help="Directory with ignored mention ids per account")
+    parser.add_argument("--ignore-file", default=LEGACY_IGNORE_PATH, help="Legacy ignored mentions JSON (fallback)")
     parser.add_argument("--no-ignore", action="store_true", help="Do not filter ignored mentions")
     parser.add_argument("--numbered", action="store_true", help="Prefix output with index")
+    parser.add_argument("--cache-dir", default=DEFAULT_REPLIES_CACHE_DIR, help="Replies cache directory")
+    parser.add_argument("--cache-ttl", type=int, default=3600, help="Seconds to reuse cached replies for unanswered mentions")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch replies and whoami from bird")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel reply lookups (default: 8)")
 
     opts = parser.parse_args()
 
@@ -118,90 +256,93 @@ def main() -> int:
     if not (opts.chrome_profile or opts.firefox_profile or opts.auth_token):
         raise SystemExit("Provide a browser profile or auth tokens for bird")
 
+    opts.bird_args = base_args(opts)
     username = opts.username
     if not username:
-        whoami = run_bird(base_args(opts) + ["whoami", "--plain"])
-        username = parse_username_from_whoami(whoami).lower()
+        username = resolve_username(opts)
     else:
         username = username.lower()
 
     mentions = load_mentions(opts)
     results = []
 
-    ignored_ids = set()
+    ignored_ids: frozenset = frozenset()
     if not opts.no_ignore:
-        ignored_ids = load_ignored_ids(opts.ignore_file, username)
+        ignored_ids = frozenset(load_ignored_ids(opts.ignore_dir, opts.ignore_file, username))
 
-    for mention in mentions:
-        mid = mention.get("id")
-        if not mid:
-            continue
-        status = "unknown"
+    def reply_status(mention: Dict[str, Any]) -> str:
+        if str(mention.get("replyCount", "")) == "0":
+            # Nobody replied yet, so the account cannot have answered: skip the lookup.
+            return "sin_responder"
         try:
-            replies = load_replies(opts, mid)
-            replied = any(
-                (r.get("author", {}) or {}).get("username", "").lower() == username
-                for r in replies
-            )
-            status = "respondida" if replied else "sin_responder"
+            replies = cached_load_replies(opts, mention["id"], username)
+            return "respondida" if replied_by(replies, username) else "sin_responder"
         except Exception:
-            status = "unknown"
-
-        if status == "sin_responder" or (opts.include_unknown and status == "unknown"):
-            if str(mid) in ignored_ids:
-                continue
-            results.append({
-                "createdAt": mention.get("createdAt"),
-                "author": (mention.get("author", {}) or {}).get("username"),
-                "text": mention.get("text", ""),
-                "id": mid,
-                "status": status,
-            })
-
-    results.sort(key=lambda r: parse_date(r["createdAt"]) if r["createdAt"] else datetime.min, reverse=True)
+            return "unknown"
+
+    # Ignored mentions are dropped up front so they never cost a replies lookup.
+    pending = [
+        mention for mention in mentions
+        if mention.get("id") and str(mention["id"]) not in ignored_ids
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, opts.concurrency)) as executor:
+        futures = {executor.submit(reply_status, mention): mention for mention in pending}
+        for future in as_completed(futures):
+            mention = futures[future]
+            mid = mention.get("id")
+            status = future.result()
+
+            if status == "sin_responder" or (opts.include_unknown and status == "unknown"):
+                results.append({
+                    "createdAt": mention.get("createdAt"),
+                    "author": author_username(mention),
+                    "text": mention.get("text", ""),
+                    "id": mid,
+                    "status": status,
+                })
+
+    dated = [(safe_parse_date(r["createdAt"]), r) for r in results]
+    dated.sort(key=lambda pair: pair[0] or MIN_DATE, reverse=True)
 
     if opts.limit and opts.limit > 0:
-        results = results[: opts.limit]
+        dated = dated[: opts.limit]
 
     indexed = []
-    for idx, item in enumerate(results, start=1):
+    created_at = []
+    for idx, (parsed, item) in enumerate(dated, start=1):
         author = item.get("author", "")
         url = f"https://x.com/{author}/status/{item.get('id')}" if author else ""
         indexed.append({**item, "index": idx, "url": url})
+        created_at.append(parsed)
 
     if opts.json_out:
         os.makedirs(os.path.dirname(opts.json_out), exist_ok=True)
-        with open(opts.json_out, "w", encoding="utf-8") as f:
-            json.dump(indexed, f, ensure_ascii=False, indent=2)
+        write_json(opts.json_out, indexed)
 
-    def format_label(created: str | None) -> str:
-        if not created:
-            return "Unknown date"
-        try:
-            return parse_date(created).strftime("%d/%m/%Y")
-        except ValueError:
+    def format_label(created: datetime | None) -> str:
+        if created is None:
             return "Unknown date"
+        return created.strftime("%d/%m/%Y")
 
     current_label: str | None = None
+    out: List[str] = []
 
-    for r in indexed:
-        label = format_label(r.get("createdAt"))
+    for r, parsed in zip(indexed, created_at):
+        label = format_label(parsed)
         if label != current_label:
             if current_label is not None:
-                print()
-            print(f"**{label}**:")
-            print()
+                out.append("\n")
+            out.append(f"**{label}**:\n\n")
             current_label = label
 
         author = r.get("author", "")
         url = r.get("url", "")
         prefix = f"{r.get('index')}) " if opts.numbered else ""
-        line = f"- {prefix}@{author} | {url}"
-        print(line)
+        out.append(f"- {prefix}@{author} | {url}\n")
         if opts.show_text and r.get("text"):
-            print(f"  {r['text']}")
-            print()
+            out.append(f"  {r['text']}\n\n")
 
+    sys.stdout.write("".join(out))
     return 0
 
 
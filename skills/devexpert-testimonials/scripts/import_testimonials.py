@@ -6,11 +6,15 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import hashlib
+import io
 import json
 import os
 import re
 import sys
 import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -21,9 +25,38 @@ except Exception as exc:  # pragma: no cover - runtime dependency
 else:
     _cv2_import_error = None
 
+try:
+    import dlib  # type: ignore
+except Exception:  # pragma: no cover - optional detector
+    dlib = None
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
 DEFAULT_TESTIMONIALS_JSON = "src/data/testimonials.json"
 DEFAULT_IMAGES_DIR = "src/assets/testimonials"
 DEFAULT_AI_ASTRO = "src/pages/cursos/expert/ai.astro"
+INDEX_CACHE_DIR = Path(os.path.expanduser("~/.cache/devexpert-testimonials"))
+
+# Longest side used for face detection. Detection runs on the 1/REDUCED_DECODE_FACTOR
+# decode when that is large enough; the crop comes from that decode, or from the
+# full-size image when the reduced one has too few pixels for the output size.
+DETECT_MAX_SIDE = 800
+REDUCED_DECODE_FACTOR = 4
+DETECTORS = ("haar", "lbp", "ssd", "dlib")
+MIN_FACE_RATIO = 0.15
+MAX_FACE_RATIO = 0.8
+SSD_INPUT_SIZE = 300
+SSD_MIN_CONFIDENCE = 0.5
+
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+MULTISPACE_RE = re.compile(r"\s{2,}")
+AI_IDS_RE = re.compile(r"testimonialIds=\{\[(.*?)\]\}", re.S)
+AI_ID_VALUE_RE = re.compile(r"\"(\d+)\"")
 
 AI_TITLE_PATTERNS = (
     "ai expert",
@@ -37,6 +70,11 @@ class SkillError(Exception):
     pass
 
 
+_FACE_CASCADES: dict[str, object] = {}
+_SSD_NETS: dict[tuple[str, str], object] = {}
+_DLIB_DETECTORS: dict[str, object] = {}
+
+
 def _log(msg: str) -> None:
     print(msg)
 
@@ -49,12 +87,12 @@ def slugify(text: str) -> str:
     normalized = unicodedata.normalize("NFKD", text)
     ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
     ascii_text = ascii_text.lower()
-    ascii_text = re.sub(r"[^a-z0-9]+", "-", ascii_text).strip("-")
+    ascii_text = SLUG_RE.sub("-", ascii_text).strip("-")
     return ascii_text or "item"
 
 
 def normalize_title_for_match(title: str) -> str:
-    return re.sub(r"\s+", " ", title.strip().lower())
+    return WHITESPACE_RE.sub(" ", title.strip().lower())
 
 
 def is_ai_expert(title: str) -> bool:
@@ -62,25 +100,43 @@ def is_ai_expert(title: str) -> bool:
     return any(pat in normalized for pat in AI_TITLE_PATTERNS)
 
 
+DATE_FORMATS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+)
+# Rows in one import share a source format, so the last hit is tried first.
+_LAST_DATE_FMT: str | None = None
+
+
 def parse_date(raw: str) -> str:
+    global _LAST_DATE_FMT
     raw = raw.strip()
     if not raw:
         return ""
-    candidates = [
-        "%d/%m/%Y %H:%M:%S",
-        "%d/%m/%Y %H:%M",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-    ]
+    candidates = DATE_FORMATS
+    if _LAST_DATE_FMT is not None:
+        candidates = (_LAST_DATE_FMT, *DATE_FORMATS)
     for fmt in candidates:
         try:
             parsed = dt.datetime.strptime(raw, fmt)
-            return parsed.strftime("%Y-%m-%d %H:%M:%S")
         except ValueError:
             continue
+        _LAST_DATE_FMT = fmt
+        return parsed.strftime("%Y-%m-%d %H:%M:%S")
     return raw
 
 
+def _rating(raw: str) -> int:
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return 5
+    # Same as the old isdigit() check: a negative rating is not a rating.
+    return value if value >= 0 else 5
+
+
 def autoparagraph(text: str) -> str:
     text = text.replace("\r\n", "\n").strip()
     if not text:
@@ -89,42 +145,86 @@ def autoparagraph(text: str) -> str:
         # Normalize to double newlines between paragraphs
         parts = [p.strip() for p in text.split("\n") if p.strip()]
         return "\n\n".join(parts)
-    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+    sentences = [s.strip() for s in SENTENCE_SPLIT_RE.split(text) if s.strip()]
     if len(sentences) <= 1:
         return text
     return "\n\n".join(sentences)
 
 
 def parse_rows(raw_text: str) -> list[list[str]]:
-    lines = [line for line in raw_text.splitlines() if line.strip()]
-    if not lines:
-        return []
-
-    delimiter = "\t" if any("\t" in line for line in lines) else None
-    if delimiter:
-        reader = csv.reader(lines, delimiter=delimiter)
-        return [row for row in reader]
+    if "\t" in raw_text:
+        reader = csv.reader(io.StringIO(raw_text, newline=""), delimiter="\t")
+        return [row for row in reader if any(cell.strip() for cell in row)]
 
     # Fallback: split on 2+ spaces or pipes
     rows: list[list[str]] = []
-    for line in lines:
+    for line in raw_text.splitlines():
+        if not line.strip():
+            continue
         if "|" in line:
             row = [part.strip() for part in line.split("|")]
         else:
-            row = [part.strip() for part in re.split(r"\s{2,}", line)]
+            row = [part.strip() for part in MULTISPACE_RE.split(line)]
         rows.append(row)
     return rows
 
 
+def json_loads(raw: bytes | str):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(data) -> bytes:
+    """Pretty JSON (2-space indent, UTF-8, trailing newline) as bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
 def load_testimonials(path: Path) -> list[dict]:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return json_loads(path.read_bytes())
 
 
 def save_testimonials(path: Path, data: list[dict]) -> None:
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
+    path.write_bytes(json_dumps(data))
+
+
+def duplicate_key(name: str, date: str) -> str:
+    return hashlib.blake2b(f"{name.lower()}|{date}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+def load_duplicate_index(path: Path) -> set[str]:
+    """Hashed (name, date) keys of testimonials.json, cached on disk by file mtime + size."""
+    stat = path.stat()
+    resolved = str(path.resolve())
+    cache_path = INDEX_CACHE_DIR / f"{hashlib.blake2b(resolved.encode('utf-8'), digest_size=8).hexdigest()}.json"
+    try:
+        cached = json_loads(cache_path.read_bytes())
+        if (
+            cached.get("path") == resolved
+            and cached.get("mtime_ns") == stat.st_mtime_ns
+            and cached.get("size") == stat.st_size
+        ):
+            return set(cached["keys"])
+    except (OSError, ValueError, AttributeError, KeyError, TypeError):
+        pass
+
+    keys = {
+        duplicate_key(str(item.get("name", "")).strip(), str(item.get("date", "")).strip())
+        for item in load_testimonials(path)
+    }
+    try:
+        INDEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(json_dumps({
+            "path": resolved,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "keys": sorted(keys),
+        }))
+    except OSError as exc:
+        _warn(f"No se pudo guardar el indice de duplicados: {exc}")
+    return keys
 
 
 def next_ids(existing: list[dict], count: int) -> list[str]:
@@ -133,24 +233,21 @@ def next_ids(existing: list[dict], count: int) -> list[str]:
     return [str(start + idx) for idx in range(count)]
 
 
-def read_ai_ids(ai_path: Path) -> list[str]:
+def read_ai_ids(ai_path: Path) -> tuple[list[str], str]:
+    """Return the ids in ai.astro plus the file text, so writes can reuse it."""
     text = ai_path.read_text(encoding="utf-8")
-    match = re.search(r"testimonialIds=\{\[(.*?)\]\}", text, re.S)
+    match = AI_IDS_RE.search(text)
     if not match:
         raise SkillError("No se encontro testimonialIds en ai.astro")
     raw = match.group(1)
-    return re.findall(r"\"(\d+)\"", raw)
+    return AI_ID_VALUE_RE.findall(raw), text
 
 
-def write_ai_ids(ai_path: Path, ids: list[str]) -> None:
-    text = ai_path.read_text(encoding="utf-8")
+def write_ai_ids(ai_path: Path, ids: list[str], text: str | None = None) -> None:
+    if text is None:
+        text = ai_path.read_text(encoding="utf-8")
     new_list = ", ".join(f"\"{id_}\"" for id_ in ids)
-    new_text = re.sub(
-        r"testimonialIds=\{\[(.*?)\]\}",
-        f"testimonialIds={{[{new_list}]}}",
-        text,
-        flags=re.S,
-    )
+    new_text = AI_IDS_RE.sub(f"testimonialIds={{[{new_list}]}}", text)
     ai_path.write_text(new_text, encoding="utf-8")
 
 
@@ -162,11 +259,100 @@ def build_image_filename(name: str, title: str) -> str:
     return f"{name_slug}.jpg"
 
 
+def _get_cascade(path: str | None = None):
+    if path is None:
+        path = str(Path(cv2.data.haarcascades) / "haarcascade_frontalface_default.xml")
+    cascade = _FACE_CASCADES.get(path)
+    if cascade is None:
+        cascade = cv2.CascadeClassifier(path)
+        if cascade.empty():
+            raise SkillError(f"No se pudo cargar el clasificador: {path}")
+        _FACE_CASCADES[path] = cascade
+    return cascade
+
+
+def _get_ssd_net(model: str, config: str):
+    key = (model, config)
+    net = _SSD_NETS.get(key)
+    if net is None:
+        net = cv2.dnn.readNetFromCaffe(config, model)
+        _SSD_NETS[key] = net
+    return net
+
+
+def _get_dlib_detector(model: str):
+    detector = _DLIB_DETECTORS.get(model)
+    if detector is None:
+        detector = dlib.cnn_face_detection_model_v1(model)
+        _DLIB_DETECTORS[model] = detector
+    return detector
+
+
+def detect_faces(
+    image,
+    min_size: int,
+    detector: str = "haar",
+    model: str | None = None,
+    config: str | None = None,
+    max_size: int | None = None,
+) -> list[tuple[float, float, float, float]]:
+    """Return face boxes as (x, y, w, h) in the coordinates of `image`."""
+    if detector == "ssd":
+        if not model or not config:
+            raise SkillError(
+                "--detector ssd requiere --detector-model (.caffemodel) y --detector-config (.prototxt)"
+            )
+        height, width = image.shape[:2]
+        net = _get_ssd_net(model, config)
+        blob = cv2.dnn.blobFromImage(
+            cv2.resize(image, (SSD_INPUT_SIZE, SSD_INPUT_SIZE)),
+            1.0,
+            (SSD_INPUT_SIZE, SSD_INPUT_SIZE),
+            (104.0, 177.0, 123.0),
+        )
+        net.setInput(blob)
+        boxes = []
+        for detection in net.forward()[0, 0]:
+            if detection[2] < SSD_MIN_CONFIDENCE:
+                continue
+            x1, y1 = detection[3] * width, detection[4] * height
+            x2, y2 = detection[5] * width, detection[6] * height
+            boxes.append((x1, y1, x2 - x1, y2 - y1))
+        return boxes
+
+    if detector == "dlib":
+        if dlib is None:
+            raise SkillError("dlib no esta instalado. Ejecuta: python -m pip install dlib")
+        if not model:
+            raise SkillError("--detector dlib requiere --detector-model (mmod_human_face_detector.dat)")
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return [
+            (d.rect.left(), d.rect.top(), d.rect.width(), d.rect.height())
+            for d in _get_dlib_detector(model)(rgb, 0)
+        ]
+
+    if detector == "lbp" and not model:
+        raise SkillError("--detector lbp requiere --detector-model (lbpcascade_frontalface_improved.xml)")
+    gray = cv2.equalizeHist(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+    cascade = _get_cascade(model)
+    faces = cascade.detectMultiScale(
+        gray,
+        scaleFactor=1.2,
+        minNeighbors=4,
+        minSize=(min_size, min_size),
+        maxSize=(max_size, max_size) if max_size else (),
+    )
+    return [tuple(face) for face in faces]
+
+
 def ensure_face_crop(
     image_path: Path,
     output_path: Path,
     size: int = 400,
     overwrite: bool = False,
+    detector: str = "haar",
+    detector_model: str | None = None,
+    detector_config: str | None = None,
 ) -> bool:
     if not image_path.exists():
         _warn(f"Imagen no encontrada: {image_path}")
@@ -180,20 +366,34 @@ def ensure_face_crop(
             "opencv-python no esta instalado. Ejecuta: python -m pip install -r scripts/requirements.txt"
         )
 
-    image = cv2.imread(str(image_path))
+    # libjpeg can decode straight to 1/4 size, which is far cheaper than decoding
+    # the full photo; small photos are read as-is so detection keeps enough detail.
+    factor = REDUCED_DECODE_FACTOR
+    image = cv2.imread(str(image_path), cv2.IMREAD_REDUCED_COLOR_4)
+    if image is not None and max(image.shape[:2]) < DETECT_MAX_SIDE // 2:
+        image = None
+    if image is None:
+        factor = 1
+        image = cv2.imread(str(image_path))
     if image is None:
         _warn(f"No se pudo leer la imagen: {image_path}")
         return False
 
     height, width = image.shape[:2]
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    cascade = cv2.CascadeClassifier(
-        str(Path(cv2.data.haarcascades) / "haarcascade_frontalface_default.xml")
-    )
-    faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=4, minSize=(60, 60))
+    scale = min(1.0, DETECT_MAX_SIDE / max(height, width))
+    detect_image = image
+    if scale < 1.0:
+        detect_image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    # Profile photos show a sizeable face; skipping tiny windows prunes most pyramid levels.
+    # Bounding both ends keeps the cascade pyramid to a handful of levels.
+    detect_side = min(detect_image.shape[:2])
+    # 60 px at full resolution; detect_image is scale / factor of the original photo.
+    min_face = max(1, int(60 * scale / factor), int(detect_side * MIN_FACE_RATIO))
+    max_face = max(min_face, int(detect_side * MAX_FACE_RATIO))
+    faces = detect_faces(detect_image, min_face, detector, detector_model, detector_config, max_face)
 
     if len(faces) > 0:
-        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        x, y, w, h = (value / scale for value in max(faces, key=lambda f: f[2] * f[3]))
         cx = x + w / 2
         cy = y + h / 2
         side = int(max(w, h) * 2.2)
@@ -216,12 +416,20 @@ def ensure_face_crop(
             y2 = height
         x1 = max(0, x1)
         y1 = max(0, y1)
-        crop = image[y1:y2, x1:x2]
     else:
         side = min(width, height)
         x1 = (width - side) // 2
         y1 = (height - side) // 2
-        crop = image[y1 : y1 + side, x1 : x1 + side]
+        x2 = x1 + side
+        y2 = y1 + side
+
+    if factor > 1 and side < size:
+        # The reduced decode has too few pixels for the output size: crop from the full image.
+        full = cv2.imread(str(image_path))
+        if full is not None:
+            image = full
+            x1, y1, x2, y2 = (value * factor for value in (x1, y1, x2, y2))
+    crop = image[y1:y2, x1:x2]
 
     resized = cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -229,6 +437,19 @@ def ensure_face_crop(
     return True
 
 
+def _crop_job(job: tuple[Path, Path, int, str, str | None, str | None]) -> bool:
+    image_source, output_path, size, detector, detector_model, detector_config = job
+    return ensure_face_crop(
+        image_source,
+        output_path,
+        size=size,
+        overwrite=True,
+        detector=detector,
+        detector_model=detector_model,
+        detector_config=detector_config,
+    )
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -261,6 +482,20 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Sobrescribir imagenes si existen",
     )
+    parser.add_argument(
+        "--detector",
+        choices=DETECTORS,
+        default="haar",
+        help="Detector de caras: haar (incluido en OpenCV); lbp, ssd o dlib (requieren --detector-model)",
+    )
+    parser.add_argument(
+        "--detector-model",
+        help="Ruta al modelo del detector (cascade XML para lbp, .caffemodel para ssd, .dat para dlib)",
+    )
+    parser.add_argument(
+        "--detector-config",
+        help="Ruta al .prototxt del detector ssd",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -300,10 +535,17 @@ def main(argv: list[str]) -> int:
 
     new_rows: list[dict] = []
     new_image_paths: list[str] = []
-    existing_keys = {
-        (str(item.get("name", "")).strip().lower(), str(item.get("date", "")).strip())
-        for item in testimonials
-    }
+    existing_keys: set[tuple[str, str]] = set()
+    by_name: dict[str, list[dict]] = defaultdict(list)
+    by_id: dict[str, dict] = {}
+    for item in testimonials:
+        # Stored entries were stripped when imported, so only the case needs folding.
+        item_name = str(item.get("name", "")).lower()
+        existing_keys.add((item_name, str(item.get("date", ""))))
+        by_name[item_name].append(item)
+        if "id" in item:
+            by_id[item["id"]] = item
+
     for row in rows:
         while len(row) < 7:
             row.append("")
@@ -312,17 +554,19 @@ def main(argv: list[str]) -> int:
         if not name:
             _warn(f"Fila sin nombre, se omite: {row}")
             continue
+        date = parse_date(raw_date)
         entry: dict = {
             "name": name,
             "text": autoparagraph(text),
-            "rating": int(rating) if str(rating).strip().isdigit() else 5,
-            "date": parse_date(raw_date),
+            "rating": _rating(rating),
+            "date": date,
         }
         title = title.strip()
         if title:
             entry["title"] = title
-        if position.strip():
-            entry["position"] = position.strip()
+        position = position.strip()
+        if position:
+            entry["position"] = position
         image_path = image_path.strip()
         if image_path:
             image_source = Path(image_path)
@@ -331,11 +575,13 @@ def main(argv: list[str]) -> int:
                 entry["imageFilename"] = filename
             else:
                 _warn(f"Ruta de imagen no valida: {image_path}")
-        key = (entry["name"].strip().lower(), entry.get("date", ""))
-        if key in existing_keys:
-            _warn(
-                f"Posible duplicado por nombre/fecha: {entry['name']} {entry.get('date', '')}"
-            )
+        name_key = name.lower()
+        if (name_key, date) in existing_keys:
+            _warn(f"Posible duplicado por nombre/fecha: {name} {date}")
+        elif date and any(
+            str(item.get("date", "")).startswith(date[:10]) for item in by_name.get(name_key, ())
+        ):
+            _warn(f"Posible duplicado por nombre/dia: {name} {date[:10]}")
         new_rows.append(entry)
         new_image_paths.append(image_path)
 
@@ -346,6 +592,7 @@ def main(argv: list[str]) -> int:
     new_ids = next_ids(testimonials, len(new_rows))
     for entry, id_ in zip(new_rows, new_ids):
         entry["id"] = id_
+    by_id.update((entry["id"], entry) for entry in new_rows)
 
     _log(f"Se agregaran {len(new_rows)} testimonios.")
 
@@ -355,7 +602,8 @@ def main(argv: list[str]) -> int:
     else:
         _log("Dry run: no se escribio testimonials.json")
 
-    # Process images
+    # Process images: resolve what actually needs cropping before doing any decode work.
+    pending_crops: list[tuple[Path, Path]] = []
     for entry, image_path in zip(new_rows, new_image_paths):
         image_filename = entry.get("imageFilename")
         if not image_filename or not image_path:
@@ -367,23 +615,43 @@ def main(argv: list[str]) -> int:
         if args.dry_run:
             _log(f"Dry run: recorte imagen {image_source} -> {output_path}")
             continue
-        ensure_face_crop(
+        if output_path.exists() and not args.overwrite_images:
+            _warn(f"Imagen ya existe (omite): {output_path}")
+            continue
+        pending_crops.append((image_source, output_path))
+
+    crop_jobs = [
+        (
             image_source,
             output_path,
-            size=args.image_size,
-            overwrite=args.overwrite_images,
+            args.image_size,
+            args.detector,
+            args.detector_model,
+            args.detector_config,
         )
+        for image_source, output_path in pending_crops
+    ]
+    if len(crop_jobs) > 1:
+        # Each crop is independent CPU work; every worker loads its own detector.
+        workers = min(len(crop_jobs), os.cpu_count() or 1)
+        if args.detector == "dlib" and dlib is not None and dlib.DLIB_USE_CUDA:
+            workers = 1  # a single process keeps one CNN model on the GPU
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_crop_job, crop_jobs))
+    else:
+        for job in crop_jobs:
+            _crop_job(job)
 
     # AI Expert suggestions
     ai_new = [entry for entry in new_rows if is_ai_expert(entry.get("title", ""))]
     if ai_new:
+        current_text: str | None = None
         try:
-            current_ids = read_ai_ids(ai_path)
+            current_ids, current_text = read_ai_ids(ai_path)
         except SkillError as exc:
             _warn(str(exc))
             current_ids = []
 
-        by_id = {item["id"]: item for item in testimonials + new_rows}
         if current_ids:
             _log("\nAI Expert actuales:")
             for id_ in current_ids:
@@ -402,14 +670,14 @@ def main(argv: list[str]) -> int:
         if args.ai_ids:
             selected = [item.strip() for item in args.ai_ids.split(",") if item.strip()]
             if not args.dry_run:
-                write_ai_ids(ai_path, selected)
+                write_ai_ids(ai_path, selected, current_text)
                 _log("ai.astro actualizado con ids indicados.")
             else:
                 _log("Dry run: no se actualizo ai.astro")
         elif args.ai_auto:
             if suggested:
                 if not args.dry_run:
-                    write_ai_ids(ai_path, suggested)
+                    write_ai_ids(ai_path, suggested, current_text)
                     _log("ai.astro actualizado automaticamente con ids nuevos.")
                 else:
                     _log("Dry run: no se actualizo ai.astro")
@@ -422,7 +690,7 @@ def main(argv: list[str]) -> int:
             if response.strip():
                 selected = [item.strip() for item in response.split(",") if item.strip()]
                 if not args.dry_run:
-                    write_ai_ids(ai_path, selected)
+                    write_ai_ids(ai_path, selected, current_text)
                     _log("ai.astro actualizado con ids seleccionados.")
                 else:
                     _log("Dry run: no se actualizo ai.astro")
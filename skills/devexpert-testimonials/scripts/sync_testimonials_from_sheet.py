@@ -10,7 +10,9 @@ import os
 import re
 import subprocess
 import sys
+import tempfile
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
@@ -19,7 +21,13 @@ import import_testimonials as importer
 
 DEFAULT_SHEET_RANGE = "A1:Z"
 DEFAULT_MARK_VALUE = "x"
+MAX_GOG_WORKERS = 8
 SKILLS_CONFIG_PATH = os.path.expanduser("~/.config/skills/config.json")
+WHITESPACE_RE = re.compile(r"\s+")
+DRIVE_ID_PATTERNS = (
+    re.compile(r"/d/([a-zA-Z0-9_-]+)"),
+    re.compile(r"id=([a-zA-Z0-9_-]+)"),
+)
 
 
 class SyncError(Exception):
@@ -57,23 +65,45 @@ def _warn(msg: str) -> None:
     print(f"[warn] {msg}", file=sys.stderr)
 
 
-def run_gog(args: list[str], config: GogConfig, json_output: bool = False) -> str:
+def gog_command(args: list[str], config: GogConfig, json_output: bool = False) -> list[str]:
     cmd = ["gog"]
     if json_output:
         cmd.append("--json")
     if config.account:
         cmd.extend(["--account", config.account])
     cmd.extend(args)
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    return cmd
+
+
+def run_gog(args: list[str], config: GogConfig, json_output: bool = False) -> str:
+    result = subprocess.run(gog_command(args, config, json_output), capture_output=True, text=True)
     if result.returncode != 0:
         raise SyncError(result.stderr.strip() or result.stdout.strip())
     return result.stdout
 
 
+def run_gog_json(args: list[str], config: GogConfig) -> Any:
+    """Run gog with --json and parse its stdout bytes directly (no intermediate str)."""
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            gog_command(args, config, json_output=True),
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            bufsize=1024 * 1024,
+        )
+        with proc.stdout:
+            raw = proc.stdout.read()
+        if proc.wait() != 0:
+            stderr.seek(0)
+            message = stderr.read().decode("utf-8", "replace").strip()
+            raise SyncError(message or raw.decode("utf-8", "replace").strip())
+    return importer.json_loads(raw)
+
+
 def load_skills_config() -> dict[str, Any]:
     try:
-        with open(SKILLS_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(SKILLS_CONFIG_PATH, "rb") as f:
+            data = importer.json_loads(f.read())
             return data if isinstance(data, dict) else {}
     except FileNotFoundError:
         return {}
@@ -84,13 +114,12 @@ def load_skills_config() -> dict[str, Any]:
 def normalize_header(text: str) -> str:
     normalized = unicodedata.normalize("NFKD", text)
     ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
-    ascii_text = re.sub(r"\s+", " ", ascii_text.strip().lower())
+    ascii_text = WHITESPACE_RE.sub(" ", ascii_text.strip().lower())
     return ascii_text
 
 
 def resolve_sheet_title(sheet_id: str, gid: int | None, config: GogConfig) -> SheetInfo:
-    raw = run_gog(["sheets", "metadata", sheet_id], config, json_output=True)
-    payload = json.loads(raw)
+    payload = run_gog_json(["sheets", "metadata", sheet_id], config)
     sheets = payload.get("sheets", [])
     if not sheets:
         raise SyncError("No se encontraron pestañas en el Sheet.")
@@ -164,26 +193,30 @@ def column_letter(index: int) -> str:
 
 
 def extract_drive_id(url: str) -> str | None:
-    patterns = [
-        r"/d/([a-zA-Z0-9_-]+)",
-        r"id=([a-zA-Z0-9_-]+)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in DRIVE_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     return None
 
 
-def drive_file_extension(file_id: str, config: GogConfig) -> str:
-    raw = run_gog(["drive", "get", file_id], config, json_output=True)
-    payload = json.loads(raw)
-    name = payload.get("name", "")
-    if name and "." in name:
-        return Path(name).suffix
-    mime = payload.get("mimeType", "")
-    if mime.startswith("image/"):
-        return f".{mime.split('/', 1)[1]}"
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF8", ".gif"),
+)
+
+_drive_downloads: dict[str, Path] = {}
+
+
+def sniff_image_extension(path: Path) -> str:
+    with path.open("rb") as handle:
+        head = handle.read(12)
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
     return ""
 
 
@@ -193,30 +226,39 @@ def download_drive_file(
     base_name: str,
     config: GogConfig,
 ) -> Path:
+    """Download a Drive file in one gog call and name it after its image signature."""
+    cached = _drive_downloads.get(file_id)
+    if cached is not None and cached.exists():
+        return cached
     target_dir.mkdir(parents=True, exist_ok=True)
-    ext = drive_file_extension(file_id, config)
-    filename = f"{base_name}{ext or '.jpg'}"
-    output_path = target_dir / filename
+    partial_path = target_dir / f"{base_name}.download"
     run_gog([
         "drive",
         "download",
         file_id,
         "--out",
-        str(output_path),
+        str(partial_path),
     ], config)
+    output_path = target_dir / f"{base_name}{sniff_image_extension(partial_path) or '.jpg'}"
+    os.replace(partial_path, output_path)
+    _drive_downloads[file_id] = output_path
     return output_path
 
 
-def get_cell(row: list[str], index: int | None) -> str:
-    if index is None or index >= len(row):
-        return ""
-    return row[index].strip()
+def contiguous_blocks(numbers: Iterable[int]) -> list[tuple[int, int]]:
+    blocks: list[tuple[int, int]] = []
+    for number in sorted(set(numbers)):
+        if blocks and number == blocks[-1][1] + 1:
+            blocks[-1] = (blocks[-1][0], number)
+        else:
+            blocks.append((number, number))
+    return blocks
 
 
 def build_rows(
     values: list[list[str]],
     columns: ColumnMap,
-    existing_keys: set[tuple[str, str]],
+    existing_keys: set[str],
     downloads_dir: Path,
     config: GogConfig,
     download_images: bool,
@@ -224,48 +266,58 @@ def build_rows(
     rows: list[list[str]] = []
     rows_to_mark: list[int] = []
     rows_skipped_duplicates: list[int] = []
+    # file_id -> (base_name, [(position in rows, sheet row number)])
+    pending_downloads: dict[str, tuple[str, list[tuple[int, int]]]] = {}
+
+    # Optional columns point at a trailing "" sentinel so every lookup is a plain index.
+    def col(index: int | None) -> int:
+        return -1 if index is None else index
+
+    date_i, title_i, rating_i = col(columns.date), col(columns.title), col(columns.rating)
+    company_i, position_i, image_i = col(columns.company), col(columns.position), col(columns.image)
+    name_i, text_i, published_i = columns.name, columns.text, columns.published
+    width = max(date_i, title_i, rating_i, company_i, position_i, image_i, name_i, text_i, published_i) + 1
 
     for row_index, row in enumerate(values[1:], start=2):
-        if not any(cell.strip() for cell in row):
+        # Most of the sheet is already published: check that one cell before normalizing the row.
+        if len(row) > published_i and row[published_i].strip():
             continue
-        published = get_cell(row, columns.published)
-        if published:
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
             continue
+        if len(cells) < width:
+            cells.extend([""] * (width - len(cells)))
+        cells.append("")
 
-        name = get_cell(row, columns.name)
-        text = get_cell(row, columns.text)
+        name = cells[name_i]
+        text = cells[text_i]
         if not name or not text:
             _warn(f"Fila {row_index} sin nombre o texto, se omite.")
             continue
 
-        raw_date = get_cell(row, columns.date)
+        raw_date = cells[date_i]
         normalized_date = importer.parse_date(raw_date) if raw_date else ""
-        key = (name.strip().lower(), normalized_date)
-        if key in existing_keys:
+        if importer.duplicate_key(name, normalized_date) in existing_keys:
             rows_to_mark.append(row_index)
             rows_skipped_duplicates.append(row_index)
             _warn(f"Fila {row_index} ya existe en testimonials.json, se marca igual.")
             continue
 
-        title = get_cell(row, columns.title)
-        rating = get_cell(row, columns.rating)
-        company = get_cell(row, columns.company)
-        position = get_cell(row, columns.position)
+        title = cells[title_i]
+        rating = cells[rating_i]
+        company = cells[company_i]
+        position = cells[position_i]
         display_position = position or company
 
-        image_url = get_cell(row, columns.image)
+        image_url = cells[image_i]
         image_path = ""
         if image_url and download_images:
             if image_url.startswith("http") and "drive.google" in image_url:
                 file_id = extract_drive_id(image_url)
                 if file_id:
                     base_name = importer.slugify(name) + "-" + file_id[:6]
-                    try:
-                        image_path = str(
-                            download_drive_file(file_id, downloads_dir, base_name, config)
-                        )
-                    except SyncError as exc:
-                        _warn(f"No se pudo descargar imagen fila {row_index}: {exc}")
+                    pending = pending_downloads.setdefault(file_id, (base_name, []))
+                    pending[1].append((len(rows), row_index))
                 else:
                     _warn(f"URL de Drive invalida fila {row_index}: {image_url}")
             elif Path(image_url).exists():
@@ -284,6 +336,24 @@ def build_rows(
         ])
         rows_to_mark.append(row_index)
 
+    if pending_downloads:
+        # gog calls are network-bound, so overlap them instead of downloading one by one.
+        with ThreadPoolExecutor(max_workers=MAX_GOG_WORKERS) as executor:
+            futures = {
+                file_id: executor.submit(download_drive_file, file_id, downloads_dir, base_name, config)
+                for file_id, (base_name, _) in pending_downloads.items()
+            }
+        for file_id, future in futures.items():
+            targets = pending_downloads[file_id][1]
+            try:
+                image_path = str(future.result())
+            except SyncError as exc:
+                for _, row_index in targets:
+                    _warn(f"No se pudo descargar imagen fila {row_index}: {exc}")
+                continue
+            for position, _ in targets:
+                rows[position][6] = image_path
+
     return rows, rows_to_mark, rows_skipped_duplicates
 
 
@@ -327,6 +397,13 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         "--overwrite-images",
         action="store_true",
     )
+    parser.add_argument(
+        "--detector",
+        choices=importer.DETECTORS,
+        default="haar",
+    )
+    parser.add_argument("--detector-model")
+    parser.add_argument("--detector-config")
     parser.add_argument(
         "--ai-auto",
         action="store_true",
@@ -355,13 +432,12 @@ def main(argv: list[str]) -> int:
         sheet_title = sheet_info.sheet_title
 
     sheet_range = f"'{sheet_title}'!{args.sheet_range}"
-    raw = run_gog([
+    payload = run_gog_json([
         "sheets",
         "get",
         sheet_id,
         sheet_range,
-    ], config, json_output=True)
-    payload = json.loads(raw)
+    ], config)
     values = payload.get("values", [])
     if not values:
         _warn("No hay filas en el Sheet.")
@@ -371,11 +447,7 @@ def main(argv: list[str]) -> int:
     columns = resolve_columns(headers)
 
     testimonials_path = Path(args.testimonials_json)
-    testimonials = importer.load_testimonials(testimonials_path)
-    existing_keys = {
-        (str(item.get("name", "")).strip().lower(), str(item.get("date", "")).strip())
-        for item in testimonials
-    }
+    existing_keys = importer.load_duplicate_index(testimonials_path)
 
     downloads_dir = Path(args.downloads_dir)
     rows, rows_to_mark, duplicate_rows = build_rows(
@@ -403,7 +475,13 @@ def main(argv: list[str]) -> int:
             args.ai_astro,
             "--image-size",
             str(args.image_size),
+            "--detector",
+            args.detector,
         ]
+        if args.detector_model:
+            import_args.extend(["--detector-model", args.detector_model])
+        if args.detector_config:
+            import_args.extend(["--detector-config", args.detector_config])
         if args.overwrite_images:
             import_args.append("--overwrite-images")
         if args.dry_run:
@@ -423,13 +501,20 @@ def main(argv: list[str]) -> int:
         return 0
 
     published_col_letter = column_letter(columns.published)
-    for row_number in rows_to_mark:
-        cell_range = f"'{sheet_title}'!{published_col_letter}{row_number}"
+
+    # One update per run of adjacent rows (e.g. C5:C12) instead of one per cell.
+    def mark_block(block: tuple[int, int]) -> None:
+        first, last = block
+        cell_range = f"'{sheet_title}'!{published_col_letter}{first}:{published_col_letter}{last}"
+        column_values = json.dumps([[args.mark_value]] * (last - first + 1))
         run_gog(
-            ["sheets", "update", sheet_id, cell_range, args.mark_value],
+            ["sheets", "update", sheet_id, cell_range, "--values-json", column_values],
             config,
         )
 
+    with ThreadPoolExecutor(max_workers=MAX_GOG_WORKERS) as executor:
+        list(executor.map(mark_block, contiguous_blocks(rows_to_mark)))
+
     _log(f"Marcadas {len(rows_to_mark)} filas como publicadas.")
     return 0
 
@@ -1,17 +1,25 @@
 #!/usr/bin/env python3
 import json
+import re
+import time
 from pathlib import Path
-from urllib.parse import urlparse
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build, build_from_document
 
 SCOPES = [
     "https://www.googleapis.com/auth/chat.messages.readonly",
     "https://www.googleapis.com/auth/chat.spaces.readonly",
     "https://www.googleapis.com/auth/chat.memberships.readonly",
 ]
+_SCOPES_FS = frozenset(SCOPES)
+
+DISCOVERY_CACHE_TTL = 7 * 24 * 3600
+
+_URL_FRAGMENT_RE = re.compile(r"/*chat/+space/+([^/]+)(?:/+([^/]+))?")
+_SPACE_RE = re.compile(r"spaces/+([^/]+)(?:/+threads/+([^/]+))?")
 
 
 def default_client_secret_path() -> Path:
@@ -28,6 +36,36 @@ def default_token_path() -> Path:
     return Path.home() / ".config/google-chat/token.json"
 
 
+def default_discovery_cache_path() -> Path:
+    return Path.home() / ".cache/google-chat/chat_v1_discovery.json"
+
+
+def build_chat_service(creds: Credentials, cache_path: Path | None = None):
+    """Build the Chat v1 client from a cached discovery document when one is fresh enough."""
+    cache_path = (cache_path or default_discovery_cache_path()).expanduser()
+    try:
+        if time.time() - cache_path.stat().st_mtime < DISCOVERY_CACHE_TTL:
+            return build_from_document(cache_path.read_text(encoding="utf-8"), credentials=creds)
+    except (OSError, ValueError):
+        pass
+
+    service = build("chat", "v1", credentials=creds, cache_discovery=False)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(service._rootDesc), encoding="utf-8")
+    except (AttributeError, OSError, TypeError):
+        pass
+    return service
+
+
+def _save_token(token_path: Path, creds: Credentials) -> None:
+    payload = creds.to_json()
+    if token_path.exists() and token_path.read_text() == payload:
+        return
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    token_path.write_text(payload)
+
+
 def load_credentials(
     token_path: Path | None = None,
     client_secret_path: Path | None = None,
@@ -38,31 +76,39 @@ def load_credentials(
     token_path = (token_path or default_token_path()).expanduser()
     client_secret_path = (client_secret_path or default_client_secret_path()).expanduser()
 
+    required = _SCOPES_FS if scopes is SCOPES else frozenset(scopes)
+
     creds = None
     if token_path.exists():
         creds = Credentials.from_authorized_user_file(token_path, scopes=scopes)
 
-    if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
+    has_scopes = creds is not None and required.issubset(creds.scopes or ())
+    if has_scopes and creds.valid:
+        return creds
 
-    if not creds or not creds.valid or not set(scopes).issubset(set(creds.scopes or [])):
-        if not client_secret_path.exists():
-            raise FileNotFoundError(
-                f"OAuth client secret not found: {client_secret_path}"
-            )
-        flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, scopes)
-        if no_browser:
-            flow.redirect_uri = "urn:ietf:wg:oauth:2.0:oob"
-            auth_url, _ = flow.authorization_url(prompt="consent")
-            print("Open this URL in your browser:\n" + auth_url)
-            code = input("Enter authorization code: ").strip()
-            flow.fetch_token(code=code)
-            creds = flow.credentials
-        else:
-            creds = flow.run_local_server(port=0)
-
-        token_path.parent.mkdir(parents=True, exist_ok=True)
-        token_path.write_text(creds.to_json())
+    # Only refresh a token the consent flow below would not replace anyway.
+    if has_scopes and creds.expired and creds.refresh_token:
+        creds.refresh(Request())
+        if creds.valid:
+            _save_token(token_path, creds)
+            return creds
+
+    if not client_secret_path.exists():
+        raise FileNotFoundError(
+            f"OAuth client secret not found: {client_secret_path}"
+        )
+    flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, scopes)
+    if no_browser:
+        flow.redirect_uri = "urn:ietf:wg:oauth:2.0:oob"
+        auth_url, _ = flow.authorization_url(prompt="consent")
+        print("Open this URL in your browser:\n" + auth_url)
+        code = input("Enter authorization code: ").strip()
+        flow.fetch_token(code=code)
+        creds = flow.credentials
+    else:
+        creds = flow.run_local_server(port=0)
+
+    _save_token(token_path, creds)
 
     return creds
 
@@ -72,22 +118,13 @@ def parse_space_thread(value: str) -> tuple[str | None, str | None]:
         return None, None
 
     if value.startswith("http"):
-        frag = urlparse(value).fragment
-        parts = [p for p in frag.split("/") if p]
-        if len(parts) >= 3 and parts[0] == "chat" and parts[1] == "space":
-            space = parts[2]
-            thread = parts[3] if len(parts) >= 4 else None
-            return space, thread
+        # Gmail Chat URLs carry the ids in the fragment: #chat/space/<space>[/<thread>]
+        match = _URL_FRAGMENT_RE.match(value.partition("#")[2])
+    elif value.startswith("spaces/"):
+        match = _SPACE_RE.match(value)
+    else:
+        return value, None
+
+    if not match:
         return None, None
-
-    if value.startswith("spaces/"):
-        parts = [p for p in value.split("/") if p]
-        space = parts[1] if len(parts) > 1 else None
-        thread = None
-        if "threads" in parts:
-            idx = parts.index("threads")
-            if len(parts) > idx + 1:
-                thread = parts[idx + 1]
-        return space, thread
-
-    return value, None
+    return match.group(1), match.group(2)
@@ -2,11 +2,11 @@
 import argparse
 import json
 from pathlib import Path
-
-from googleapiclient.discovery import build
+from typing import Iterator
 
 from chat_common import (
     SCOPES,
+    build_chat_service,
     default_client_secret_path,
     default_token_path,
     load_credentials,
@@ -24,6 +24,25 @@ def format_message(msg: dict) -> str:
     return f"{timestamp} | {sender} | {text} | {name}".strip()
 
 
+def iter_message_pages(service, request_kwargs: dict, max_pages: int = 1) -> Iterator[dict]:
+    """Yield list responses page by page; max_pages=0 follows nextPageToken to the end."""
+    messages_api = service.spaces().messages()
+    request = messages_api.list(**request_kwargs)
+    pages = 0
+    while request is not None:
+        resp = request.execute()
+        yield resp
+        pages += 1
+        if max_pages and pages >= max_pages:
+            return
+        request = messages_api.list_next(request, resp)
+
+
+def iter_messages(service, request_kwargs: dict, max_pages: int = 1) -> Iterator[dict]:
+    for resp in iter_message_pages(service, request_kwargs, max_pages):
+        yield from resp.get("messages", [])
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Fetch Google Chat messages.")
     parser.add_argument(
@@ -46,6 +65,12 @@ def main() -> None:
         dest="page_token",
         help="Page token for pagination.",
     )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=1,
+        help="Number of pages to fetch (0 = until the end of the history).",
+    )
     parser.add_argument(
         "--format",
         choices=["text", "json"],
@@ -88,7 +113,7 @@ def main() -> None:
         no_browser=args.no_browser,
     )
 
-    service = build("chat", "v1", credentials=creds, cache_discovery=False)
+    service = build_chat_service(creds)
 
     request_kwargs = {
         "parent": f"spaces/{space_id}",
@@ -99,27 +124,30 @@ def main() -> None:
     if args.filter:
         request_kwargs["filter"] = args.filter
 
-    resp = service.spaces().messages().list(**request_kwargs).execute()
-    messages = resp.get("messages", [])
+    thread_name = f"spaces/{space_id}/threads/{thread_id}" if thread_id else None
 
-    if thread_id:
-        thread_name = f"spaces/{space_id}/threads/{thread_id}"
-        messages = [
-            msg for msg in messages if msg.get("thread", {}).get("name") == thread_name
-        ]
+    def in_thread(msg: dict) -> bool:
+        return thread_name is None or msg.get("thread", {}).get("name") == thread_name
 
     if args.format == "json":
+        messages = []
+        next_page_token = None
+        for resp in iter_message_pages(service, request_kwargs, args.pages):
+            messages.extend(msg for msg in resp.get("messages", []) if in_thread(msg))
+            next_page_token = resp.get("nextPageToken")
         payload = {
             "space": f"spaces/{space_id}",
             "thread": thread_id,
-            "nextPageToken": resp.get("nextPageToken"),
+            "nextPageToken": next_page_token,
             "messages": messages,
         }
         print(json.dumps(payload, ensure_ascii=False, indent=2))
         return
 
-    for msg in messages:
-        print(format_message(msg))
+    # Print each page as it arrives instead of waiting for the whole history.
+    for msg in iter_messages(service, request_kwargs, args.pages):
+        if in_thread(msg):
+            print(format_message(msg))
 
 
 if __name__ == "__main__":
@@ -3,10 +3,9 @@ import argparse
 import json
 from pathlib import Path
 
-from googleapiclient.discovery import build
-
 from chat_common import (
     SCOPES,
+    build_chat_service,
     default_client_secret_path,
     default_token_path,
     load_credentials,
@@ -49,7 +48,7 @@ def main() -> None:
         no_browser=args.no_browser,
     )
 
-    service = build("chat", "v1", credentials=creds, cache_discovery=False)
+    service = build_chat_service(creds)
 
     request_kwargs = {"pageSize": args.limit}
     if args.page_token:
@@ -4,20 +4,31 @@ from __future__ import annotations
 Transcribe un vídeo, genera subtítulos (SRT/ASS karaoke), ajusta el nivel de audio al pico -1 dBFS,
 quema subtítulos en MP4 y crea un caption.
 
-Requisitos: ffmpeg, Python 3.8+, `pip install --user openai-whisper`.
+Requisitos: ffmpeg, Python 3.8+ y un backend de Whisper: `pip install --user faster-whisper`
+(recomendado, INT8 en CPU / FP16 en CUDA) o `pip install --user openai-whisper`.
 """
 
 import argparse
+import contextlib
+import os
 import pathlib
 import re
-import shutil
 import subprocess
 import sys
 import textwrap
-import tempfile
 from datetime import timedelta
 
-import whisper
+import numpy as np
+
+try:
+    from faster_whisper import WhisperModel  # type: ignore
+except Exception:  # pragma: no cover - optional backend
+    WhisperModel = None
+
+try:
+    import whisper  # type: ignore
+except Exception:  # pragma: no cover - fallback backend
+    whisper = None
 
 MAX_CHARS_PER_LINE = 18
 MAX_LINES = 2
@@ -29,145 +40,143 @@ DEFAULT_CRF = 20
 DEFAULT_CAPTION_LEN = 240
 DEFAULT_KARAOKE = True
 DEFAULT_AUTO_GAIN = True
-KEEP_AUDIO = False  # siempre borrar el WAV final normalizado
+DEFAULT_VAD = True  # solo con faster-whisper
+VIDEO_EXTENSIONS = {".mov", ".mp4", ".m4v", ".mkv", ".webm"}
 
+# ffmpeg sin banner ni progreso; solo se deja log "info" donde se parsea stderr
+FFMPEG_BASE = ["ffmpeg", "-hide_banner", "-nostats"]
+FFMPEG_QUIET = [*FFMPEG_BASE, "-loglevel", "error"]
 
-def sec_to_srt(ts: float) -> str:
-    # Use divmod to avoid accumulating minutes/seconds twice and keep millis within 0-999
-    hours, rem = divmod(int(ts), 3600)
-    minutes, seconds = divmod(rem, 60)
-    millis = int(round((ts - int(ts)) * 1000))
-    # carry overflows (e.g. 59.9995 rounds to 60.000)
-    if millis >= 1000:
-        millis -= 1000
-        seconds += 1
-        if seconds >= 60:
-            seconds -= 60
-            minutes += 1
-            if minutes >= 60:
-                minutes -= 60
-                hours += 1
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+SILENCE_END_RE = re.compile(r"silence_end:\s*([0-9.]+)")
 
+ASS_HEADER = textwrap.dedent(
+    """
+    [Script Info]
+    ScriptType: v4.00+
+    WrapStyle: 2
+    PlayResX: 1920
+    PlayResY: 1080
+    ScaledBorderAndShadow: yes
+
+    [V4+ Styles]
+    Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+    Style: Default,Arial,54,&H00FFFFFF,&H0078AAFF,&H00000000,&H64000000,-1,0,0,0,100,100,0,0,1,4,1,2,90,90,220,0
+
+    [Events]
+    Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+    """
+).strip() + "\n"
 
-def write_srt(segments, out_path: pathlib.Path):
-    lines = []
-    for i, seg in enumerate(segments, start=1):
-        start = sec_to_srt(seg['start'])
-        end = sec_to_srt(seg['end'])
-        text = wrap_text(seg.get('text', ''), max_chars=MAX_CHARS_PER_LINE, max_lines=MAX_LINES)
-        lines.append(str(i))
-        lines.append(f"{start} --> {end}")
-        lines.append(text)
-        lines.append("")
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+
+def sec_to_srt(ts: float) -> str:
+    # Round once in integer milliseconds so carries (e.g. 59.9995 -> 60.000) fall out of divmod
+    hours, rem = divmod(int(round(ts * 1000)), 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    seconds, millis = divmod(rem, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
 
 
 def sanitize(text: str) -> str:
     return text.replace('\u266a', '').strip()
 
 
-def write_txt(segments, out_path: pathlib.Path):
-    full = " ".join(sanitize(seg.get('text', '')) for seg in segments)
-    out_path.write_text(full.strip(), encoding="utf-8")
-
-
 def wrap_text(text: str, max_chars: int = MAX_CHARS_PER_LINE, max_lines: int = MAX_LINES) -> str:
-    words = text.strip().split()
-    lines, current = [], ""
-    for w in words:
-        candidate = (current + " " + w).strip()
-        if len(candidate) <= max_chars:
-            current = candidate
+    # Track line lengths as ints instead of rebuilding a candidate string per word.
+    lines: list[str] = []
+    current: list[str] = []
+    current_len = 0
+    for w in text.split():
+        needed = current_len + len(w) + 1 if current else len(w)
+        if needed <= max_chars:
+            current.append(w)
+            current_len = needed
         else:
-            lines.append(current)
-            current = w
-        if len(lines) == max_lines - 1 and current and len(current) > max_chars:
-            # force break early if last line would overflow badly
-            pass
+            lines.append(" ".join(current))
+            current = [w]
+            current_len = len(w)
     if current:
-        lines.append(current)
+        lines.append(" ".join(current))
     if len(lines) > max_lines:
         # merge overflow into the last line
         lines = lines[: max_lines - 1] + [" ".join(lines[max_lines - 1 :])]
     return "\n".join(lines)
 
 
-def write_ass_karaoke(segments, out_path: pathlib.Path):
-    header = textwrap.dedent(
-        """
-        [Script Info]
-        ScriptType: v4.00+
-        WrapStyle: 2
-        PlayResX: 1920
-        PlayResY: 1080
-        ScaledBorderAndShadow: yes
-
-        [V4+ Styles]
-        Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-        Style: Default,Arial,54,&H00FFFFFF,&H0078AAFF,&H00000000,&H64000000,-1,0,0,0,100,100,0,0,1,4,1,2,90,90,220,0
-
-        [Events]
-        Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-        """
-    ).strip() + "\n"
-
-    def ass_time(ts: float) -> str:
-        hours, rem = divmod(int(ts), 3600)
-        minutes, seconds = divmod(rem, 60)
-        centiseconds = int(round((ts - int(ts)) * 100))
-        if centiseconds >= 100:
-            centiseconds -= 100
-            seconds += 1
-            if seconds >= 60:
-                seconds -= 60
-                minutes += 1
-                if minutes >= 60:
-                    minutes -= 60
-                    hours += 1
-        return f"{hours:d}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
-
-    def wrap_karaoke_words(words, max_chars: int = MAX_CHARS_PER_LINE, max_lines: int = MAX_LINES):
-        lines = [[]]
-        current_len = 0
-        for w in words:
-            clean = sanitize(w['word'])
-            if not clean:
-                continue
-            token_len = len(clean) + 1  # include space
-            if current_len + token_len > max_chars and len(lines) < max_lines:
-                lines.append([])
-                current_len = 0
-            lines[-1].append(w)
-            current_len += token_len
-        # flatten with \N between lines
-        parts = []
-        for li, line_words in enumerate(lines):
-            if li and line_words:
-                parts.append("\\N")
-            for w in line_words:
-                duration_cs = max(1, int(round((w['end'] - w['start']) * 100)))
-                parts.append(f"{{\\k{duration_cs}}}{sanitize(w['word'])}")
-        return " ".join(parts)
-
-    events = []
-    for seg in segments:
-        start = ass_time(seg['start'])
-        end = ass_time(seg['end'])
-        words = seg.get('words') or []
-        if words:
-            text = wrap_karaoke_words(words, max_chars=32, max_lines=2)
-        else:
-            text = wrap_text(seg.get('text', ''), max_chars=32, max_lines=2).replace("\n", "\\N")
-        dialogue = f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}"
-        events.append(dialogue)
+def ass_time(ts: float) -> str:
+    hours, rem = divmod(int(round(ts * 100)), 360_000)
+    minutes, rem = divmod(rem, 6_000)
+    seconds, centiseconds = divmod(rem, 100)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
+
 
-    out_path.write_text(header + "\n" + "\n".join(events) + "\n", encoding="utf-8")
+def wrap_karaoke_words(words, max_chars: int = MAX_CHARS_PER_LINE, max_lines: int = MAX_LINES):
+    parts = []
+    line_count = 1
+    current_len = 0
+    for w in words:
+        clean = sanitize(w['word'])
+        if not clean:
+            continue
+        token_len = len(clean) + 1  # include space
+        if current_len + token_len > max_chars and line_count < max_lines:
+            # \N between lines
+            parts.append("\\N")
+            line_count += 1
+            current_len = 0
+        current_len += token_len
+        duration_cs = max(1, int(round((w['end'] - w['start']) * 100)))
+        parts.append(f"{{\\k{duration_cs}}}{clean}")
+    return " ".join(parts)
+
+
+def srt_cue(index: int, seg) -> str:
+    text = wrap_text(seg.get('text', ''), max_chars=MAX_CHARS_PER_LINE, max_lines=MAX_LINES)
+    return f"{index}\n{sec_to_srt(seg['start'])} --> {sec_to_srt(seg['end'])}\n{text}\n"
+
+
+def ass_event(seg) -> str:
+    words = seg.get('words') or []
+    if words:
+        text = wrap_karaoke_words(words, max_chars=32, max_lines=2)
+    else:
+        text = wrap_text(seg.get('text', ''), max_chars=32, max_lines=2).replace("\n", "\\N")
+    return f"Dialogue: 0,{ass_time(seg['start'])},{ass_time(seg['end'])},Default,,0,0,0,,{text}"
+
+
+def write_outputs(
+    segments,
+    srt_path: pathlib.Path,
+    txt_path: pathlib.Path,
+    ass_path: pathlib.Path | None = None,
+) -> str:
+    """Escribe SRT, TXT y (opcional) ASS en una sola pasada por los segmentos; devuelve el texto completo."""
+    texts = []
+    with contextlib.ExitStack() as stack:
+        srt = stack.enter_context(open(srt_path, "w", encoding="utf-8", buffering=1 << 16))
+        ass = None
+        if ass_path is not None:
+            ass = stack.enter_context(open(ass_path, "w", encoding="utf-8", buffering=1 << 16))
+            ass.write(ASS_HEADER + "\n")
+        for i, seg in enumerate(segments, start=1):
+            if i > 1:
+                srt.write("\n")
+            srt.write(srt_cue(i, seg))
+            if ass is not None:
+                if i > 1:
+                    ass.write("\n")
+                ass.write(ass_event(seg))
+            texts.append(sanitize(seg.get('text', '')))
+        if ass is not None:
+            ass.write("\n")
+    full_text = " ".join(texts).strip()
+    txt_path.write_text(full_text, encoding="utf-8")
+    return full_text
 
 
 def make_caption(full_text: str, max_chars: int = 240) -> str:
     # Very light heuristic summary: first 2 sentences trimmed to max_chars.
-    sentences = re.split(r"(?<=[.!?])\s+", full_text.strip())
+    sentences = SENTENCE_SPLIT_RE.split(full_text.strip())
     caption = " ".join(sentences[:2]).strip()
     if not caption:
         caption = full_text.strip()
@@ -198,75 +207,68 @@ def split_segments_for_brevity(segments, max_words: int = MAX_WORDS_PER_CUE):
     return new_segments
 
 
-def extract_wav(input_path: pathlib.Path, wav_path: pathlib.Path):
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(input_path),
-        "-vn",
-        "-ac",
-        "1",
-        "-ar",
-        "48000",
-        "-sample_fmt",
-        "s16",
-        str(wav_path),
-    ]
-    print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True)
-
-
-def normalize_audio(wav_in: pathlib.Path, wav_out: pathlib.Path):
-    """Deprecated: mantenido por compatibilidad interna (no se usa)."""
-    shutil.copyfile(wav_in, wav_out)
-
-
-def apply_gain(wav_in: pathlib.Path, wav_out: pathlib.Path, gain_db: float = 0.0):
-    """Aplica ganancia simple con limitador suave para evitar clipping."""
-    if abs(gain_db) < 0.01:
-        shutil.copyfile(wav_in, wav_out)
-        return
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(wav_in),
-        "-af",
-        f"volume={gain_db}dB,alimiter=limit=0.97",
-        "-ar",
-        "48000",
-        str(wav_out),
-    ]
-    print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True)
+def load_model(name: str = DEFAULT_MODEL):
+    """Carga faster-whisper (CTranslate2 cuantizado) si está disponible; si no, openai-whisper."""
+    threads = os.cpu_count() or 1
+    if WhisperModel is not None:
+        import ctranslate2  # type: ignore  # dependencia de faster-whisper
+
+        if ctranslate2.get_cuda_device_count() > 0:
+            return WhisperModel(name, device="cuda", compute_type="float16")
+        return WhisperModel(name, device="cpu", compute_type="int8", cpu_threads=threads)
+    if whisper is not None:
+        import torch  # type: ignore  # dependencia de openai-whisper
+
+        torch.set_num_threads(threads)
+        return whisper.load_model(name)
+    print(
+        "No hay backend de Whisper. Instala `pip install --user faster-whisper` o `openai-whisper`.",
+        file=sys.stderr,
+    )
+    sys.exit(1)
+
+
+def transcribe(model, audio: np.ndarray) -> list[dict]:
+    """Devuelve segmentos {'start','end','text','words'} con el mismo formato para ambos backends."""
+    if WhisperModel is not None and isinstance(model, WhisperModel):
+        segments, _info = model.transcribe(
+            audio,
+            language=DEFAULT_LANG,
+            word_timestamps=DEFAULT_KARAOKE,
+            beam_size=1,
+            # Silero VAD descarta los silencios antes de decodificar; los tiempos siguen siendo absolutos.
+            vad_filter=DEFAULT_VAD,
+        )
+        return [
+            {
+                'start': seg.start,
+                'end': seg.end,
+                'text': seg.text,
+                'words': [
+                    {'start': w.start, 'end': w.end, 'word': w.word} for w in (seg.words or [])
+                ],
+            }
+            for seg in segments
+        ]
+    result = model.transcribe(audio, language=DEFAULT_LANG, word_timestamps=DEFAULT_KARAOKE)
+    return result.get('segments', [])
 
 
-def analyze_volume(wav_in: pathlib.Path):
+def pcm_volume(pcm: np.ndarray):
     """
-    Usa ffmpeg volumedetect para obtener mean_volume y max_volume en dBFS.
-    Devuelve dict con keys 'mean' y 'max'. Si falla, None.
+    Calcula mean_volume (RMS) y max_volume en dBFS sobre el PCM s16 ya decodificado.
+    Devuelve dict con keys 'mean' y 'max'. Si el audio está vacío o en silencio, None.
     """
-    cmd = [
-        "ffmpeg",
-        "-i",
-        str(wav_in),
-        "-af",
-        "volumedetect",
-        "-f",
-        "null",
-        "-",
-    ]
-    print("Running:", " ".join(cmd))
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    stderr = proc.stderr or ""
-    mean_match = re.search(r"mean_volume:\s*(-?\d+(?:\.\d+)?)\s*dB", stderr)
-    max_match = re.search(r"max_volume:\s*(-?\d+(?:\.\d+)?)\s*dB", stderr)
-    if not max_match:
+    if pcm.size == 0:
         return None
+    peak = int(np.max(np.abs(pcm.astype(np.int32))))
+    if peak == 0:
+        return None
+    samples = pcm.astype(np.float32)
+    rms = float(np.sqrt(np.mean(samples * samples)))
     return {
-        "mean": float(mean_match.group(1)) if mean_match else None,
-        "max": float(max_match.group(1)),
+        "mean": float(20 * np.log10(rms / 32768.0)),
+        "max": float(20 * np.log10(peak / 32768.0)),
     }
 
 
@@ -276,7 +278,7 @@ def detect_leading_silence(wav_in: pathlib.Path, threshold_db: float = -50.0, mi
     Si no encuentra silencio, devuelve 0.0.
     """
     cmd = [
-        "ffmpeg",
+        *FFMPEG_BASE,  # silencedetect escribe en stderr: se mantiene -loglevel info
         "-i",
         str(wav_in),
         "-af",
@@ -288,7 +290,7 @@ def detect_leading_silence(wav_in: pathlib.Path, threshold_db: float = -50.0, mi
     print("Running:", " ".join(cmd))
     proc = subprocess.run(cmd, capture_output=True, text=True)
     stderr = proc.stderr or ""
-    match = re.search(r"silence_end:\s*([0-9.]+)", stderr)
+    match = SILENCE_END_RE.search(stderr)
     if match:
         try:
             return float(match.group(1))
@@ -312,25 +314,44 @@ def compute_gain_to_peak(current_peak_db: float, clamp_db: float = 6.0, deadband
     return gain
 
 
-def resample_wav(wav_in: pathlib.Path, wav_out: pathlib.Path, ar: int = 48000):
-    """Re-muestrea WAV a la frecuencia indicada."""
+def decode_pcm(input_path: pathlib.Path, sr: int = 16000) -> np.ndarray:
+    """Decodifica el audio del vídeo a PCM mono s16 por pipe, sin WAV intermedio."""
     cmd = [
-        "ffmpeg",
-        "-y",
+        *FFMPEG_QUIET,
         "-i",
-        str(wav_in),
+        str(input_path),
+        "-vn",
+        "-ac",
+        "1",
         "-ar",
-        str(ar),
-        str(wav_out),
+        str(sr),
+        "-f",
+        "s16le",
+        "pipe:1",
     ]
     print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    with proc.stdout:
+        raw = proc.stdout.read()
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return np.frombuffer(raw, dtype=np.int16)
+
+
+def pcm_for_whisper(pcm: np.ndarray, gain_db: float = 0.0) -> np.ndarray:
+    """Aplica la ganancia sobre el PCM s16 y lo convierte al float32 [-1, 1] que espera Whisper."""
+    audio = pcm.astype(np.float32)
+    if abs(gain_db) >= 0.01:
+        audio *= 10 ** (gain_db / 20)
+        np.clip(audio, -32768, 32767, out=audio)
+    audio /= 32768.0
+    return audio
 
 
 def resample_wav_with_offset(wav_in: pathlib.Path, wav_out: pathlib.Path, ar: int, offset: float):
     """Re-muestrea WAV aplicando un desplazamiento inicial."""
     cmd = [
-        "ffmpeg",
+        *FFMPEG_QUIET,
         "-y",
         "-ss",
         f"{offset:.3f}",
@@ -350,50 +371,56 @@ def burn_subs(
     output_path: pathlib.Path,
     karaoke: bool,
     crf: int = 20,
-    enhanced_audio: pathlib.Path | None = None,
+    gain_db: float = 0.0,
     start_offset: float = 0.0,
 ):
+    """Quema subtítulos y ajusta el audio original en la misma pasada de ffmpeg."""
     base_vf = f"ass={subs_path}" if karaoke else f"subtitles={subs_path}"
+    af = ["aresample=48000"]
     if start_offset > 0:
         # Corte preciso por filtro para evitar frame negro que deja el seek rápido
         vf = f"trim=start={start_offset:.3f},setpts=PTS-STARTPTS,{base_vf}"
+        af.append(f"atrim=start={start_offset:.3f}")
     else:
         vf = base_vf
+    af.append("asetpts=PTS-STARTPTS")
+    if abs(gain_db) >= 0.01:
+        # Ganancia simple con limitador suave para evitar clipping
+        af.append(f"volume={gain_db}dB,alimiter=limit=0.97")
 
-    cmd = ["ffmpeg", "-y", "-i", str(input_path)]
-    if enhanced_audio:
-        cmd += ["-i", str(enhanced_audio)]
-    cmd += ["-vf", vf, "-c:v", "libx264", "-crf", str(crf), "-preset", "veryfast"]
-    if enhanced_audio:
-        cmd += [
-            "-map",
-            "0:v:0",
-            "-map",
-            "1:a:0",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "192k",
-            "-af",
-            "asetpts=PTS-STARTPTS",
-        ]
-    else:
-        cmd += ["-c:a", "copy"]
-    cmd.append(str(output_path))
+    cmd = [
+        *FFMPEG_QUIET,
+        "-y",
+        "-i",
+        str(input_path),
+        "-map",
+        "0:v:0",
+        "-map",
+        "0:a:0",
+        "-vf",
+        vf,
+        "-c:v",
+        "libx264",
+        "-crf",
+        str(crf),
+        "-preset",
+        "veryfast",
+        "-af",
+        ",".join(af),
+        "-ac",
+        "1",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "192k",
+        str(output_path),
+    ]
     print("Running:", " ".join(cmd))
     subprocess.run(cmd, check=True)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Transcribe video, genera/ quema subtítulos y caption (parámetros fijos).")
-    parser.add_argument("input", help="Ruta del video (mov/mp4/etc)")
-    args = parser.parse_args()
-
-    input_path = pathlib.Path(args.input).expanduser().resolve()
-    if not input_path.exists():
-        print(f"No encuentro el archivo: {input_path}", file=sys.stderr)
-        sys.exit(1)
-
+def process_video(input_path: pathlib.Path, model) -> bool:
+    """Genera subtítulos, caption y MP4 quemado para un vídeo. Devuelve False si no hay segmentos."""
     out_dir = input_path.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -403,93 +430,115 @@ def main():
     ass_path = out_dir / f"{base}.ass"
     burned_path = out_dir / f"{base}_subtitled.mp4"
 
-    # Normalizar audio y usarlo para transcripción y mux
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = pathlib.Path(tmpdir)
-        raw_wav = tmpdir_path / "audio_raw.wav"
-        norm_wav = tmpdir_path / "audio_norm.wav"
-        print("Extrayendo audio a WAV…")
-        extract_wav(input_path, raw_wav)
-        leading_silence = 0.0  # sin recorte automático
-        gain_to_apply = 0.0
-        if DEFAULT_AUTO_GAIN:
-            vol = analyze_volume(raw_wav)
-            if vol and vol.get("max") is not None:
-                gain_to_apply = compute_gain_to_peak(
-                    current_peak_db=vol["max"],
-                    clamp_db=6.0,
-                    deadband_db=0.3,
-                    target_peak_db=-1.0,
-                )
-                print(
-                    f"Auto-gain: pico actual {vol['max']:.2f} dBFS → objetivo -1.00 dBFS, "
-                    f"ganancia {gain_to_apply:+.2f} dB"
-                )
-            else:
-                print("Auto-gain: no se pudo medir, se deja 0 dB.")
-        print(f"Ajustando ganancia simple ({gain_to_apply:+.2f} dB) con limitador…")
-        apply_gain(raw_wav, norm_wav, gain_db=gain_to_apply)
-        # Sin recorte automático de silencio ni primer frame
-        trimmed_norm_wav = norm_wav
-        mux_offset = 0.0
-        mux_wav = trimmed_norm_wav
-        print("Recorte de silencio inicial y primer frame: desactivado (offset 0.000s).")
-        print("Resampleando a 16 kHz para transcripción…")
-        resamp16 = tmpdir_path / "audio_16k.wav"
-        resample_wav(norm_wav, resamp16, ar=16000)
-        print(f"Cargando modelo Whisper '{DEFAULT_MODEL}' (esto puede tardar la primera vez)...")
-        audio_for_transcript = resamp16
-        final_norm_wav = out_dir / f"{base}_normalized.wav"
-        final_norm_wav.write_bytes(mux_wav.read_bytes())
-        enhanced_audio_path = final_norm_wav
-
-        model = whisper.load_model(DEFAULT_MODEL)
-        print("Transcribiendo…")
-        result = model.transcribe(str(audio_for_transcript), language=DEFAULT_LANG, word_timestamps=DEFAULT_KARAOKE)
-        segments = split_segments_for_brevity(result.get('segments', []), max_words=MAX_WORDS_PER_CUE)
-        if not segments:
-            print("No se obtuvieron segmentos.", file=sys.stderr)
-            sys.exit(1)
-
+    print("Decodificando audio a 16 kHz…")
+    pcm = decode_pcm(input_path, sr=16000)
+    # La ganancia se mide aquí y se aplica tanto a la transcripción como al quemado final
+    gain_to_apply = 0.0
+    if DEFAULT_AUTO_GAIN:
+        vol = pcm_volume(pcm)
+        if vol and vol.get("max") is not None:
+            gain_to_apply = compute_gain_to_peak(
+                current_peak_db=vol["max"],
+                clamp_db=6.0,
+                deadband_db=0.3,
+                target_peak_db=-1.0,
+            )
+            print(
+                f"Auto-gain: pico actual {vol['max']:.2f} dBFS → objetivo -1.00 dBFS, "
+                f"ganancia {gain_to_apply:+.2f} dB"
+            )
+        else:
+            print("Auto-gain: no se pudo medir, se deja 0 dB.")
+    # Sin recorte automático de silencio ni primer frame
+    mux_offset = 0.0
+    print("Recorte de silencio inicial y primer frame: desactivado (offset 0.000s).")
+    audio_for_transcript = pcm_for_whisper(pcm, gain_db=gain_to_apply)
+    print("Transcribiendo…")
+    segments = split_segments_for_brevity(transcribe(model, audio_for_transcript), max_words=MAX_WORDS_PER_CUE)
+    if not segments:
+        print("No se obtuvieron segmentos.", file=sys.stderr)
+        return False
+
+    if DEFAULT_KARAOKE:
+        print(f"Escribiendo {srt_path.name}, {txt_path.name} y ASS karaoke {ass_path.name}…")
+    else:
         print(f"Escribiendo {srt_path.name} y {txt_path.name}…")
-        write_srt(segments, srt_path)
-        write_txt(segments, txt_path)
-
-        # Caption para redes
-        full_text = txt_path.read_text(encoding="utf-8")
-        caption = make_caption(full_text, max_chars=DEFAULT_CAPTION_LEN)
-        caption_path = out_dir / f"{base}_caption.txt"
-        caption_path.write_text(caption, encoding="utf-8")
-
-        # Subtítulos a quemar
-        subs_for_burn = srt_path
-        if DEFAULT_KARAOKE:
-            print(f"Generando ASS karaoke {ass_path.name}…")
-            write_ass_karaoke(segments, ass_path)
-            subs_for_burn = ass_path
-
-        print(f"Quemando subtítulos en {burned_path.name}…")
-        burn_subs(
-            input_path,
-            subs_for_burn,
-            burned_path,
-            karaoke=DEFAULT_KARAOKE,
-            crf=DEFAULT_CRF,
-            enhanced_audio=enhanced_audio_path,
-            start_offset=mux_offset,
-        )
+    full_text = write_outputs(segments, srt_path, txt_path, ass_path if DEFAULT_KARAOKE else None)
+
+    # Caption para redes
+    caption = make_caption(full_text, max_chars=DEFAULT_CAPTION_LEN)
+    caption_path = out_dir / f"{base}_caption.txt"
+    caption_path.write_text(caption, encoding="utf-8")
+
+    # Subtítulos a quemar
+    subs_for_burn = ass_path if DEFAULT_KARAOKE else srt_path
+
+    print(f"Quemando subtítulos y ajustando audio ({gain_to_apply:+.2f} dB) en {burned_path.name}…")
+    burn_subs(
+        input_path,
+        subs_for_burn,
+        burned_path,
+        karaoke=DEFAULT_KARAOKE,
+        crf=DEFAULT_CRF,
+        gain_db=gain_to_apply,
+        start_offset=mux_offset,
+    )
+
+    print("Listo. Salidas:")
+    print("-", srt_path)
+    print("-", ass_path if DEFAULT_KARAOKE else "(ASS omitido)")
+    print("-", txt_path)
+    print("-", caption_path)
+    print("-", burned_path)
+    return True
+
+
+def find_videos(directory: pathlib.Path) -> list[pathlib.Path]:
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file()
+        and path.suffix.lower() in VIDEO_EXTENSIONS
+        and not path.stem.endswith("_subtitled")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe video, genera/ quema subtítulos y caption (parámetros fijos).")
+    parser.add_argument("input", nargs="?", help="Ruta del video (mov/mp4/etc)")
+    parser.add_argument("--batch", help="Procesa todos los vídeos de un directorio cargando el modelo una sola vez")
+    args = parser.parse_args()
+    if bool(args.input) == bool(args.batch):
+        parser.error("Indica un vídeo o --batch DIR")
 
-        print("Listo. Salidas:")
-        print("-", srt_path)
-        print("-", ass_path if DEFAULT_KARAOKE else "(ASS omitido)")
-        print("-", txt_path)
-        print("-", caption_path)
-        print("-", burned_path)
-        if not KEEP_AUDIO:
-            try:
-                enhanced_audio_path.unlink(missing_ok=True)
-            except Exception:
-                pass
+    if args.batch:
+        batch_dir = pathlib.Path(args.batch).expanduser().resolve()
+        if not batch_dir.is_dir():
+            print(f"No encuentro el directorio: {batch_dir}", file=sys.stderr)
+            sys.exit(1)
+        videos = find_videos(batch_dir)
+        if not videos:
+            print(f"No hay vídeos en {batch_dir}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        input_path = pathlib.Path(args.input).expanduser().resolve()
+        if not input_path.exists():
+            print(f"No encuentro el archivo: {input_path}", file=sys.stderr)
+            sys.exit(1)
+        videos = [input_path]
+
+    print(f"Cargando modelo Whisper '{DEFAULT_MODEL}' (esto puede tardar la primera vez)...")
+    model = load_model(DEFAULT_MODEL)
+    failed = []
+    for input_path in videos:
+        if len(videos) > 1:
+            print(f"\n== {input_path.name} ==")
+        if not process_video(input_path, model):
+            failed.append(input_path)
+    if failed:
+        if len(videos) > 1:
+            print("Sin segmentos: " + ", ".join(path.name for path in failed), file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
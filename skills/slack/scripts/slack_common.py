@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
+import http.client
 import json
 import os
+import threading
 import urllib.parse
-import urllib.request
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
 DEFAULT_TIMEOUT_SECONDS = 20.0
+SLACK_HOST = "slack.com"
+
+# One keep-alive HTTPS connection per thread, reused across api_call()s.
+_LOCAL = threading.local()
 
 
 def get_token(env_key: str = "SLACK_USER_TOKEN") -> str:
@@ -18,15 +24,61 @@ def get_timeout() -> float:
     return DEFAULT_TIMEOUT_SECONDS
 
 
-def api_call(method: str, token: str, params=None, timeout: Optional[float] = None) -> dict:
-    url = f"https://slack.com/api/{method}"
+def _drop_connection() -> None:
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        conn.close()
+    _LOCAL.conn = None
+
+
+def _post(path: str, body: bytes, headers: dict, timeout: float, idempotent: bool) -> bytes:
+    while True:
+        conn = getattr(_LOCAL, "conn", None)
+        if conn is None:
+            conn = _LOCAL.conn = http.client.HTTPSConnection(SLACK_HOST, timeout=timeout)
+        conn.timeout = timeout
+        reused = conn.sock is not None
+        if reused:
+            conn.sock.settimeout(timeout)
+        sent = False
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (http.client.HTTPException, ConnectionError):
+            _drop_connection()
+            # The server may have closed the idle keep-alive connection: retry once on a
+            # fresh one. Once the request is out Slack may already have acted on it, so
+            # only idempotent calls are resent after that point.
+            if reused and (not sent or idempotent):
+                continue
+            raise
+        except Exception:
+            _drop_connection()
+            raise
+        if resp.will_close:
+            _drop_connection()
+        if resp.status >= 400:
+            raise http.client.HTTPException(f"HTTP Error {resp.status}: {resp.reason}")
+        return raw
+
+
+def api_call(
+    method: str, token: str, params=None, timeout: Optional[float] = None, idempotent: bool = True
+) -> dict:
+    """Call a Slack Web API method.
+
+    Pass idempotent=False for calls with side effects (e.g. chat.postMessage): those are never
+    resent once the request has gone out on a connection that then drops.
+    """
     data = urllib.parse.urlencode(params or {}).encode("utf-8")
-    req = urllib.request.Request(url, data=data)
-    req.add_header("Authorization", f"Bearer {token}")
-    req.add_header("Content-Type", "application/x-www-form-urlencoded")
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
     try:
-        with urllib.request.urlopen(req, timeout=timeout or get_timeout()) as resp:
-            raw = resp.read().decode("utf-8")
+        raw = _post(f"/api/{method}", data, headers, timeout or get_timeout(), idempotent).decode("utf-8")
     except Exception as exc:
         raise SystemExit(f"Slack API request failed: {exc}")
 
@@ -41,18 +93,21 @@ def api_call(method: str, token: str, params=None, timeout: Optional[float] = No
     return payload
 
 
-def paginate(method: str, token: str, params: dict, list_key: str) -> list:
-    items = []
+def iter_paginated(method: str, token: str, params: dict, list_key: str) -> Iterator[dict]:
+    """Yield items page by page, fetching the next cursor only when the caller needs it."""
     cursor = None
     while True:
         if cursor:
             params = {**params, "cursor": cursor}
         payload = api_call(method, token, params)
-        items.extend(payload.get(list_key, []))
+        yield from payload.get(list_key, [])
         cursor = payload.get("response_metadata", {}).get("next_cursor")
         if not cursor:
             break
-    return items
+
+
+def paginate(method: str, token: str, params: dict, list_key: str) -> list:
+    return list(iter_paginated(method, token, params, list_key))
 
 
 def user_display_name(user: dict) -> str:
@@ -67,6 +122,17 @@ def user_display_name(user: dict) -> str:
     )
 
 
+def prime_user_cache(token: str, cache: dict) -> None:
+    """Fill cache with every workspace member via paginated users.list (one call per 1000 users)."""
+    try:
+        for user in iter_paginated("users.list", token, {"limit": 1000}, "members"):
+            if user.get("id"):
+                cache[user["id"]] = user_display_name(user)
+    except SystemExit:
+        # Not fatal: resolve_user_name falls back to users.info per id.
+        pass
+
+
 def resolve_user_name(token: str, user_id: str, cache: dict) -> str:
     if not user_id:
         return ""
@@ -78,6 +144,25 @@ def resolve_user_name(token: str, user_id: str, cache: dict) -> str:
     return name
 
 
+def resolve_many(token: str, user_ids, cache: dict, concurrency: int = 16) -> None:
+    """Resolve uncached user ids with up to `concurrency` users.info calls in flight."""
+    missing = [user_id for user_id in dict.fromkeys(user_ids) if user_id and user_id not in cache]
+    if not missing:
+        return
+
+    def fetch(user_id: str):
+        try:
+            payload = api_call("users.info", token, {"user": user_id})
+        except SystemExit:
+            return user_id, None  # resolve_user_name will retry and report it
+        return user_id, user_display_name(payload.get("user", {}))
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(missing))) as executor:
+        for user_id, name in executor.map(fetch, missing):
+            if name is not None:
+                cache[user_id] = name
+
+
 def conversation_display_name(conv: dict, token: str, user_cache: dict) -> str:
     if conv.get("is_im"):
         user_id = conv.get("user")
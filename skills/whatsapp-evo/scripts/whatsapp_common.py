@@ -1,21 +1,53 @@
 #!/usr/bin/env python3
+import functools
+import http.client
 import json
 import os
+import random
+import tempfile
+import time
+import urllib.error
 import urllib.request
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
 STATE_PATH = os.path.expanduser("~/.cache/whatsapp-evo/inbox-state.json")
 DEFAULT_TIMEOUT_SECONDS = 20.0
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_JITTER = 0.5
+RETRY_MAX_DELAY = 30.0
 SKILLS_CONFIG_PATH = os.path.expanduser("~/.config/skills/config.json")
 
+# Message payload key -> field holding its text (None: the value is the text), in priority order.
+_TEXT_FIELDS = (
+    ("conversation", None),
+    ("extendedTextMessage", "text"),
+    ("imageMessage", "caption"),
+    ("videoMessage", "caption"),
+    ("documentMessage", "caption"),
+)
+
+
+def json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def get_env(key: str) -> str:
     return os.getenv(key, "").strip()
 
 
+@functools.lru_cache(maxsize=1)
 def load_skills_config() -> dict:
+    """Read the shared skills config once per process; call load_skills_config.cache_clear() to reload."""
     try:
-        with open(SKILLS_CONFIG_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(SKILLS_CONFIG_PATH, "rb") as f:
+            data = json_loads(f.read())
             return data if isinstance(data, dict) else {}
     except FileNotFoundError:
         return {}
@@ -35,8 +67,9 @@ def get_state_path(env_key: str = "WHATSAPP_EVO_STATE_PATH") -> str:
 
 def load_state(path: str) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # One bulk binary read: both decoders take UTF-8 bytes directly.
+        with open(path, "rb", buffering=65536) as f:
+            data = json_loads(f.read())
             return data if isinstance(data, dict) else {}
     except FileNotFoundError:
         return {}
@@ -44,10 +77,27 @@ def load_state(path: str) -> dict:
         return {}
 
 
+def json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def save_state(path: str, data: dict) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Write a sibling temp file and rename it so readers never see a half-written state.
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".state.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=65536) as f:
+            f.write(json_dumps(data))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 
 def get_token(env_key: str = "EVOLUTION_API_TOKEN") -> str:
@@ -81,7 +131,24 @@ def get_timeout(env_key: str = "WHATSAPP_EVO_TIMEOUT", fallback_key: str = "EVOL
         return DEFAULT_TIMEOUT_SECONDS
 
 
-def api_call(method: str, base_url: str, path: str, token: str, payload=None) -> dict:
+def _is_retryable(exc: Exception, idempotent: bool) -> bool:
+    if isinstance(exc, urllib.error.URLError) and not isinstance(exc, urllib.error.HTTPError):
+        exc = exc.reason  # urlopen wraps connection errors
+    if isinstance(exc, ConnectionRefusedError):
+        return True  # nothing reached the server
+    if not idempotent:
+        return False
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500
+    return isinstance(exc, (TimeoutError, ConnectionError, http.client.HTTPException))
+
+
+def api_call(method: str, base_url: str, path: str, token: str, payload=None, idempotent: bool = True) -> dict:
+    """Call the Evolution API, retrying transient failures with jittered exponential backoff.
+
+    Pass idempotent=False for calls with side effects (e.g. sending a message): those are only
+    retried when the connection was refused, never after a timeout or a 5xx.
+    """
     url = f"{base_url}{path}"
     data = None
     headers = {
@@ -96,11 +163,16 @@ def api_call(method: str, base_url: str, path: str, token: str, payload=None) ->
     for key, value in headers.items():
         req.add_header(key, value)
 
-    try:
-        with urllib.request.urlopen(req, timeout=get_timeout()) as resp:
-            raw = resp.read().decode("utf-8")
-    except Exception as exc:
-        raise SystemExit(f"Evolution API request failed: {exc}")
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            with urllib.request.urlopen(req, timeout=get_timeout()) as resp:
+                raw = resp.read().decode("utf-8")
+            break
+        except Exception as exc:
+            if attempt == RETRY_ATTEMPTS - 1 or not _is_retryable(exc, idempotent):
+                raise SystemExit(f"Evolution API request failed: {exc}")
+            delay = RETRY_BASE_DELAY * (2**attempt) * (1 + random.uniform(0, RETRY_JITTER))
+            time.sleep(min(RETRY_MAX_DELAY, delay))
 
     if not raw:
         return {}
@@ -114,18 +186,12 @@ def api_call(method: str, base_url: str, path: str, token: str, payload=None) ->
 def extract_text_from_message(message: dict) -> str:
     if not isinstance(message, dict):
         return ""
-    if "conversation" in message:
-        return str(message.get("conversation", ""))
-    if "extendedTextMessage" in message:
-        return str(message.get("extendedTextMessage", {}).get("text", ""))
-    if "imageMessage" in message:
-        return str(message.get("imageMessage", {}).get("caption", ""))
-    if "videoMessage" in message:
-        return str(message.get("videoMessage", {}).get("caption", ""))
-    if "documentMessage" in message:
-        return str(message.get("documentMessage", {}).get("caption", ""))
+    for key, field in _TEXT_FIELDS:
+        if key in message:
+            value = message[key]
+            return str(value if field is None else value.get(field, ""))
     if "message" in message:
-        return extract_text_from_message(message.get("message", {}))
+        return extract_text_from_message(message["message"])
     return ""
 
 
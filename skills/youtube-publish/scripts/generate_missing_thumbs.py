@@ -2,25 +2,54 @@
 import argparse
 import json
 import os
+import random
 import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
+RETRY_BASE_DELAY = 2.0
+RETRY_JITTER = 0.5
+RETRY_MAX_DELAY = 30.0
+_WS_RE = re.compile(r"\s+")
+BANNED_THUMB_WORDS = frozenset({"facil", "fácil", "rapido", "rápido", "secreto"})
+_PROMPT_TMPL = (
+    "Create a YouTube thumbnail (16:9). "
+    "Use the provided photo as Antonio's portrait (keep identity, face sharp, no distortions). "
+    "Background: dark mode gradient cyan/purple, cinematic lighting, minimalist. "
+    "Include a technical artifact: {artifact}. "
+    "Concept: {concept}. "
+    'Add large bold text (<=4 words): "{text}". '
+    "High contrast, clean typography, no extra text, no watermark."
+)
+
 
 def get_assets_dir() -> Path:
     return Path(__file__).resolve().parent.parent / "assets"
 
 
+def json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def word_count(text: str) -> int:
-    return len([w for w in re.split(r"\s+", text.strip()) if w])
+    return sum(1 for w in _WS_RE.split(text.strip()) if w)
 
 
 def normalize_thumb_text(text: str) -> str:
     cleaned = (text or "").strip()
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    banned = {"facil", "fácil", "rapido", "rápido", "secreto"}
-    words = [w for w in cleaned.split(" ") if w.lower() not in banned]
+    cleaned = _WS_RE.sub(" ", cleaned)
+    words = [w for w in cleaned.split(" ") if w.lower() not in BANNED_THUMB_WORDS]
     return " ".join(words[:4]).strip()
 
 
@@ -32,49 +61,131 @@ def build_image_prompt(thumb: dict) -> str:
     artifact = str(thumb.get("artifact", "") or "")
     concept = str(thumb.get("concept", "") or "")
 
-    return (
-        "Create a YouTube thumbnail (16:9). "
-        "Use the provided photo as Antonio's portrait (keep identity, face sharp, no distortions). "
-        "Background: dark mode gradient cyan/purple, cinematic lighting, minimalist. "
-        f"Include a technical artifact: {artifact}. "
-        f"Concept: {concept}. "
-        f'Add large bold text (<=4 words): \"{thumb_text}\". '
-        "High contrast, clean typography, no extra text, no watermark."
-    )
+    return _PROMPT_TMPL.format(artifact=artifact, concept=concept, text=thumb_text)
+
 
+class ImageWorker:
+    """A generate_image.py --server process, reused across requests.
 
-def run_generate_image(
-    image_script: Path,
+    Keeps interpreter startup and the Gemini client out of the per-image cost.
+    Not thread-safe: use one worker per thread.
+    """
+
+    def __init__(self, image_script: Path) -> None:
+        self.image_script = image_script
+        self.proc: subprocess.Popen | None = None
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = subprocess.Popen(
+                [sys.executable, str(self.image_script), "--server"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        return self.proc
+
+    def generate(
+        self,
+        prompt: str,
+        output_path: Path,
+        input_image: Path,
+        timeout_s: int,
+    ) -> None:
+        proc = self._ensure_started()
+        request = {
+            "prompt": prompt,
+            "filename": str(output_path),
+            "input_image": str(input_image),
+        }
+        # Killing the worker unblocks readline(); the next call starts a new one.
+        timer = threading.Timer(timeout_s, proc.kill)
+        timer.start()
+        try:
+            proc.stdin.write(json.dumps(request) + "\n")
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+        except OSError:
+            line = ""
+        finally:
+            timer.cancel()
+
+        if not line:
+            proc.kill()
+            proc.wait()
+            self.proc = None
+            raise RuntimeError(
+                f"Image worker exited (code {proc.returncode}) or timed out after {timeout_s}s"
+            )
+
+        reply = json_loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error") or "Image generation failed")
+        if not output_path.exists():
+            raise RuntimeError("Image generation succeeded but output file was not created")
+
+    def close(self) -> None:
+        if self.proc is None:
+            return
+        if self.proc.stdin:
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+
+class WorkerPool:
+    """Hands each thread its own ImageWorker and closes them all at the end."""
+
+    def __init__(self, image_script: Path) -> None:
+        self.image_script = image_script
+        self._local = threading.local()
+        self._workers: list[ImageWorker] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> ImageWorker:
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = ImageWorker(self.image_script)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+
+
+def generate_with_retries(
+    workers: WorkerPool,
     prompt: str,
     output_path: Path,
     input_image: Path,
     timeout_s: int,
-) -> None:
-    cmd = [
-        sys.executable,
-        str(image_script),
-        "--prompt",
-        prompt,
-        "--filename",
-        str(output_path),
-        "--input-image",
-        str(input_image),
-    ]
-
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=timeout_s,
-    )
-
-    if result.returncode != 0:
-        stderr = (result.stderr or "").strip()
-        stdout = (result.stdout or "").strip()
-        raise RuntimeError(stderr or stdout or f"Command failed: {' '.join(cmd)}")
-
-    if not output_path.exists():
-        raise RuntimeError("Image generation succeeded but output file was not created")
+    retries: int,
+) -> Exception | None:
+    """Return None on success, or the last error once retries are exhausted."""
+    worker = workers.get()
+    for attempt in range(retries + 1):
+        try:
+            worker.generate(
+                prompt=prompt,
+                output_path=output_path,
+                input_image=input_image,
+                timeout_s=timeout_s,
+            )
+            return None
+        except Exception as exc:
+            if attempt == retries:
+                return exc
+            # Back off so retries don't hammer the image API in lockstep.
+            delay = RETRY_BASE_DELAY * (2**attempt) * (1 + random.uniform(0, RETRY_JITTER))
+            time.sleep(min(RETRY_MAX_DELAY, delay))
+    return None
 
 
 def main() -> int:
@@ -98,6 +209,12 @@ def main() -> int:
         default=1,
         help="Retries per image on failure (default: 1)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Images generated in parallel (default: 4)",
+    )
     parser.add_argument(
         "--force",
         action="store_true",
@@ -111,6 +228,9 @@ def main() -> int:
     if args.retries < 0:
         print("--retries must be >= 0", file=sys.stderr)
         return 2
+    if args.concurrency <= 0:
+        print("--concurrency must be > 0", file=sys.stderr)
+        return 2
 
     out_dir = Path(os.path.expanduser(args.out_dir))
     if not out_dir.exists():
@@ -123,6 +243,7 @@ def main() -> int:
         "assets/antonio-2.png": assets_dir / "antonio-2.png",
         "assets/antonio-3.png": assets_dir / "antonio-3.png",
     }
+    photo_by_basename = {Path(k).name: p for k, p in photo_map.items()}
 
     image_script = (
         Path(__file__).resolve().parents[2]
@@ -137,14 +258,22 @@ def main() -> int:
     ok = 0
     failed = 0
     skipped = 0
+    pending: list[tuple[Path, int, Path, str, Path]] = []
 
-    for video_dir in sorted([p for p in out_dir.iterdir() if p.is_dir()]):
-        ideas_path = video_dir / "ideas.json"
-        if not ideas_path.exists():
+    # DirEntry.is_dir() uses the type from the directory listing, no stat per entry.
+    with os.scandir(out_dir) as it:
+        video_names = sorted(entry.name for entry in it if entry.is_dir())
+
+    for video_name in video_names:
+        video_dir = out_dir / video_name
+        with os.scandir(video_dir) as it:
+            existing = {entry.name for entry in it if entry.is_file()}
+        if "ideas.json" not in existing:
             continue
+        ideas_path = video_dir / "ideas.json"
 
         try:
-            payload = json.loads(ideas_path.read_text(encoding="utf-8"))
+            payload = json_loads(ideas_path.read_bytes())
         except Exception as exc:
             (video_dir / "error.thumbs.txt").write_text(
                 f"Failed to read ideas.json: {exc}\n",
@@ -166,19 +295,16 @@ def main() -> int:
             if not isinstance(thumb, dict):
                 continue
 
-            out_img = video_dir / f"thumb-{idx}.png"
-            if out_img.exists() and not args.force:
+            out_name = f"thumb-{idx}.png"
+            out_img = video_dir / out_name
+            if out_name in existing and not args.force:
                 skipped += 1
                 continue
 
             photo_key = str(thumb.get("photo", "") or "")
             input_photo = photo_map.get(photo_key)
             if input_photo is None:
-                basename = Path(photo_key).name
-                input_photo = next(
-                    (p for k, p in photo_map.items() if Path(k).name == basename),
-                    None,
-                )
+                input_photo = photo_by_basename.get(Path(photo_key).name)
 
             if input_photo is None or not input_photo.exists():
                 (video_dir / "error.thumbs.txt").write_text(
@@ -194,27 +320,35 @@ def main() -> int:
                 encoding="utf-8",
             )
 
-            attempt = 0
-            while True:
-                try:
-                    run_generate_image(
-                        image_script=image_script,
-                        prompt=prompt,
-                        output_path=out_img,
-                        input_image=input_photo,
-                        timeout_s=args.timeout_s,
-                    )
-                    ok += 1
-                    break
-                except Exception as exc:
-                    attempt += 1
-                    if attempt > args.retries:
-                        (video_dir / "error.thumbs.txt").write_text(
-                            f"Failed to generate thumb-{idx}: {exc}\n",
-                            encoding="utf-8",
-                        )
-                        failed += 1
-                        break
+            pending.append((video_dir, idx, out_img, prompt, input_photo))
+
+    # Each generation blocks on the image API in a child process, so overlap them.
+    workers = WorkerPool(image_script)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(
+                generate_with_retries,
+                workers,
+                prompt,
+                out_img,
+                input_photo,
+                args.timeout_s,
+                args.retries,
+            ): (video_dir, idx)
+            for video_dir, idx, out_img, prompt, input_photo in pending
+        }
+        for future in as_completed(futures):
+            video_dir, idx = futures[future]
+            exc = future.result()
+            if exc is None:
+                ok += 1
+                continue
+            (video_dir / "error.thumbs.txt").write_text(
+                f"Failed to generate thumb-{idx}: {exc}\n",
+                encoding="utf-8",
+            )
+            failed += 1
+    workers.close()
 
     print(f"Generated: {ok} | Skipped: {skipped} | Failed: {failed} | Out: {out_dir}")
     return 0 if failed == 0 else 1
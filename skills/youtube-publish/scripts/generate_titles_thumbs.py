@@ -1,100 +1,159 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
+import base64
+import hashlib
 import json
 import os
 import re
+import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
 
+import pydantic
 from google import genai
 from google.genai import types as genai_types
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from PIL import Image as PILImage
 
-SCOPES = [
-    "https://www.googleapis.com/auth/youtube.upload",
-    "https://www.googleapis.com/auth/youtube",
-    "https://www.googleapis.com/auth/youtube.force-ssl",
-]
+from youtube_common import (
+    DEFAULT_CLIENT_SECRET_PATH,
+    DEFAULT_TOKEN_PATH,
+    authorized_http,
+    format_duration,
+    get_authenticated_service,
+    load_credentials,
+    parse_duration,
+    safe_slug,
+)
 
-DEFAULT_CLIENT_SECRET_PATH = os.path.expanduser("~/.config/youtube-publish/client_secret.json")
-DEFAULT_TOKEN_PATH = os.path.expanduser("~/.config/youtube-publish/token.json")
 DEFAULT_OUTPUT_DIR = os.path.expanduser("~/Downloads/youtube-videos")
+DEFAULT_IDEAS_CACHE_DIR = os.path.expanduser("~/.cache/youtube-publish/ideas")
+UPLOADS_CACHE_PATH = os.path.expanduser("~/.cache/youtube-publish/uploads_playlists.json")
+PLAYLIST_PAGE_SIZE = 50  # YouTube's maxResults cap
+THUMBS_PER_VIDEO = 3
+STATE_DB_NAME = ".state.sqlite"
+# Pillow's default. Lower is faster but YouTube rejects thumbnails over 2 MB.
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 DEFAULT_TEXT_MODEL = "models/gemini-2.0-flash"
 DEFAULT_IMAGE_MODEL = "models/gemini-3-pro-image-preview"
 
+_WS_RE = re.compile(r"\s+")
+BANNED_THUMB_WORDS = frozenset({"facil", "fácil", "rapido", "rápido", "secreto"})
+
+# Idea requests currently running, keyed by model and prompt.
+_INFLIGHT_IDEAS: dict[str, asyncio.Future] = {}
+
+BATCH_DONE_STATES = {
+    genai_types.JobState.JOB_STATE_SUCCEEDED,
+    genai_types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+    genai_types.JobState.JOB_STATE_FAILED,
+    genai_types.JobState.JOB_STATE_CANCELLED,
+    genai_types.JobState.JOB_STATE_EXPIRED,
+}
+
 PROMPT_TEMPLATE = """Eres un experto en títulos y thumbnails para YouTube (audiencia técnica).\n\nReglas obligatorias:\n- Evita clickbait: no uses 'Fácil', 'Rápido', 'Secreto'.\n- Enfócate en ingeniería, arquitectura y resolver fricción de desarrolladores.\n- Usa español.\n- Genera exactamente 3 títulos.\n- Genera exactamente 3 ideas de thumbnails.\n\nReglas de thumbnails:\n- Estilo: dark mode, minimalista, luz cinematográfica (cyan/purple).\n- Debe aparecer un artefacto técnico (logo, snippet de código o nodos).\n- Usa el contexto de foto de Antonio: assets/antonio-1.png, assets/antonio-2.png, assets/antonio-3.png.\n- Cada thumbnail debe usar una foto distinta.\n- Texto en thumbnail: <= 4 palabras.\n\nDevuelve SOLO JSON con esta forma exacta:\n{{\n  \"titles\": [\"...\", \"...\", \"...\"],\n  \"thumbnails\": [\n    {{\"photo\": \"assets/antonio-1.png\", \"text\": \"...\", \"artifact\": \"...\", \"concept\": \"...\"}},\n    {{\"photo\": \"assets/antonio-2.png\", \"text\": \"...\", \"artifact\": \"...\", \"concept\": \"...\"}},\n    {{\"photo\": \"assets/antonio-3.png\", \"text\": \"...\", \"artifact\": \"...\", \"concept\": \"...\"}}\n  ]\n}}\n\nEntrada:\nTITULO ACTUAL: {title}\nDESCRIPCION:\n{description}\n"""
 
 
-def get_authenticated_service(client_secret_path: str, token_path: str):
-    creds = None
-    token_file = Path(token_path)
-    if token_file.exists():
-        creds = Credentials.from_authorized_user_file(str(token_file), SCOPES)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
-            auth_url, _ = flow.authorization_url(
-                access_type="offline",
-                prompt="consent",
-            )
-            print("Open this URL in your browser, approve access, then paste the final URL:")
-            print(auth_url)
-            redirect_response = input("Paste full redirect URL: ").strip()
-            flow.fetch_token(authorization_response=redirect_response)
-            creds = flow.credentials
-        token_file.parent.mkdir(parents=True, exist_ok=True)
-        token_file.write_text(creds.to_json(), encoding="utf-8")
+def resolve_uploads_id(youtube, creds: Credentials, token_path: str) -> str:
+    """Return the uploads playlist id of the authenticated channel.
 
-    return build("youtube", "v3", credentials=creds)
+    The id never changes for a channel, so it is cached per token file and the
+    channels().list round-trip only happens on the first run. Entries are tied to
+    the token's refresh token: re-authorising token.json (possibly for another
+    channel) issues a new one and invalidates the entry, while routine access
+    token refreshes keep it.
+    """
+    cache_file = Path(UPLOADS_CACHE_PATH)
+    key = str(Path(os.path.expanduser(token_path)).resolve())
+    grant = hashlib.sha256((creds.refresh_token or "").encode("utf-8")).hexdigest()
+    try:
+        cache = json.loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        cache = {}
+    if not isinstance(cache, dict):
+        cache = {}
+    entry = cache.get(key)
+    if (
+        creds.refresh_token
+        and isinstance(entry, dict)
+        and entry.get("grant") == grant
+        and isinstance(entry.get("uploads_id"), str)
+        and entry["uploads_id"]
+    ):
+        return entry["uploads_id"]
 
+    channel_resp = youtube.channels().list(part="contentDetails", mine=True).execute()
+    channel_items = channel_resp.get("items", [])
+    if not channel_items:
+        raise RuntimeError("No channel found for the authenticated user.")
 
-def parse_duration(value: str) -> int | None:
-    if not value:
-        return None
-    if not value.startswith("P"):
-        return None
-    hours = minutes = seconds = 0
-    time_part = value.split("T")[-1] if "T" in value else ""
-    number = ""
-    for ch in time_part:
-        if ch.isdigit():
-            number += ch
-            continue
-        if ch == "H":
-            hours = int(number or 0)
-        elif ch == "M":
-            minutes = int(number or 0)
-        elif ch == "S":
-            seconds = int(number or 0)
-        else:
-            return None
-        number = ""
-    return hours * 3600 + minutes * 60 + seconds
-
-
-def format_duration(value: int | None) -> str:
-    if value is None:
-        return "n/a"
-    minutes, seconds = divmod(value, 60)
-    hours, minutes = divmod(minutes, 60)
-    if hours:
-        return f"{hours:d}:{minutes:02d}:{seconds:02d}"
-    return f"{minutes:d}:{seconds:02d}"
-
-
-def safe_slug(text: str) -> str:
-    text = re.sub(r"[^a-zA-Z0-9\-\s]", "", text).strip().lower()
-    text = re.sub(r"\s+", "-", text)
-    return text or "video"
+    uploads_id = (
+        channel_items[0]
+        .get("contentDetails", {})
+        .get("relatedPlaylists", {})
+        .get("uploads")
+    )
+    if not uploads_id:
+        raise RuntimeError("Could not resolve uploads playlist id.")
+
+    if not creds.refresh_token:
+        return uploads_id
+    cache[key] = {"grant": grant, "uploads_id": uploads_id}
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    write_text(cache_file, json.dumps(cache, indent=2))
+    return uploads_id
+
+
+def fetch_uploads(youtube, creds: Credentials, uploads_id: str, limit: int) -> tuple[list[dict], dict[str, dict]]:
+    """Page through the uploads playlist; video details for each page load in the background.
+
+    httplib2 connections are not thread-safe, so background requests get their own.
+    """
+    playlist_items: list[dict] = []
+    details_futures = []
+    page_token = None
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        while len(playlist_items) < limit:
+            page = youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=uploads_id,
+                maxResults=min(PLAYLIST_PAGE_SIZE, limit - len(playlist_items)),
+                pageToken=page_token,
+            ).execute()
+            items = page.get("items", [])
+            playlist_items.extend(items)
+
+            page_ids = [
+                item.get("contentDetails", {}).get("videoId")
+                for item in items
+                if item.get("contentDetails", {}).get("videoId")
+            ]
+            if page_ids:
+                request = youtube.videos().list(
+                    part="snippet,contentDetails,status",
+                    id=",".join(page_ids),
+                )
+                details_futures.append(
+                    executor.submit(request.execute, http=authorized_http(creds))
+                )
+
+            page_token = page.get("nextPageToken")
+            if not page_token or not items:
+                break
+
+        details_by_id: dict[str, dict] = {}
+        for future in details_futures:
+            for item in future.result().get("items", []):
+                if "id" in item:
+                    details_by_id[item["id"]] = item
+
+    return playlist_items, details_by_id
 
 
 def get_api_key() -> str | None:
@@ -118,32 +177,36 @@ def parse_titles_and_thumbs_payload(payload: dict) -> tuple[list[str], list[dict
 
 
 def word_count(text: str) -> int:
-    return len([w for w in re.split(r"\s+", text.strip()) if w])
+    return sum(1 for w in _WS_RE.split(text.strip()) if w)
 
 
 def normalize_thumb_text(text: str) -> str:
     # Keep it short and avoid obvious clickbait terms.
-    cleaned = (text or "").strip()
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    banned = {"facil", "fácil", "rapido", "rápido", "secreto"}
-    words = [w for w in cleaned.split(" ") if w.lower() not in banned]
-    return " ".join(words[:4]).strip()
+    words = [w for w in (text or "").split() if w.lower() not in BANNED_THUMB_WORDS]
+    return " ".join(words[:4])
 
 
-def generate_ideas(
-    client: genai.Client,
-    model: str,
-    title: str,
-    description: str,
-) -> dict:
-    prompt = PROMPT_TEMPLATE.format(title=title, description=description)
-    resp = client.models.generate_content(
-        model=model,
-        contents=prompt,
-        config=genai_types.GenerateContentConfig(
-            response_mime_type="application/json",
-        ),
-    )
+class ThumbnailIdea(pydantic.BaseModel):
+    photo: str
+    text: str
+    artifact: str
+    concept: str
+
+
+class VideoIdeas(pydantic.BaseModel):
+    titles: list[str]
+    thumbnails: list[ThumbnailIdea]
+
+
+def ideas_prompt(title: str, description: str) -> str:
+    return PROMPT_TEMPLATE.format(title=title, description=description)
+
+
+def parse_ideas_response(resp) -> dict:
+    # With response_schema the SDK has already validated and parsed the JSON.
+    parsed = getattr(resp, "parsed", None)
+    if isinstance(parsed, pydantic.BaseModel):
+        return parsed.model_dump()
 
     text = None
     parts = getattr(resp, "parts", None)
@@ -174,20 +237,190 @@ def generate_ideas(
     return payload
 
 
-def generate_thumbnail_image(
+def ideas_cache_path(cache_dir: Path, model: str, prompt: str) -> Path:
+    key = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.json"
+
+
+def read_cached_ideas(path: Path) -> dict | None:
+    try:
+        payload = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def write_cached_ideas(path: Path, payload: dict) -> None:
+    # Only cache payloads we can use; a bad answer should be retried next run.
+    try:
+        parse_titles_and_thumbs_payload(payload)
+    except ValueError:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(path, json.dumps(payload, ensure_ascii=False))
+
+
+async def request_ideas(
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    cache_path: Path | None,
+) -> dict:
+    resp = await client.aio.models.generate_content(
+        model=model,
+        contents=prompt,
+        config=genai_types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=VideoIdeas,
+        ),
+    )
+    payload = parse_ideas_response(resp)
+    if cache_path and isinstance(payload, dict):
+        write_cached_ideas(cache_path, payload)
+    return payload
+
+
+async def generate_ideas(
+    client: genai.Client,
+    model: str,
+    title: str,
+    description: str,
+    cache_dir: Path | None = None,
+) -> dict:
+    prompt = ideas_prompt(title, description)
+    cache_path = ideas_cache_path(cache_dir, model, prompt) if cache_dir else None
+    if cache_path:
+        cached = read_cached_ideas(cache_path)
+        if cached is not None:
+            return cached
+
+    # Videos with the same title and description (e.g. re-uploads) share one request.
+    key = f"{model}\0{prompt}"
+    task = _INFLIGHT_IDEAS.get(key)
+    if task is None:
+        task = asyncio.ensure_future(request_ideas(client, model, prompt, cache_path))
+        _INFLIGHT_IDEAS[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT_IDEAS.pop(key, None))
+    return await task
+
+
+async def generate_ideas_batch(
     client: genai.Client,
     model: str,
-    input_photo_path: Path,
+    prompts: dict[str, str],
+    poll_s: float,
+    timeout_s: float,
+) -> dict[str, dict]:
+    """Run all idea prompts as one Gemini Batch job, keyed by video id.
+
+    Batch requests are billed at half price but may take minutes to finish.
+    Failed requests are left out of the result; a job still running after
+    timeout_s seconds is cancelled and raises.
+    """
+    video_ids = list(prompts)
+    job = await client.aio.batches.create(
+        model=model,
+        src=[
+            {
+                "contents": [{"role": "user", "parts": [{"text": prompts[video_id]}]}],
+                "config": {"response_mime_type": "application/json", "response_schema": VideoIdeas},
+                "metadata": {"video_id": video_id},
+            }
+            for video_id in video_ids
+        ],
+        config={"display_name": "youtube-publish-ideas"},
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    while job.state not in BATCH_DONE_STATES:
+        if loop.time() >= deadline:
+            try:
+                await client.aio.batches.cancel(name=job.name)
+            except Exception:
+                pass
+            raise RuntimeError(f"Batch job {job.name} still {job.state} after {timeout_s:g}s")
+        await asyncio.sleep(poll_s)
+        job = await client.aio.batches.get(name=job.name)
+
+    # Partial success still carries inlined responses; failed requests have an error set.
+    if job.state not in (
+        genai_types.JobState.JOB_STATE_SUCCEEDED,
+        genai_types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+    ):
+        raise RuntimeError(f"Batch job {job.name} ended in state {job.state}")
+
+    responses = (job.dest.inlined_responses if job.dest else None) or []
+    results: dict[str, dict] = {}
+    for position, inlined in enumerate(responses):
+        metadata = inlined.metadata or {}
+        video_id = metadata.get("video_id") or (
+            video_ids[position] if position < len(video_ids) else None
+        )
+        if video_id is None:
+            continue
+        if inlined.error is not None or inlined.response is None:
+            continue
+        try:
+            results[video_id] = parse_ideas_response(inlined.response)
+        except Exception:
+            # Left out so the video falls back to a regular request.
+            continue
+    return results
+
+
+def is_rgb8_png(data: bytes) -> bool:
+    """True for a PNG whose IHDR declares 8-bit truecolor without alpha."""
+    # Signature (8) + chunk length (4) + b"IHDR" (4) + width/height (8) + depth + color type.
+    return (
+        len(data) >= 26
+        and data[:8] == PNG_SIGNATURE
+        and data[12:16] == b"IHDR"
+        and data[24] == 8
+        and data[25] == 2
+    )
+
+
+def save_thumbnail_png(
+    image_data: bytes | str,
+    output_path: Path,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+) -> None:
+    # inline_data.data is normally bytes; some responses carry base64 text.
+    image_data = base64.b64decode(image_data) if isinstance(image_data, str) else image_data
+    # --only-missing-images trusts existing files, so never leave a truncated PNG behind.
+    tmp = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    if is_rgb8_png(image_data):
+        # Already what we would write: skip the decode/re-encode round trip.
+        tmp.write_bytes(image_data)
+        os.replace(tmp, output_path)
+        return
+
+    image = PILImage.open(BytesIO(image_data))
+    if image.mode == "RGBA":
+        rgb_image = PILImage.new("RGB", image.size, (255, 255, 255))
+        # getchannel() extracts only alpha; split() would allocate all four bands.
+        rgb_image.paste(image, mask=image.getchannel("A"))
+        image = rgb_image
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(str(tmp), "PNG", compress_level=compress_level)
+    os.replace(tmp, output_path)
+
+
+async def generate_thumbnail_image(
+    client: genai.Client,
+    model: str,
+    photo: PILImage.Image,
     prompt: str,
     output_path: Path,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
 ) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    photo = PILImage.open(str(input_photo_path))
 
     last_error: Exception | None = None
     for attempt in range(2):
         try:
-            resp = client.models.generate_content(
+            resp = await client.aio.models.generate_content(
                 model=model,
                 contents=[photo, prompt],
                 config=genai_types.GenerateContentConfig(
@@ -210,22 +443,8 @@ def generate_thumbnail_image(
                 inline = getattr(part, "inline_data", None)
                 if inline is None or getattr(inline, "data", None) is None:
                     continue
-                image_data = inline.data
-                if isinstance(image_data, str):
-                    import base64
-
-                    image_data = base64.b64decode(image_data)
-                from io import BytesIO
-
-                image = PILImage.open(BytesIO(image_data))
-                if image.mode == "RGBA":
-                    rgb_image = PILImage.new("RGB", image.size, (255, 255, 255))
-                    rgb_image.paste(image, mask=image.split()[3])
-                    rgb_image.save(str(output_path), "PNG")
-                elif image.mode == "RGB":
-                    image.save(str(output_path), "PNG")
-                else:
-                    image.convert("RGB").save(str(output_path), "PNG")
+                # Decoding and PNG encoding are CPU-bound; keep them off the event loop.
+                await asyncio.to_thread(save_thumbnail_png, inline.data, output_path, compress_level)
                 return
 
             raise RuntimeError("No image was generated in the response")
@@ -237,8 +456,392 @@ def generate_thumbnail_image(
     raise RuntimeError(f"Thumbnail generation failed after retries: {last_error}")
 
 
+def ideas_cache_dir(args: argparse.Namespace) -> Path | None:
+    if args.no_cache:
+        return None
+    return Path(os.path.expanduser(args.cache_dir))
+
+
+def write_text_if_changed(path: Path, content: str) -> None:
+    # Re-runs mostly produce identical metadata; reading is cheaper than rewriting.
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return
+    except (OSError, UnicodeDecodeError):
+        pass
+    write_text(path, content)
+
+
 def write_text(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
+    # Write a sibling temp file and rename it, so a crash never leaves a half-written file.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def open_state(out_dir: Path) -> sqlite3.Connection:
+    """Open the checkpoint of finished videos kept in out_dir."""
+    conn = sqlite3.connect(str(out_dir / STATE_DB_NAME))
+    # WAL + NORMAL: each finished video is a cheap append, still safe across crashes.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS done(video_id TEXT PRIMARY KEY, completed_at TEXT)")
+    return conn
+
+
+def load_done(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT video_id FROM done")}
+
+
+def mark_done(conn: sqlite3.Connection, video_id: str) -> None:
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO done(video_id, completed_at) VALUES (?, ?)",
+            (video_id, datetime.now().isoformat(timespec="seconds")),
+        )
+
+
+def existing_video_folders(out_dir: Path, video_ids: set[str]) -> dict[str, str]:
+    """Map video ids to the folders already in out_dir, named <...>_<video_id>."""
+    found: dict[str, str] = {}
+    with os.scandir(out_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            name = entry.name
+            # Ids may contain "_", so try every split point, longest suffix first.
+            pos = name.find("_")
+            while pos != -1:
+                if name[pos + 1 :] in video_ids:
+                    found[name[pos + 1 :]] = name
+                    break
+                pos = name.find("_", pos + 1)
+    return found
+
+
+def video_entry(item: dict, details_by_id: dict[str, dict]) -> dict | None:
+    """Collect what we need from the playlist item and video details."""
+    video_id = item.get("contentDetails", {}).get("videoId")
+    if not video_id:
+        return None
+    details = details_by_id.get(video_id, {})
+    snippet = details.get("snippet", {})
+    content_details = details.get("contentDetails", {})
+
+    duration_raw = content_details.get("duration")
+    duration_seconds = parse_duration(duration_raw) if duration_raw else None
+
+    title = snippet.get("title") or item.get("snippet", {}).get("title") or ""
+    description = snippet.get("description") or ""
+    published_at = snippet.get("publishedAt") or item.get("snippet", {}).get("publishedAt") or ""
+
+    date_prefix = ""
+    if published_at:
+        try:
+            dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+            date_prefix = dt.strftime("%Y%m%d")
+        except ValueError:
+            date_prefix = ""
+
+    slug = safe_slug(title)[:60]
+    folder_name = f"{date_prefix}_{slug}_{video_id}" if date_prefix else f"{slug}_{video_id}"
+    return {
+        "video_id": video_id,
+        "title": title,
+        "description": description,
+        "published_at": published_at,
+        "duration_seconds": duration_seconds,
+        "folder_name": folder_name,
+    }
+
+
+def write_video_metadata(out_dir: Path, video: dict) -> Path:
+    """Bring title.txt, description.txt and meta.json in line with YouTube; return the folder."""
+    video_id = video["video_id"]
+    video_dir = out_dir / video["folder_name"]
+    video_dir.mkdir(parents=True, exist_ok=True)
+
+    write_text_if_changed(video_dir / "title.txt", video["title"])
+    write_text_if_changed(video_dir / "description.txt", video["description"])
+
+    meta = {
+        "video_id": video_id,
+        "title": video["title"],
+        "published_at": video["published_at"],
+        "duration": format_duration(video["duration_seconds"]),
+        "duration_seconds": video["duration_seconds"],
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+    }
+    write_text_if_changed(video_dir / "meta.json", json.dumps(meta, indent=2, ensure_ascii=False))
+    return video_dir
+
+
+async def process_video(
+    args: argparse.Namespace,
+    ai_client: genai.Client,
+    out_dir: Path,
+    photo_images: dict[str, PILImage.Image],
+    sem: asyncio.Semaphore,
+    video: dict,
+    batch_ideas: dict[str, dict],
+    state: sqlite3.Connection,
+) -> None:
+    async with sem:
+        done = await generate_for_video(args, ai_client, out_dir, photo_images, video, batch_ideas)
+    if done:
+        mark_done(state, video["video_id"])
+
+
+async def generate_for_video(
+    args: argparse.Namespace,
+    ai_client: genai.Client,
+    out_dir: Path,
+    photo_images: dict[str, PILImage.Image],
+    video: dict,
+    batch_ideas: dict[str, dict],
+) -> bool:
+    """Write everything for one video; True once its ideas and thumbnails are all on disk."""
+    video_id = video["video_id"]
+    title = video["title"]
+    description = video["description"]
+
+    video_dir = write_video_metadata(out_dir, video)
+
+    if args.resume and args.only_missing_images:
+        with os.scandir(video_dir) as it:
+            existing = {entry.name for entry in it}
+        if "ideas.json" in existing and all(
+            f"thumb-{idx}.png" in existing for idx in range(1, THUMBS_PER_VIDEO + 1)
+        ):
+            # Nothing left to generate for this video.
+            return True
+
+    ideas_path = video_dir / "ideas.json"
+    payload = None
+
+    if args.resume and ideas_path.exists():
+        try:
+            payload = json.loads(ideas_path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            write_text(video_dir / "error.txt", f"Failed to read ideas.json: {exc}\n")
+            payload = None
+
+    if payload is None and not args.skip_text:
+        try:
+            payload = batch_ideas.get(video_id)
+            if payload is None:
+                payload = await generate_ideas(
+                    ai_client,
+                    model=args.text_model,
+                    title=title,
+                    description=description,
+                    cache_dir=ideas_cache_dir(args),
+                )
+        except Exception as exc:
+            write_text(video_dir / "error.txt", f"Failed to generate ideas: {exc}\n")
+            return False
+
+        write_text(ideas_path, json.dumps(payload, indent=2, ensure_ascii=False))
+
+    if payload is None and args.skip_text and ideas_path.exists():
+        try:
+            payload = json.loads(ideas_path.read_text(encoding="utf-8"))
+        except Exception:
+            payload = None
+
+    complete = payload is not None
+    if payload is not None:
+        try:
+            titles, thumbnails = parse_titles_and_thumbs_payload(payload)
+            titles_text = "\n".join([f"{idx + 1}. {t}" for idx, t in enumerate(titles)])
+            write_text(video_dir / "titles.txt", titles_text)
+
+            lines = []
+            for idx, thumb in enumerate(thumbnails, start=1):
+                photo = str(thumb.get("photo", "") or "")
+                text = normalize_thumb_text(str(thumb.get("text", "") or ""))
+                artifact = str(thumb.get("artifact", "") or "")
+                concept = str(thumb.get("concept", "") or "")
+                lines.append(f"{idx}. {text} | {photo} | {artifact} | {concept}")
+            write_text(video_dir / "thumbnails.txt", "\n".join(lines))
+        except Exception as exc:
+            write_text(video_dir / "error.txt", f"Invalid ideas payload: {exc}\n")
+            complete = False
+
+    if not args.skip_images:
+        # If we skipped text generation, still generate 3 images based on a fallback prompt.
+        if payload is None:
+            payload = {
+                "thumbnails": [
+                    {"photo": "assets/antonio-1.png", "text": "Arquitectura IA", "artifact": "diagram", "concept": "technical nodes/diagram"},
+                    {"photo": "assets/antonio-2.png", "text": "MCP Toolkit", "artifact": "docker+mcp", "concept": "docker + MCP icons"},
+                    {"photo": "assets/antonio-3.png", "text": "Dev Workflow", "artifact": "code", "concept": "code snippet + terminal"},
+                ]
+            }
+
+        thumbs = payload.get("thumbnails") or []
+        jobs: list[tuple[int, PILImage.Image, str, Path]] = []
+        for idx, thumb in enumerate(thumbs, start=1):
+            out_path = video_dir / f"thumb-{idx}.png"
+            if args.only_missing_images and out_path.exists():
+                continue
+
+            photo_key = str(thumb.get("photo", "") or "")
+            input_photo = photo_images.get(photo_key)
+            if input_photo is None:
+                # Try to map by basename.
+                basename = Path(photo_key).name
+                input_photo = next(
+                    (p for k, p in photo_images.items() if Path(k).name == basename),
+                    None,
+                )
+            if input_photo is None:
+                write_text(
+                    video_dir / "error.txt",
+                    f"Missing input photo for thumbnail {idx}: {photo_key}\n",
+                )
+                complete = False
+                continue
+
+            thumb_text = normalize_thumb_text(str(thumb.get("text", "") or ""))
+            if word_count(thumb_text) > 4:
+                thumb_text = " ".join(thumb_text.split(" ")[:4]).strip()
+
+            artifact = str(thumb.get("artifact", "") or "")
+            concept = str(thumb.get("concept", "") or "")
+
+            image_prompt = (
+                "Create a YouTube thumbnail (16:9). "
+                "Use the provided photo as Antonio's portrait (keep identity, face sharp, no distortions). "
+                "Background: dark mode gradient cyan/purple, cinematic lighting, minimalist. "
+                f"Include a technical artifact: {artifact}. "
+                f"Concept: {concept}. "
+                f'Add large bold text (<=4 words): \"{thumb_text}\". '
+                "High contrast, clean typography, no extra text, no watermark."
+            )
+
+            write_text(video_dir / f"thumb-{idx}.prompt.txt", image_prompt)
+            jobs.append((idx, input_photo, image_prompt, out_path))
+
+        # The thumbnails of one video are independent requests; run them together.
+        results = await asyncio.gather(
+            *(
+                generate_thumbnail_image(
+                    ai_client,
+                    model=args.image_model,
+                    photo=input_photo,
+                    prompt=image_prompt,
+                    output_path=out_path,
+                    compress_level=args.png_compress_level,
+                )
+                for _, input_photo, image_prompt, out_path in jobs
+            ),
+            return_exceptions=True,
+        )
+        for (idx, *_), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                write_text(video_dir / "error.txt", f"Failed to generate thumb-{idx}: {result}\n")
+                complete = False
+
+    # Ideas alone are not a finished video; --skip-images runs never count as done.
+    return complete and not args.skip_images
+
+
+async def process_videos(
+    args: argparse.Namespace,
+    ai_client: genai.Client,
+    out_dir: Path,
+    playlist_items: list[dict],
+    details_by_id: dict[str, dict],
+) -> tuple[int, int, int]:
+    assets_dir = get_assets_dir()
+    photo_map = {
+        "assets/antonio-1.png": assets_dir / "antonio-1.png",
+        "assets/antonio-2.png": assets_dir / "antonio-2.png",
+        "assets/antonio-3.png": assets_dir / "antonio-3.png",
+    }
+    # Decode each portrait once; the same images are sent with every thumbnail request.
+    loaded: dict[Path, PILImage.Image] = {}
+    for path in photo_map.values():
+        if path not in loaded and path.exists():
+            image = PILImage.open(str(path))
+            image.load()
+            loaded[path] = image
+    photo_images = {key: loaded[path] for key, path in photo_map.items() if path in loaded}
+
+    videos = [v for v in (video_entry(item, details_by_id) for item in playlist_items) if v]
+    # Keep using a video's folder even if its slug is computed differently now
+    # (e.g. a renamed video), so --resume still finds ideas.json and thumbnails.
+    folders = existing_video_folders(out_dir, {v["video_id"] for v in videos})
+    for v in videos:
+        v["folder_name"] = folders.get(v["video_id"], v["folder_name"])
+    eligible = [
+        v
+        for v in videos
+        if v["duration_seconds"] is not None and v["duration_seconds"] >= args.min_seconds
+    ]
+
+    state = open_state(out_dir)
+    already_done = 0
+    if args.resume:
+        # Videos finished by an earlier run only get their metadata refreshed, so title
+        # and description edits on YouTube still reach the folder.
+        done_ids = load_done(state)
+        pending = []
+        for v in eligible:
+            if v["video_id"] in done_ids:
+                write_video_metadata(out_dir, v)
+            else:
+                pending.append(v)
+        already_done = len(eligible) - len(pending)
+        eligible = pending
+
+    cache_dir = ideas_cache_dir(args)
+    batch_ideas: dict[str, dict] = {}
+    if args.batch and not args.skip_text:
+        prompts = {
+            v["video_id"]: ideas_prompt(v["title"], v["description"])
+            for v in eligible
+            if not (args.resume and (out_dir / v["folder_name"] / "ideas.json").exists())
+        }
+        if cache_dir:
+            prompts = {
+                video_id: prompt
+                for video_id, prompt in prompts.items()
+                if not ideas_cache_path(cache_dir, args.text_model, prompt).exists()
+            }
+        if prompts:
+            try:
+                batch_ideas = await generate_ideas_batch(
+                    ai_client,
+                    model=args.text_model,
+                    prompts=prompts,
+                    poll_s=args.batch_poll_s,
+                    timeout_s=args.batch_timeout_s,
+                )
+            except Exception as exc:
+                print(f"Batch job failed, falling back to per-video requests: {exc}", file=sys.stderr)
+            if cache_dir:
+                for video_id, payload in batch_ideas.items():
+                    if isinstance(payload, dict):
+                        write_cached_ideas(
+                            ideas_cache_path(cache_dir, args.text_model, prompts[video_id]),
+                            payload,
+                        )
+
+    # Gemini calls are network-bound; the semaphore caps how many videos are in flight.
+    sem = asyncio.Semaphore(args.concurrency)
+    try:
+        await asyncio.gather(
+            *(
+                process_video(args, ai_client, out_dir, photo_images, sem, video, batch_ideas, state)
+                for video in eligible
+            )
+        )
+    finally:
+        state.close()
+    return len(eligible), already_done, len(videos) - len(eligible) - already_done
 
 
 def main() -> int:
@@ -265,7 +868,11 @@ def main() -> int:
     parser.add_argument(
         "--resume",
         action="store_true",
-        help="Reuse existing ideas.json when present (and only generate what's missing)",
+        help=(
+            "Reuse existing ideas.json when present (and only generate what's missing); "
+            f"videos recorded as finished in <out-dir>/{STATE_DB_NAME} only get their "
+            "title/description/meta.json refreshed"
+        ),
     )
     parser.add_argument(
         "--only-missing-images",
@@ -286,6 +893,41 @@ def main() -> int:
         default=3,
         help="Gemini HTTP retry attempts (default: 3)",
     )
+    parser.add_argument(
+        "--png-compress-level",
+        type=int,
+        default=DEFAULT_PNG_COMPRESS_LEVEL,
+        help="zlib level for thumb-*.png, 0-9 (default: 6; lower encodes faster, bigger files)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_IDEAS_CACHE_DIR,
+        help="Cache of generated ideas keyed by prompt and model",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always call Gemini for ideas")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Generate ideas through the Gemini Batch API (half price, may take minutes)",
+    )
+    parser.add_argument(
+        "--batch-poll-s",
+        type=float,
+        default=30.0,
+        help="Seconds between Batch job status checks (default: 30)",
+    )
+    parser.add_argument(
+        "--batch-timeout-s",
+        type=float,
+        default=3600.0,
+        help="Seconds to wait for the Batch job before using per-video requests (default: 3600)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Videos processed in parallel (default: 4)",
+    )
     args = parser.parse_args()
 
     if args.limit <= 0:
@@ -294,6 +936,18 @@ def main() -> int:
     if args.min_seconds < 0:
         print("--min-seconds must be >= 0", file=sys.stderr)
         return 2
+    if args.concurrency <= 0:
+        print("--concurrency must be > 0", file=sys.stderr)
+        return 2
+    if not 0 <= args.png_compress_level <= 9:
+        print("--png-compress-level must be between 0 and 9", file=sys.stderr)
+        return 2
+    if args.batch_poll_s <= 0:
+        print("--batch-poll-s must be > 0", file=sys.stderr)
+        return 2
+    if args.batch_timeout_s <= 0:
+        print("--batch-timeout-s must be > 0", file=sys.stderr)
+        return 2
 
     if not Path(args.client_secret).exists():
         print(f"Missing client secret: {args.client_secret}", file=sys.stderr)
@@ -327,222 +981,24 @@ def main() -> int:
         ),
     )
 
+    creds = load_credentials(args.client_secret, args.token)
     youtube = get_authenticated_service(args.client_secret, args.token)
 
-    channel_resp = youtube.channels().list(part="contentDetails", mine=True).execute()
-    channel_items = channel_resp.get("items", [])
-    if not channel_items:
-        print("No channel found for the authenticated user.", file=sys.stderr)
-        return 1
-
-    uploads_id = (
-        channel_items[0]
-        .get("contentDetails", {})
-        .get("relatedPlaylists", {})
-        .get("uploads")
-    )
-    if not uploads_id:
-        print("Could not resolve uploads playlist id.", file=sys.stderr)
+    try:
+        uploads_id = resolve_uploads_id(youtube, creds, args.token)
+    except RuntimeError as exc:
+        print(str(exc), file=sys.stderr)
         return 1
 
-    playlist_resp = youtube.playlistItems().list(
-        part="snippet,contentDetails",
-        playlistId=uploads_id,
-        maxResults=args.limit,
-    ).execute()
-
-    playlist_items = playlist_resp.get("items", [])
-    video_ids = [
-        item.get("contentDetails", {}).get("videoId")
-        for item in playlist_items
-        if item.get("contentDetails", {}).get("videoId")
-    ]
-
-    details_by_id: dict[str, dict] = {}
-    if video_ids:
-        details_resp = youtube.videos().list(
-            part="snippet,contentDetails,status",
-            id=",".join(video_ids),
-        ).execute()
-        for item in details_resp.get("items", []):
-            if "id" in item:
-                details_by_id[item["id"]] = item
+    playlist_items, details_by_id = fetch_uploads(youtube, creds, uploads_id, args.limit)
 
-    processed = 0
-    skipped = 0
-
-    assets_dir = get_assets_dir()
-    photo_map = {
-        "assets/antonio-1.png": assets_dir / "antonio-1.png",
-        "assets/antonio-2.png": assets_dir / "antonio-2.png",
-        "assets/antonio-3.png": assets_dir / "antonio-3.png",
-    }
-
-    for item in playlist_items:
-        video_id = item.get("contentDetails", {}).get("videoId")
-        if not video_id:
-            continue
-        details = details_by_id.get(video_id, {})
-        snippet = details.get("snippet", {})
-        content_details = details.get("contentDetails", {})
-
-        duration_raw = content_details.get("duration")
-        duration_seconds = parse_duration(duration_raw) if duration_raw else None
-        if duration_seconds is None or duration_seconds < args.min_seconds:
-            skipped += 1
-            continue
-
-        title = snippet.get("title") or item.get("snippet", {}).get("title") or ""
-        description = snippet.get("description") or ""
-        published_at = snippet.get("publishedAt") or item.get("snippet", {}).get("publishedAt") or ""
-
-        date_prefix = ""
-        if published_at:
-            try:
-                dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                date_prefix = dt.strftime("%Y%m%d")
-            except ValueError:
-                date_prefix = ""
-
-        slug = safe_slug(title)[:60]
-        folder_name = f"{date_prefix}_{slug}_{video_id}" if date_prefix else f"{slug}_{video_id}"
-        video_dir = out_dir / folder_name
-        video_dir.mkdir(parents=True, exist_ok=True)
-
-        write_text(video_dir / "title.txt", title)
-        write_text(video_dir / "description.txt", description)
-
-        meta = {
-            "video_id": video_id,
-            "title": title,
-            "published_at": published_at,
-            "duration": format_duration(duration_seconds),
-            "duration_seconds": duration_seconds,
-            "url": f"https://www.youtube.com/watch?v={video_id}",
-        }
-        (video_dir / "meta.json").write_text(
-            json.dumps(meta, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
-
-        ideas_path = video_dir / "ideas.json"
-        payload = None
-
-        if args.resume and ideas_path.exists():
-            try:
-                payload = json.loads(ideas_path.read_text(encoding="utf-8"))
-            except Exception as exc:
-                write_text(video_dir / "error.txt", f"Failed to read ideas.json: {exc}\n")
-                payload = None
-
-        if payload is None and not args.skip_text:
-            try:
-                payload = generate_ideas(
-                    ai_client,
-                    model=args.text_model,
-                    title=title,
-                    description=description,
-                )
-            except Exception as exc:
-                write_text(video_dir / "error.txt", f"Failed to generate ideas: {exc}\n")
-                processed += 1
-                continue
-
-            ideas_path.write_text(
-                json.dumps(payload, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
-
-        if payload is None and args.skip_text and ideas_path.exists():
-            try:
-                payload = json.loads(ideas_path.read_text(encoding="utf-8"))
-            except Exception:
-                payload = None
-
-        if payload is not None:
-            try:
-                titles, thumbnails = parse_titles_and_thumbs_payload(payload)
-                titles_text = "\n".join([f"{idx + 1}. {t}" for idx, t in enumerate(titles)])
-                write_text(video_dir / "titles.txt", titles_text)
-
-                lines = []
-                for idx, thumb in enumerate(thumbnails, start=1):
-                    photo = str(thumb.get("photo", "") or "")
-                    text = normalize_thumb_text(str(thumb.get("text", "") or ""))
-                    artifact = str(thumb.get("artifact", "") or "")
-                    concept = str(thumb.get("concept", "") or "")
-                    lines.append(f"{idx}. {text} | {photo} | {artifact} | {concept}")
-                write_text(video_dir / "thumbnails.txt", "\n".join(lines))
-            except Exception as exc:
-                write_text(video_dir / "error.txt", f"Invalid ideas payload: {exc}\n")
-
-        if not args.skip_images:
-            # If we skipped text generation, still generate 3 images based on a fallback prompt.
-            if payload is None:
-                payload = {
-                    "thumbnails": [
-                        {"photo": "assets/antonio-1.png", "text": "Arquitectura IA", "artifact": "diagram", "concept": "technical nodes/diagram"},
-                        {"photo": "assets/antonio-2.png", "text": "MCP Toolkit", "artifact": "docker+mcp", "concept": "docker + MCP icons"},
-                        {"photo": "assets/antonio-3.png", "text": "Dev Workflow", "artifact": "code", "concept": "code snippet + terminal"},
-                    ]
-                }
-
-            thumbs = payload.get("thumbnails") or []
-            for idx, thumb in enumerate(thumbs, start=1):
-                out_path = video_dir / f"thumb-{idx}.png"
-                if args.only_missing_images and out_path.exists():
-                    continue
-
-                photo_key = str(thumb.get("photo", "") or "")
-                input_photo = photo_map.get(photo_key)
-                if input_photo is None:
-                    # Try to map by basename.
-                    basename = Path(photo_key).name
-                    input_photo = next(
-                        (p for k, p in photo_map.items() if Path(k).name == basename),
-                        None,
-                    )
-                if input_photo is None or not input_photo.exists():
-                    write_text(
-                        video_dir / "error.txt",
-                        f"Missing input photo for thumbnail {idx}: {photo_key}\n",
-                    )
-                    continue
-
-                thumb_text = normalize_thumb_text(str(thumb.get("text", "") or ""))
-                if word_count(thumb_text) > 4:
-                    thumb_text = " ".join(thumb_text.split(" ")[:4]).strip()
-
-                artifact = str(thumb.get("artifact", "") or "")
-                concept = str(thumb.get("concept", "") or "")
-
-                image_prompt = (
-                    "Create a YouTube thumbnail (16:9). "
-                    "Use the provided photo as Antonio's portrait (keep identity, face sharp, no distortions). "
-                    "Background: dark mode gradient cyan/purple, cinematic lighting, minimalist. "
-                    f"Include a technical artifact: {artifact}. "
-                    f"Concept: {concept}. "
-                    f'Add large bold text (<=4 words): \"{thumb_text}\". '
-                    "High contrast, clean typography, no extra text, no watermark."
-                )
-
-                write_text(video_dir / f"thumb-{idx}.prompt.txt", image_prompt)
-                try:
-                    generate_thumbnail_image(
-                        ai_client,
-                        model=args.image_model,
-                        input_photo_path=input_photo,
-                        prompt=image_prompt,
-                        output_path=out_path,
-                    )
-                except Exception as exc:
-                    write_text(video_dir / "error.txt", f"Failed to generate thumb-{idx}: {exc}\n")
-                    continue
-
-        processed += 1
+    processed, already_done, skipped = asyncio.run(
+        process_videos(args, ai_client, out_dir, playlist_items, details_by_id)
+    )
 
     print(
-        f"Processed: {processed} | Skipped (<{args.min_seconds}s): {skipped} | Output: {out_dir}",
+        f"Processed: {processed} | Already done: {already_done} | "
+        f"Skipped (<{args.min_seconds}s): {skipped} | Output: {out_dir}",
     )
     return 0
 
@@ -1,82 +1,15 @@
 #!/usr/bin/env python3
 import argparse
-import os
 import sys
 from pathlib import Path
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-
-SCOPES = [
-    "https://www.googleapis.com/auth/youtube.upload",
-    "https://www.googleapis.com/auth/youtube",
-    "https://www.googleapis.com/auth/youtube.force-ssl",
-]
-
-DEFAULT_CLIENT_SECRET_PATH = os.path.expanduser("~/.config/youtube-publish/client_secret.json")
-DEFAULT_TOKEN_PATH = os.path.expanduser("~/.config/youtube-publish/token.json")
-
-
-def get_authenticated_service(client_secret_path: str, token_path: str):
-    creds = None
-    token_file = Path(token_path)
-    if token_file.exists():
-        creds = Credentials.from_authorized_user_file(str(token_file), SCOPES)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
-            auth_url, _ = flow.authorization_url(
-                access_type="offline",
-                prompt="consent",
-            )
-            print("Open this URL in your browser, approve access, then paste the final URL:")
-            print(auth_url)
-            redirect_response = input("Paste full redirect URL: ").strip()
-            flow.fetch_token(authorization_response=redirect_response)
-            creds = flow.credentials
-        token_file.parent.mkdir(parents=True, exist_ok=True)
-        token_file.write_text(creds.to_json(), encoding="utf-8")
-
-    return build("youtube", "v3", credentials=creds)
-
-def parse_duration(value: str) -> int | None:
-    if not value:
-        return None
-    if not value.startswith("P"):
-        return None
-    # Basic ISO 8601 duration parsing for PT#H#M#S
-    hours = minutes = seconds = 0
-    time_part = value.split("T")[-1] if "T" in value else ""
-    number = ""
-    for ch in time_part:
-        if ch.isdigit():
-            number += ch
-            continue
-        if ch == "H":
-            hours = int(number or 0)
-        elif ch == "M":
-            minutes = int(number or 0)
-        elif ch == "S":
-            seconds = int(number or 0)
-        else:
-            return None
-        number = ""
-    return hours * 3600 + minutes * 60 + seconds
-
-
-def format_duration(value: int | None) -> str:
-    if value is None:
-        return "n/a"
-    minutes, seconds = divmod(value, 60)
-    hours, minutes = divmod(minutes, 60)
-    if hours:
-        return f"{hours:d}:{minutes:02d}:{seconds:02d}"
-    return f"{minutes:d}:{seconds:02d}"
+from youtube_common import (
+    DEFAULT_CLIENT_SECRET_PATH,
+    DEFAULT_TOKEN_PATH,
+    format_duration,
+    get_authenticated_service,
+    parse_duration,
+)
 
 
 def main() -> int:
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Keep a Parakeet MLX model loaded and transcribe videos sent over a UNIX socket.
+
+transcribe_parakeet.py uses this daemon when the socket exists and falls back to
+the parakeet-mlx CLI otherwise. Each request is one JSON line
+{"video": ..., "out_dir": ...}; the reply is {"ok": true, "srt": ...} or
+{"ok": false, "error": ...}.
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+from pathlib import Path
+
+from transcribe_parakeet import DEFAULT_SOCKET_PATH
+
+DEFAULT_MODEL = "mlx-community/parakeet-tdt-0.6b-v3"
+# parakeet-mlx CLI defaults; model.transcribe() alone decodes the whole file in one pass.
+DEFAULT_CHUNK_DURATION = 120.0
+DEFAULT_OVERLAP_DURATION = 15.0
+
+
+def format_timestamp(seconds: float) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def to_srt(result) -> str:
+    blocks = []
+    for idx, sentence in enumerate(result.sentences, start=1):
+        start = format_timestamp(sentence.start)
+        end = format_timestamp(sentence.end)
+        blocks.append(f"{idx}\n{start} --> {end}\n{sentence.text.strip()}\n")
+    return "\n".join(blocks)
+
+
+def transcribe(
+    model,
+    video_path: Path,
+    out_dir: Path,
+    chunk_duration: float = DEFAULT_CHUNK_DURATION,
+    overlap_duration: float = DEFAULT_OVERLAP_DURATION,
+) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result = model.transcribe(
+        str(video_path), chunk_duration=chunk_duration, overlap_duration=overlap_duration
+    )
+    # Same name the CLI uses, so callers don't care who produced it.
+    srt_path = out_dir / f"{video_path.stem}.srt"
+    srt_path.write_text(to_srt(result), encoding="utf-8")
+    return srt_path
+
+
+def make_handler(model, chunk_duration: float, overlap_duration: float):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                srt_path = transcribe(
+                    model,
+                    Path(request["video"]),
+                    Path(request["out_dir"]),
+                    chunk_duration,
+                    overlap_duration,
+                )
+                reply = {"ok": True, "srt": str(srt_path)}
+            except Exception as exc:
+                reply = {"ok": False, "error": str(exc)}
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Parakeet MLX transcriptions over a UNIX socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Socket path")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Hugging Face model id")
+    parser.add_argument(
+        "--chunk-duration",
+        type=float,
+        default=DEFAULT_CHUNK_DURATION,
+        help="Seconds of audio per chunk (same default as the parakeet-mlx CLI)",
+    )
+    parser.add_argument(
+        "--overlap-duration",
+        type=float,
+        default=DEFAULT_OVERLAP_DURATION,
+        help="Seconds of overlap between chunks",
+    )
+    args = parser.parse_args()
+
+    try:
+        from parakeet_mlx import from_pretrained
+    except ImportError:
+        print("parakeet-mlx is not installed (pip install parakeet-mlx)", file=sys.stderr)
+        return 1
+
+    # Loading weights and compiling the graph is the slow part; do it once.
+    model = from_pretrained(args.model)
+
+    socket_path = Path(args.socket).expanduser()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()
+
+    # Requests are handled one at a time: a single model on a single GPU.
+    handler = make_handler(model, args.chunk_duration, args.overlap_duration)
+    with socketserver.UnixStreamServer(str(socket_path), handler) as server:
+        os.chmod(socket_path, 0o600)
+        print(f"Listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,40 @@
 #!/usr/bin/env python3
 import argparse
+import errno
 import json
 import os
 import re
 import shutil
 import subprocess
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+STDERR_TAIL_LINES = 200
+_SLUG_DROP_RE = re.compile(r"[^a-zA-Z0-9\-\s]")
+_WS_RE = re.compile(r"\s+")
 
-def run(cmd):
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr}")
-    return result.stdout
+
+def run(cmd, input_text=None):
+    # ffmpeg logs progress to stderr for the whole run; keep only the tail for the error.
+    stdin = subprocess.PIPE if input_text is not None else subprocess.DEVNULL
+    with subprocess.Popen(
+        cmd, stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    ) as proc:
+        if input_text is not None:
+            try:
+                proc.stdin.write(input_text)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass  # exited early; the return code and stderr say why
+        tail = deque(proc.stderr, maxlen=STDERR_TAIL_LINES)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{''.join(tail)}")
 
 
 def safe_slug(text):
-    text = re.sub(r"[^a-zA-Z0-9\-\s]", "", text).strip().lower()
-    text = re.sub(r"\s+", "-", text)
+    text = _SLUG_DROP_RE.sub("", text).strip().lower()
+    text = _WS_RE.sub("-", text)
     return text or "video"
 
 
@@ -26,6 +42,27 @@ def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
 
 
+def move_file(src: Path, dst: Path):
+    try:
+        # Same filesystem: a metadata-only rename, whatever the file size.
+        os.rename(src, dst)
+        return
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+    # Another filesystem (e.g. --workdir on an external disk): the bytes must be copied.
+    # Copy under a temp name so an interrupted copy never looks like a finished video.
+    # copy2 copies in the kernel (sendfile on Linux, fcopyfile on macOS).
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    src.unlink()
+
+
 def move_inputs(videos, inputs_dir):
     moved = []
     for video in videos:
@@ -33,16 +70,18 @@ def move_inputs(videos, inputs_dir):
         if not src.exists():
             raise FileNotFoundError(f"Missing video: {src}")
         dst = inputs_dir / src.name
-        shutil.move(src, dst)
+        move_file(src, dst)
         moved.append(dst)
     return moved
 
 
 def concat_videos(videos, out_path: Path):
-    list_file = out_path.parent / "concat_list.txt"
-    with list_file.open("w", encoding="utf-8") as f:
-        for v in videos:
-            f.write(f"file '{v.as_posix()}'\n")
+    # The concat list goes to ffmpeg on stdin; no concat_list.txt is left in the workdir.
+    # Entries need the file: scheme, or ffmpeg resolves them against the pipe: URL.
+    # Inside '...' a quote is written as '\'' (close, escaped quote, reopen).
+    concat_list = "".join(
+        "file 'file:{}'\n".format(v.resolve().as_posix().replace("'", "'\\''")) for v in videos
+    )
     cmd = [
         "ffmpeg",
         "-y",
@@ -50,13 +89,17 @@ def concat_videos(videos, out_path: Path):
         "concat",
         "-safe",
         "0",
+        "-protocol_whitelist",
+        "file,pipe",
         "-i",
-        str(list_file),
+        "pipe:0",
         "-c",
         "copy",
         str(out_path),
     ]
-    run(cmd)
+    # MP4s can't be joined by concatenating bytes (each has its own moov index), so
+    # ffmpeg remuxes; -c copy keeps that a stream copy with no re-encode.
+    run(cmd, input_text=concat_list)
     return out_path
 
 
@@ -72,17 +115,18 @@ def main():
     workdir = Path(args.workdir) if args.workdir else Path(args.videos[0]).parent / f"{now}_{slug}"
     ensure_dir(workdir)
 
-    inputs_dir = workdir / "inputs"
-    ensure_dir(inputs_dir)
-    moved = move_inputs(args.videos, inputs_dir)
-
-    if len(moved) == 1:
-        original = moved[0]
-        video_out = workdir / f"{slug}.mp4"
+    video_out = workdir / f"{slug}.mp4"
+    if len(args.videos) == 1:
+        # Nothing to concatenate: move the input straight to its final name.
+        original = Path(args.videos[0])
+        if not original.exists():
+            raise FileNotFoundError(f"Missing video: {original}")
         if original.resolve() != video_out.resolve():
-            shutil.move(original, video_out)
+            move_file(original, video_out)
     else:
-        video_out = workdir / f"{slug}.mp4"
+        inputs_dir = workdir / "inputs"
+        ensure_dir(inputs_dir)
+        moved = move_inputs(args.videos, inputs_dir)
         concat_videos(moved, video_out)
 
     result = {
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import json
 import os
 import re
 import subprocess
@@ -12,12 +14,8 @@ try:
 except Exception:
     ZoneInfo = None
 
-import yaml
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+# yaml and the Google client libraries are imported where they are used: --help,
+# argument errors and cached configs never pay for them.
 
 SCOPES = [
     "https://www.googleapis.com/auth/youtube.upload",
@@ -30,14 +28,44 @@ DEFAULT_TOKEN_PATH = os.path.expanduser("~/.config/youtube-publish/token.json")
 DEFAULT_PROMO_LINE = "Domina la IA para el desarrollo de Software 👉 https://devexpert.io/cursos/expert/ai"
 YOUTUBE_WATCH_URL = "https://www.youtube.com/watch?v="
 YOUTUBE_SHORT_URL = "https://youtu.be/"
+# -1 streams the whole file in one PUT; set config upload_chunksize (bytes, multiple
+# of 256 KiB) to upload in chunks and get progress output.
+DEFAULT_UPLOAD_CHUNKSIZE = -1
 
 
 def load_config(path: str) -> dict:
     p = Path(path)
-    if not p.exists():
+    try:
+        st = p.stat()
+    except FileNotFoundError:
         return {}
-    data = yaml.safe_load(p.read_text(encoding="utf-8"))
-    return data or {}
+
+    # Parsed config is cached as JSON next to the YAML, valid while mtime and size match.
+    cache_path = p.with_name(p.name + ".cache.json")
+    key = [st.st_mtime_ns, st.st_size]
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            return cached["data"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as YamlLoader  # libyaml bindings
+    except ImportError:  # pragma: no cover - PyYAML built without libyaml
+        from yaml import SafeLoader as YamlLoader
+
+    data = yaml.load(p.read_text(encoding="utf-8"), Loader=YamlLoader) or {}
+    try:
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"key": key, "data": data}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Read-only config dir or values JSON can't hold (e.g. YAML dates): just don't cache.
+        pass
+    return data
 
 
 def resolve_promo_line(config: dict) -> str:
@@ -119,10 +147,16 @@ def parse_publish_at(value: str, tz_name: str) -> str:
         if ZoneInfo is None:
             raise ValueError("ZoneInfo not available; use Python 3.9+ or provide timezone offset")
         dt = dt.replace(tzinfo=ZoneInfo(tz_name))
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+@functools.lru_cache(maxsize=1)
 def get_authenticated_service(client_secret_path: str, token_path: str):
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.discovery import build
+
     creds = None
     token_file = Path(token_path)
     if token_file.exists():
@@ -145,11 +179,23 @@ def get_authenticated_service(client_secret_path: str, token_path: str):
         token_file.parent.mkdir(parents=True, exist_ok=True)
         token_file.write_text(creds.to_json(), encoding="utf-8")
 
-    return build("youtube", "v3", credentials=creds)
+    # Use the discovery document bundled with googleapiclient instead of fetching it.
+    return build("youtube", "v3", credentials=creds, static_discovery=True)
+
 
+def upload_video(
+    youtube,
+    video_path: str,
+    body: dict,
+    thumbnail_path: str = None,
+    notify_subscribers: bool = False,
+    chunksize: int = DEFAULT_UPLOAD_CHUNKSIZE,
+):
+    from googleapiclient.http import MediaFileUpload
 
-def upload_video(youtube, video_path: str, body: dict, thumbnail_path: str = None, notify_subscribers: bool = False):
-    media = MediaFileUpload(video_path, chunksize=8 * 1024 * 1024, resumable=True)
+    # A resumable session accepts bytes only in order, from the offset the server last
+    # committed, so ranges cannot be sent in parallel; one streamed PUT is the fast path.
+    media = MediaFileUpload(video_path, chunksize=chunksize, resumable=True)
     request = youtube.videos().insert(
         part="snippet,status",
         body=body,
@@ -212,7 +258,7 @@ def insert_promo_comment(youtube, video_id: str, comment_text: str):
     print("Inserted promo comment.")
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Upload and schedule a YouTube video")
     parser.add_argument("--video", help="Path to video file")
     parser.add_argument("--title", required=True, help="Video title")
@@ -231,8 +277,11 @@ def main():
     parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="Config path")
     parser.add_argument("--client-secret", required=True, help="OAuth client secret JSON")
     parser.add_argument("--token", default=DEFAULT_TOKEN_PATH, help="Token cache path")
-    args = parser.parse_args()
+    return parser
 
+
+def run(args: argparse.Namespace) -> str:
+    """Upload or update a video; wrapper scripts call this in-process."""
     config = load_config(args.config)
     promo_line = resolve_promo_line(config)
     promo_comment = resolve_promo_comment(config, promo_line)
@@ -285,6 +334,7 @@ def main():
         notify_subscribers = False
     default_language = config.get("default_language")
     default_audio_language = config.get("default_audio_language")
+    upload_chunksize = int(config.get("upload_chunksize") or DEFAULT_UPLOAD_CHUNKSIZE)
 
     snippet = {
         "title": args.title,
@@ -316,6 +366,7 @@ def main():
         sys.exit(1)
 
     youtube = get_authenticated_service(args.client_secret, args.token)
+    from googleapiclient.http import MediaFileUpload
 
     needs_comment = bool(promo_comment)
     needs_schedule = bool(publish_at)
@@ -361,6 +412,7 @@ def main():
         print(f"Updated video id: {args.update_video_id}")
         if publish_at:
             print(f"Scheduled for: {publish_at} (UTC)")
+        return args.update_video_id
     else:
         if needs_schedule and needs_comment:
             temp_status = {
@@ -377,6 +429,7 @@ def main():
                 body=temp_body,
                 thumbnail_path=args.thumbnail,
                 notify_subscribers=notify_subscribers,
+                chunksize=upload_chunksize,
             )
             insert_promo_comment(youtube, video_id, promo_comment)
             final_body = {
@@ -392,6 +445,7 @@ def main():
                 body=body,
                 thumbnail_path=args.thumbnail,
                 notify_subscribers=notify_subscribers,
+                chunksize=upload_chunksize,
             )
             if needs_comment:
                 insert_promo_comment(youtube, video_id, promo_comment)
@@ -411,6 +465,12 @@ def main():
         if publish_at:
             print(f"Scheduled for: {publish_at} (UTC)")
         print(f"Notify subscribers: {notify_subscribers}")
+        return video_id
+
+
+def main(argv: list[str] | None = None) -> str:
+    """Run the CLI and return the id of the uploaded or updated video."""
+    return run(build_parser().parse_args(argv))
 
 
 if __name__ == "__main__":
@@ -53,14 +53,14 @@ def load_skills_config() -> dict:
         return {}
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Schedule newsletter via Listmonk CLI")
     parser.add_argument("--subject", required=True, help="Email subject")
     parser.add_argument("--body-file", required=True, help="Markdown body file")
     parser.add_argument("--send-at", required=True, help="ISO 8601 datetime with offset")
     parser.add_argument("--name", required=True, help="Campaign name")
     parser.add_argument("--list-id", type=int, help="Listmonk list ID")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     config = load_skills_config().get("youtube_publish", {})
     list_id = args.list_id or config.get("listmonk_list_id")
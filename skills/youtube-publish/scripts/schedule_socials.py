@@ -3,6 +3,7 @@ import argparse
 import json
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 SKILLS_CONFIG_PATH = os.path.expanduser("~/.config/skills/config.json")
 
@@ -76,7 +77,7 @@ def resolve_group_integrations(group_name: str, postiz: dict) -> list[str]:
     return resolved
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Schedule socials via Postiz CLI")
     parser.add_argument("--text-file", required=True, help="Path to post text")
     parser.add_argument("--scheduled-date", required=True, help="ISO 8601 datetime with offset")
@@ -84,7 +85,12 @@ def main():
     parser.add_argument("--image", help="Thumbnail image path")
     parser.add_argument("--integrations", help="Comma-separated Postiz integration IDs")
     parser.add_argument("--group", help="Postiz group name from config (default: youtube_publish)")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--separate-posts",
+        action="store_true",
+        help="Run one postiz call per integration (slower; a failing channel does not block the rest)",
+    )
+    args = parser.parse_args(argv)
 
     skills_cfg = load_skills_config()
     postiz_cfg = skills_cfg.get("postiz", {})
@@ -102,32 +108,30 @@ def main():
             "in ~/.config/skills/config.json)"
         )
 
-    text = open(args.text_file, "r", encoding="utf-8").read().strip()
-    if "#" in text:
-        text = text.replace("#", "")
-    if not text.endswith("Link en el primer comentario."):
-        if not text.endswith("."):
-            text += "."
-        text += "\n\nLink en el primer comentario."
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # The upload is a postiz CLI round trip; prepare the text while it runs.
+        image_future = executor.submit(upload_image, args.image) if args.image else None
 
-    image_url = upload_image(args.image) if args.image else None
+        text = open(args.text_file, "r", encoding="utf-8").read().strip()
+        if "#" in text:
+            text = text.replace("#", "")
+        if not text.endswith("Link en el primer comentario."):
+            if not text.endswith("."):
+                text += "."
+            text += "\n\nLink en el primer comentario."
+
+        image_url = image_future.result() if image_future else None
 
     # Postiz CLI expects --content multiple times to build a thread.
     content_args = ["--content", text, "--content", args.comment_url]
 
-    for integration_id in integrations:
-        cmd = [
-            "postiz",
-            "posts",
-            "create",
-            *content_args,
-            "--integrations",
-            integration_id,
-            "--status",
-            "scheduled",
-            "--scheduled-date",
-            args.scheduled_date,
-        ]
+    # One CLI call takes repeated --integrations, so by default Node starts only once.
+    batches = [[i] for i in integrations] if args.separate_posts else [integrations]
+    for batch in batches:
+        cmd = ["postiz", "posts", "create", *content_args]
+        for integration_id in batch:
+            cmd += ["--integrations", integration_id]
+        cmd += ["--status", "scheduled", "--scheduled-date", args.scheduled_date]
         if image_url:
             cmd += ["--images", image_url]
         run(cmd)
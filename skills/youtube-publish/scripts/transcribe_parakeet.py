@@ -1,57 +1,101 @@
 #!/usr/bin/env python3
 import argparse
+import json
+import os
 import re
+import socket
 import subprocess
+from collections import deque
 from pathlib import Path
 
+DEFAULT_SOCKET_PATH = os.path.expanduser("~/.cache/youtube-publish/parakeet.sock")
+STDERR_TAIL_LINES = 200
+
+_REPLACEMENT_PATTERNS = [
+    (r"\bcloudbot\b", "ClawdBot"),
+    (r"\bclawdbot\b", "ClawdBot"),
+    (r"\bcloudboat\b", "ClawdBot"),
+    (r"\bjust\s*do\s*it\b", "justdoit"),
+    (r"\bcloud\s+opus\b", "Claude Opus"),
+    (r"\bwhatsapp\b", "WhatsApp"),
+    (r"\btelegram\b", "Telegram"),
+    (r"\bgemini\b", "Gemini"),
+    (r"\bgoogle\s+places\b", "Google Places"),
+    (r"\bgmail\b", "Gmail"),
+    (r"\bgoogle\s+sheets\b", "Google Sheets"),
+    (r"\bgoogle\s+drive\b", "Google Drive"),
+    (r"\bx\b", "X"),
+]
+_REPLACEMENTS_RE = re.compile(
+    "|".join(f"(?P<g{i}>{pattern})" for i, (pattern, _) in enumerate(_REPLACEMENT_PATTERNS)),
+    re.IGNORECASE,
+)
+_REPLACEMENTS = {f"g{i}": repl for i, (_, repl) in enumerate(_REPLACEMENT_PATTERNS)}
+
 
 def run(cmd):
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr}")
-    return result.stdout
+    # parakeet-mlx logs progress to stderr for the whole run; keep only the tail for the error.
+    with subprocess.Popen(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    ) as proc:
+        tail = deque(proc.stderr, maxlen=STDERR_TAIL_LINES)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{''.join(tail)}")
+
+
+def transcribe_via_daemon(video_path: Path, out_dir: Path, socket_path: str) -> bool:
+    """Ask a running parakeet_daemon.py to transcribe; False if no daemon is listening."""
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except (AttributeError, OSError):
+        return False
+    with sock:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+        request = {"video": str(video_path.resolve()), "out_dir": str(out_dir.resolve())}
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            line = f.readline()
+    if not line:
+        raise RuntimeError("Parakeet daemon closed the connection without a reply")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise RuntimeError(f"Parakeet daemon failed: {reply.get('error')}")
+    return True
 
 
 def apply_replacements(text):
-    replacements = [
-        (r"\bcloudbot\b", "ClawdBot"),
-        (r"\bclawdbot\b", "ClawdBot"),
-        (r"\bcloudboat\b", "ClawdBot"),
-        (r"\bjust\s*do\s*it\b", "justdoit"),
-        (r"\bcloud\s+opus\b", "Claude Opus"),
-        (r"\bwhatsapp\b", "WhatsApp"),
-        (r"\btelegram\b", "Telegram"),
-        (r"\bgemini\b", "Gemini"),
-        (r"\bgoogle\s+places\b", "Google Places"),
-        (r"\bgmail\b", "Gmail"),
-        (r"\bgoogle\s+sheets\b", "Google Sheets"),
-        (r"\bgoogle\s+drive\b", "Google Drive"),
-    ]
-    for pattern, repl in replacements:
-        text = re.sub(pattern, repl, text, flags=re.IGNORECASE)
-    text = re.sub(r"\b[xX]\b", "X", text)
-    return text
+    # One pass over the transcript: the first alternative that matches decides the replacement.
+    return _REPLACEMENTS_RE.sub(lambda m: _REPLACEMENTS[m.lastgroup], text)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Transcribe with Parakeet MLX and clean text")
     parser.add_argument("--video", required=True, help="Video path")
     parser.add_argument("--out-dir", required=True, help="Output directory")
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help="parakeet_daemon.py socket; the CLI is used when no daemon listens there",
+    )
     args = parser.parse_args()
 
     video_path = Path(args.video)
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    cmd = [
-        "parakeet-mlx",
-        str(video_path),
-        "--output-dir",
-        str(out_dir),
-        "--output-format",
-        "srt",
-    ]
-    run(cmd)
+    if not transcribe_via_daemon(video_path, out_dir, os.path.expanduser(args.socket)):
+        cmd = [
+            "parakeet-mlx",
+            str(video_path),
+            "--output-dir",
+            str(out_dir),
+            "--output-format",
+            "srt",
+        ]
+        run(cmd)
 
     srt_path = out_dir / f"{video_path.stem}.srt"
     if not srt_path.exists():
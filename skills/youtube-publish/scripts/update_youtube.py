@@ -1,14 +1,7 @@
 #!/usr/bin/env python3
 import argparse
-from pathlib import Path
-import subprocess
 
-
-def run(cmd):
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr}")
-    return result.stdout
+import publish_youtube
 
 
 def main():
@@ -24,9 +17,7 @@ def main():
     parser.add_argument("--category-id", help="YouTube category id")
     args = parser.parse_args()
 
-    cmd = [
-        "python",
-        str(Path(__file__).parent / "publish_youtube.py"),
+    argv = [
         "--update-video-id",
         args.video_id,
         "--title",
@@ -37,17 +28,18 @@ def main():
         args.client_secret,
     ]
     if args.thumbnail:
-        cmd += ["--thumbnail", args.thumbnail]
+        argv += ["--thumbnail", args.thumbnail]
     if args.publish_at:
         if not args.timezone:
             raise RuntimeError("--timezone is required with --publish-at")
-        cmd += ["--publish-at", args.publish_at, "--timezone", args.timezone]
+        argv += ["--publish-at", args.publish_at, "--timezone", args.timezone]
     if args.privacy_status:
-        cmd += ["--privacy-status", args.privacy_status]
+        argv += ["--privacy-status", args.privacy_status]
     if args.category_id:
-        cmd += ["--category-id", args.category_id]
+        argv += ["--category-id", args.category_id]
 
-    run(cmd)
+    # In-process: no second interpreter start-up and Google client import.
+    publish_youtube.main(argv)
 
 
 if __name__ == "__main__":
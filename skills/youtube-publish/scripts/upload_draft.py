@@ -2,14 +2,8 @@
 import argparse
 from datetime import datetime
 from pathlib import Path
-import subprocess
 
-
-def run(cmd):
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr}")
-    return result.stdout
+import publish_youtube
 
 
 def main():
@@ -21,11 +15,12 @@ def main():
 
     title = f"Draft {datetime.now().strftime('%Y-%m-%d %H:%M')}"
     desc_path = Path(args.output_video_id).parent / "description.draft.txt"
-    desc_path.write_text("Draft upload. Metadata will be updated.", encoding="utf-8")
+    # Keep an existing file: retries must not clobber a description edited by hand.
+    if not desc_path.exists():
+        desc_path.write_text("Draft upload. Metadata will be updated.", encoding="utf-8")
 
-    cmd = [
-        "python",
-        str(Path(__file__).parent / "publish_youtube.py"),
+    # In-process: no second interpreter start-up and Google client import.
+    vid = publish_youtube.main([
         "--video",
         args.video,
         "--title",
@@ -38,11 +33,9 @@ def main():
         args.output_video_id,
         "--client-secret",
         args.client_secret,
-    ]
-    run(cmd)
+    ])
 
-    # Read video id and write URL file
-    vid = Path(args.output_video_id).read_text(encoding='utf-8').strip()
+    # publish_youtube has written --output-video-id; add the URL next to it.
     if vid:
         url_path = Path(args.output_video_id).parent / "video_url.txt"
         url_path.write_text(f"https://www.youtube.com/watch?v={vid}", encoding="utf-8")
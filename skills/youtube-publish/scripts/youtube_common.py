@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import functools
+import os
+import re
+import unicodedata
+from pathlib import Path
+
+import httplib2
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+
+SCOPES = [
+    "https://www.googleapis.com/auth/youtube.upload",
+    "https://www.googleapis.com/auth/youtube",
+    "https://www.googleapis.com/auth/youtube.force-ssl",
+]
+
+DEFAULT_CLIENT_SECRET_PATH = os.path.expanduser("~/.config/youtube-publish/client_secret.json")
+DEFAULT_TOKEN_PATH = os.path.expanduser("~/.config/youtube-publish/token.json")
+YOUTUBE_HTTP_TIMEOUT_S = 30
+
+# YouTube durations look like PT1H2M3S, P1DT2H or P0D (live/upcoming).
+_ISO_DURATION_RE = re.compile(
+    r"^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+_SLUG_DROP_RE = re.compile(r"[^a-zA-Z0-9\-\s]")
+_WS_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1)
+def load_credentials(client_secret_path: str, token_path: str) -> Credentials:
+    creds = None
+    token_file = Path(token_path)
+    if token_file.exists():
+        creds = Credentials.from_authorized_user_file(str(token_file), SCOPES)
+
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
+            auth_url, _ = flow.authorization_url(
+                access_type="offline",
+                prompt="consent",
+            )
+            print("Open this URL in your browser, approve access, then paste the final URL:")
+            print(auth_url)
+            redirect_response = input("Paste full redirect URL: ").strip()
+            flow.fetch_token(authorization_response=redirect_response)
+            creds = flow.credentials
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(creds.to_json(), encoding="utf-8")
+
+    return creds
+
+
+def authorized_http(creds: Credentials) -> AuthorizedHttp:
+    # httplib2.Http keeps its connections open between requests, but is not thread-safe.
+    return AuthorizedHttp(creds, http=httplib2.Http(timeout=YOUTUBE_HTTP_TIMEOUT_S))
+
+
+@functools.lru_cache(maxsize=1)
+def get_authenticated_service(client_secret_path: str, token_path: str):
+    """Return a YouTube v3 client; repeated calls in one process reuse it."""
+    creds = load_credentials(client_secret_path, token_path)
+    # The bundled discovery document avoids fetching it over the network.
+    return build("youtube", "v3", http=authorized_http(creds), static_discovery=True)
+
+
+def parse_duration(value: str) -> int | None:
+    if not value:
+        return None
+    match = _ISO_DURATION_RE.match(value)
+    if not match:
+        return None
+    weeks, days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return (((weeks * 7 + days) * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def format_duration(value: int | None) -> str:
+    if value is None:
+        return "n/a"
+    minutes, seconds = divmod(value, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:d}:{seconds:02d}"
+
+
+def safe_slug(text: str) -> str:
+    if not text.isascii():
+        # Fold accents ("título" -> "titulo") instead of dropping the whole letter.
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = _SLUG_DROP_RE.sub("", text).strip().lower()
+    text = _WS_RE.sub("-", text)
+    return text or "video"
@@ -1,18 +1,95 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import json
 import os
 import re
-import shutil
 import subprocess
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import publish_youtube
+import schedule_newsletter
+import schedule_socials
+from prepare_video import move_file
+
 try:
     from zoneinfo import ZoneInfo
 except Exception:
     ZoneInfo = None
 
+_SLUG_DROP_RE = re.compile(r"[^a-zA-Z0-9\-\s]")
+_WS_RE = re.compile(r"\s+")
+
+_REPLACEMENT_PATTERNS = [
+    (r"\bcloudbot\b", "ClawdBot"),
+    (r"\bclawdbot\b", "ClawdBot"),
+    (r"\bcloudboat\b", "ClawdBot"),
+    (r"\bjust\s*do\s*it\b", "justdoit"),
+    (r"\bcloud\s+opus\b", "Claude Opus"),
+    (r"\bwhatsapp\b", "WhatsApp"),
+    (r"\btelegram\b", "Telegram"),
+    (r"\bgemini\b", "Gemini"),
+    (r"\bgoogle\s+places\b", "Google Places"),
+    (r"\bgmail\b", "Gmail"),
+    (r"\bgoogle\s+sheets\b", "Google Sheets"),
+    (r"\bgoogle\s+drive\b", "Google Drive"),
+    (r"\bx\b", "X"),
+]
+_REPLACEMENTS_RE = re.compile(
+    "|".join(f"(?P<g{i}>{pattern})" for i, (pattern, _) in enumerate(_REPLACEMENT_PATTERNS)),
+    re.IGNORECASE,
+)
+_REPLACEMENTS = {f"g{i}": repl for i, (_, repl) in enumerate(_REPLACEMENT_PATTERNS)}
+# A '## heading' line; its section runs up to the next line starting with '## '.
+_HEADING_RE = re.compile(r"^[ \t]*## ([^\n]+?)[ \t]*$", re.MULTILINE)
+_SECTION_END_RE = re.compile(r"^## |\Z", re.MULTILINE)
+
+CONCAT_STREAM_KEYS = (
+    "codec_type",
+    "codec_name",
+    "width",
+    "height",
+    "r_frame_rate",
+    "sample_aspect_ratio",
+    "sample_rate",
+    "channels",
+)
+DEFAULT_CONTENT_CACHE_DIR = os.path.expanduser("~/.cache/youtube-publish/content")
+
+_GEMINI_PROMPT = (
+    "Eres editor de YouTube. Con el SRT que recibes por stdin, genera en español:\n"
+    "- 3 títulos\n"
+    "- 3 ideas de thumbnails (texto corto)\n"
+    "- Descripción (1-2 párrafos)\n"
+    "- Capítulos con timestamps reales (formato MM:SS Título). 10-12 capítulos. No redondees.\n"
+    "- Post LinkedIn (optimizado para LinkedIn, conversacional)\n"
+    "- Newsletter (tono cercano, 220-320 palabras, CTA a comentar en el vídeo)\n\n"
+    "Newsletter estructura:\n"
+    "1) Saludo fijo: \"¡Hola DevExpert!\" + contexto personal breve (1-2 frases)\n"
+    "2) Desarrollo con 2-3 párrafos (qué probé, qué aprendí, por qué importa)\n"
+    "3) 'En el vídeo verás:' + 2-4 bullets\n"
+    "4) Línea con enlace en Markdown al vídeo (ej: [Ver el vídeo](URL))\n"
+    "5) Cierre cercano + CTA: deja tu opinión en los comentarios del vídeo\n"
+    "6) Despedida exacta con salto de línea: \"Un abrazo,\" luego línea en blanco y \"Antonio.\"\n"
+    "7) P.D. opcional (1 frase)\n"
+    "Incluye al inicio de la newsletter:\n"
+    "- Asunto (sin prefijo, se añadirá automáticamente): ...\n"
+    "Varía la apertura y el ritmo; evita plantillas repetitivas.\n"
+    "Incluye el enlace del vídeo en la newsletter.\n"
+    "Post LinkedIn reglas:\n"
+    "- 600–900 caracteres, 3–6 párrafos cortos, 1–2 emojis\n"
+    "- 1 idea central, sin desviarse\n"
+    "- Línea final: “Link en el primer comentario.”\n"
+    "- Cierre con pregunta breve o CTA a comentar\n"
+    "- Sin hashtags\n"
+    "En redes, indica que el enlace estará en el primer comentario (no pongas la URL ahí).\n"
+    "Reglas: no inventes; usa tokens exactos: ClawdBot, justdoit, MCP, Gemini, Google Places, WhatsApp, Telegram, Gmail, Google Sheets, Google Drive, X.\n"
+    "Salida: Markdown con encabezados exactamente: \n"
+    "## Títulos\n## Ideas de thumbnails\n## Descripción\n## Capítulos\n## LinkedIn\n## Newsletter\n"
+)
+
 
 def run(cmd, input_text=None):
     result = subprocess.run(
@@ -45,9 +122,9 @@ def detect_system_timezone() -> str | None:
         localtime = Path("/etc/localtime")
         if localtime.exists():
             target = os.path.realpath(localtime)
-            match = re.search(r"/zoneinfo/(.+)$", target)
-            if match:
-                return match.group(1)
+            _, sep, name = target.partition("/zoneinfo/")
+            if sep and name:
+                return name
     except Exception:
         pass
 
@@ -59,17 +136,18 @@ def detect_system_timezone() -> str | None:
             check=False,
         )
         if result.returncode == 0:
-            match = re.search(r"Time Zone:\\s*(\\S+)", result.stdout)
-            if match:
-                return match.group(1)
+            _, sep, rest = result.stdout.partition("Time Zone:")
+            words = rest.split()
+            if sep and words:
+                return words[0]
     except Exception:
         pass
 
     return None
 
 def safe_slug(text):
-    text = re.sub(r"[^a-zA-Z0-9\-\s]", "", text).strip().lower()
-    text = re.sub(r"\s+", "-", text)
+    text = _SLUG_DROP_RE.sub("", text).strip().lower()
+    text = _WS_RE.sub("-", text)
     return text or "video"
 
 
@@ -84,16 +162,90 @@ def move_inputs(videos, inputs_dir):
         if not src.exists():
             raise FileNotFoundError(f"Missing video: {src}")
         dst = inputs_dir / src.name
-        shutil.move(src, dst)
+        move_file(src, dst)
         moved.append(dst)
     return moved
 
 
+def probe_streams(video: Path):
+    """Return the properties that must match for a stream-copy concat, one tuple per stream."""
+    output = run([
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,width,height,r_frame_rate,sample_aspect_ratio,sample_rate,channels",
+        "-of",
+        "json",
+        str(video),
+    ])
+    return [
+        tuple(stream.get(key) for key in CONCAT_STREAM_KEYS)
+        for stream in json.loads(output).get("streams", [])
+        if stream.get("codec_type") in ("video", "audio")
+    ]
+
+
+def probe_duration(video: Path) -> float:
+    """Return the container duration of video in seconds."""
+    output = run(["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", str(video)])
+    return float(json.loads(output)["format"]["duration"])
+
+
+def concat_reencode(videos, out_path: Path, signatures):
+    # Inputs differ in codec, size or frame rate: decode each one once, normalize it to
+    # the first video's format and concatenate inside a single filter graph.
+    for v, sig in zip(videos, signatures):
+        if not any(s[0] == "video" for s in sig):
+            raise RuntimeError(f"No video stream in {v}")
+    video = next(s for s in signatures[0] if s[0] == "video")
+    width, height, fps = video[2], video[3], video[4]
+    audio = next((s for sig in signatures for s in sig if s[0] == "audio"), None)
+    has_audio = audio is not None
+
+    filters = []
+    labels = []
+    for i, (v, sig) in enumerate(zip(videos, signatures)):
+        filters.append(
+            f"[{i}:v:0]fps={fps},scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]"
+        )
+        labels.append(f"[v{i}]")
+        if not has_audio:
+            continue
+        if any(s[0] == "audio" for s in sig):
+            filters.append(f"[{i}:a:0]aformat=sample_rates={audio[6]}:channel_layouts=stereo[a{i}]")
+        else:
+            # concat needs an audio segment for every input: fill silent clips with silence.
+            filters.append(
+                f"anullsrc=channel_layout=stereo:sample_rate={audio[6]},"
+                f"atrim=duration={probe_duration(v)}[a{i}]"
+            )
+        labels.append(f"[a{i}]")
+    outputs = "[v][a]" if has_audio else "[v]"
+    filters.append(f"{''.join(labels)}concat=n={len(videos)}:v=1:a={int(has_audio)}{outputs}")
+
+    cmd = ["ffmpeg", "-y"]
+    for v in videos:
+        cmd += ["-i", str(v)]
+    cmd += ["-filter_complex", ";".join(filters), "-map", "[v]"]
+    if has_audio:
+        cmd += ["-map", "[a]", "-c:a", "aac", "-b:a", "192k"]
+    cmd += ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p", str(out_path)]
+    run(cmd)
+    return out_path
+
+
 def concat_videos(videos, out_path: Path):
+    # The concat demuxer with -c copy only works when every input has the same streams;
+    # otherwise ffmpeg writes a broken file without failing, so check first.
+    signatures = [probe_streams(v) for v in videos]
+    if any(sig != signatures[0] for sig in signatures[1:]):
+        print("Input videos differ in codec/size/frame rate; re-encoding the concatenation.")
+        return concat_reencode(videos, out_path, signatures)
+
     list_file = out_path.parent / "concat_list.txt"
-    with list_file.open("w", encoding="utf-8") as f:
-        for v in videos:
-            f.write(f"file '{v.as_posix()}'\n")
+    list_file.write_text("".join(f"file '{v.as_posix()}'\n" for v in videos), encoding="utf-8")
     cmd = [
         "ffmpeg",
         "-y",
@@ -128,50 +280,54 @@ def transcribe_parakeet(video_path: Path, workdir: Path):
     return srt_path
 
 
-def apply_replacements(text, replacements):
-    for pattern, repl in replacements:
-        text = re.sub(pattern, repl, text, flags=re.IGNORECASE)
-    text = re.sub(r"\b[xX]\b", "X", text)
-    return text
-
-
-def generate_content_md(srt_text, workdir: Path, title_hint: str, video_url: str | None):
-    prompt = (
-        "Eres editor de YouTube. Con el SRT que recibes por stdin, genera en español:\n"
-        "- 3 títulos\n"
-        "- 3 ideas de thumbnails (texto corto)\n"
-        "- Descripción (1-2 párrafos)\n"
-        "- Capítulos con timestamps reales (formato MM:SS Título). 10-12 capítulos. No redondees.\n"
-        "- Post LinkedIn (optimizado para LinkedIn, conversacional)\n"
-        "- Newsletter (tono cercano, 220-320 palabras, CTA a comentar en el vídeo)\n\n"
-        "Newsletter estructura:\n"
-        "1) Saludo fijo: \"¡Hola DevExpert!\" + contexto personal breve (1-2 frases)\n"
-        "2) Desarrollo con 2-3 párrafos (qué probé, qué aprendí, por qué importa)\n"
-        "3) 'En el vídeo verás:' + 2-4 bullets\n"
-        "4) Línea con enlace en Markdown al vídeo (ej: [Ver el vídeo](URL))\n"
-        "5) Cierre cercano + CTA: deja tu opinión en los comentarios del vídeo\n"
-        "6) Despedida exacta con salto de línea: \"Un abrazo,\" luego línea en blanco y \"Antonio.\"\n"
-        "7) P.D. opcional (1 frase)\n"
-        "Incluye al inicio de la newsletter:\n"
-        "- Asunto (sin prefijo, se añadirá automáticamente): ...\n"
-        "Varía la apertura y el ritmo; evita plantillas repetitivas.\n"
-        "Incluye el enlace del vídeo en la newsletter.\n"
-        "Post LinkedIn reglas:\n"
-        "- 600–900 caracteres, 3–6 párrafos cortos, 1–2 emojis\n"
-        "- 1 idea central, sin desviarse\n"
-        "- Línea final: “Link en el primer comentario.”\n"
-        "- Cierre con pregunta breve o CTA a comentar\n"
-        "- Sin hashtags\n"
-        "En redes, indica que el enlace estará en el primer comentario (no pongas la URL ahí).\n"
-        "Reglas: no inventes; usa tokens exactos: ClawdBot, justdoit, MCP, Gemini, Google Places, WhatsApp, Telegram, Gmail, Google Sheets, Google Drive, X.\n"
-        "Salida: Markdown con encabezados exactamente: \n"
-        "## Títulos\n## Ideas de thumbnails\n## Descripción\n## Capítulos\n## LinkedIn\n## Newsletter\n"
-    )
-    if video_url:
-        prompt = f"Enlace del vídeo: {video_url}\n\n" + prompt
+def apply_replacements(text):
+    # One pass over the transcript: the first alternative that matches decides the replacement.
+    return _REPLACEMENTS_RE.sub(lambda m: _REPLACEMENTS[m.lastgroup], text)
+
+
+def content_cache_path(cache_dir: Path, prompt: str, srt_text: str) -> Path:
+    key = hashlib.sha256(f"{prompt}\0{srt_text}".encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.md"
+
+
+def generate_gemini_output(prompt: str, srt_text: str, cache_dir: Path | None) -> str:
+    # Re-running the flow on the same transcript reuses the answer instead of calling gemini.
+    cache_path = content_cache_path(cache_dir, prompt, srt_text) if cache_dir else None
+    if cache_path:
+        try:
+            return cache_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            pass
 
     output = run(["gemini", prompt], input_text=srt_text)
 
+    if cache_path and output.strip():
+        # The cache is an optimization; a read-only or full disk must not lose the answer.
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(output, encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError as exc:
+            print(f"Could not cache gemini output: {exc}", file=sys.stderr)
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+    return output
+
+
+def generate_content_md(
+    srt_text,
+    workdir: Path,
+    title_hint: str,
+    video_url: str | None,
+    cache_dir: Path | None = None,
+):
+    prompt = f"Enlace del vídeo: {video_url}\n\n{_GEMINI_PROMPT}" if video_url else _GEMINI_PROMPT
+
+    output = generate_gemini_output(prompt, srt_text, cache_dir)
+
     template = f"""# Pack YouTube — {title_hint or 'Sin título'}
 
 ## Enlace del vídeo
@@ -203,23 +359,21 @@ def generate_content_md(srt_text, workdir: Path, title_hint: str, video_url: str
     return out_path
 
 
-def extract_section(md_text, heading):
-    pattern = rf"^## {re.escape(heading)}\s*$"
-    lines = md_text.splitlines()
-    out = []
-    capture = False
-    for line in lines:
-        if re.match(pattern, line.strip()):
-            capture = True
+def parse_sections(md_text):
+    """Map every '## heading' in md_text to its stripped body; the first occurrence wins."""
+    sections = {}
+    for match in _HEADING_RE.finditer(md_text):
+        heading = match.group(1)
+        if heading in sections:
             continue
-        if capture and line.startswith("## "):
-            break
-        if capture:
-            out.append(line)
-    return "\n".join(out).strip()
+        # Headings may be indented, but only one in column 0 closes the section, so a
+        # repeated or indented heading stays inside the body as it did with extract_section.
+        end = _SECTION_END_RE.search(md_text, match.end()).start()
+        sections[heading] = md_text[match.end():end].strip()
+    return sections
 
 
-def validate_final_content(md_text: str, workdir: Path, require_thumbnail: bool) -> None:
+def validate_final_content(sections: dict, workdir: Path, require_thumbnail: bool) -> None:
     required_sections = [
         ("Título (final)", "title"),
         ("Descripción (final)", "description"),
@@ -233,11 +387,11 @@ def validate_final_content(md_text: str, workdir: Path, require_thumbnail: bool)
     warnings = []
 
     for heading, label in required_sections:
-        content = extract_section(md_text, heading)
+        content = sections.get(heading, "")
         if not content:
             errors.append(f"Missing {label} in '{heading}'.")
 
-    thumbnail = extract_section(md_text, "Thumbnail (final)")
+    thumbnail = sections.get("Thumbnail (final)", "")
     if require_thumbnail and not thumbnail:
         errors.append("Missing thumbnail path in 'Thumbnail (final)'.")
     if thumbnail:
@@ -271,6 +425,12 @@ def main():
     parser.add_argument("--timezone")
     parser.add_argument("--thumbnail", help="Thumbnail path (optional, final)")
     parser.add_argument("--privacy-status", help="private|unlisted|public")
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CONTENT_CACHE_DIR,
+        help="Cache of gemini output keyed by prompt and transcript",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always call gemini for content.md")
     args = parser.parse_args()
 
     now = datetime.now().strftime("%Y-%m-%d_%H%M")
@@ -285,8 +445,8 @@ def main():
     if len(moved) == 1:
         original = moved[0]
         video_out = workdir / f"{slug}.mp4"
-        if original.resolve() != video_out.resolve():
-            shutil.move(original, video_out)
+        # inputs/ is inside workdir, so this is a plain rename.
+        move_file(original, video_out)
     else:
         video_out = workdir / f"{slug}.mp4"
         concat_videos(moved, video_out)
@@ -297,10 +457,8 @@ def main():
         draft_title = args.title_hint or video_out.stem.replace("-", " ").title()
         draft_desc = workdir / "description.draft.txt"
         draft_desc.write_text("Draft upload. Metadata will be updated.", encoding="utf-8")
-        video_id_path = workdir / "video_id.txt"
-        cmd = [
-            sys.executable,
-            str(Path(__file__).parent / "publish_youtube.py"),
+        # publish_youtube and the schedulers run in-process: no interpreter start-up per step.
+        video_id = publish_youtube.main([
             "--video",
             str(video_out),
             "--title",
@@ -309,54 +467,35 @@ def main():
             str(draft_desc),
             "--privacy-status",
             "private",
-            "--output-video-id",
-            str(video_id_path),
             "--client-secret",
             args.client_secret,
-        ]
-        run(cmd)
-        if video_id_path.exists():
-            video_id = video_id_path.read_text(encoding="utf-8").strip()
-            if video_id:
-                video_url = f"https://www.youtube.com/watch?v={video_id}"
-                (workdir / "video_url.txt").write_text(video_url, encoding="utf-8")
+        ])
+        if video_id:
+            video_url = f"https://www.youtube.com/watch?v={video_id}"
+            (workdir / "video_url.txt").write_text(video_url, encoding="utf-8")
 
     srt_path = None
     cleaned_srt_path = None
+    cleaned = None
 
     if not args.skip_transcribe:
         srt_path = transcribe_parakeet(video_out, workdir)
         srt_text = srt_path.read_text(encoding="utf-8")
 
-        replacements = [
-            (r"\bcloudbot\b", "ClawdBot"),
-            (r"\bclawdbot\b", "ClawdBot"),
-            (r"\bcloudboat\b", "ClawdBot"),
-            (r"\bjust\s*do\s*it\b", "justdoit"),
-            (r"\bcloud\s+opus\b", "Claude Opus"),
-            (r"\bwhatsapp\b", "WhatsApp"),
-            (r"\btelegram\b", "Telegram"),
-            (r"\bgemini\b", "Gemini"),
-            (r"\bgoogle\s+places\b", "Google Places"),
-            (r"\bgmail\b", "Gmail"),
-            (r"\bgoogle\s+sheets\b", "Google Sheets"),
-            (r"\bgoogle\s+drive\b", "Google Drive"),
-        ]
-        cleaned = apply_replacements(srt_text, replacements)
+        cleaned = apply_replacements(srt_text)
         cleaned_srt_path = workdir / "transcript.es.cleaned.srt"
         cleaned_srt_path.write_text(cleaned, encoding="utf-8")
-    else:
-        cleaned_srt_path = None
 
     content_path = None
     if not args.skip_gemini:
-        if not cleaned_srt_path:
+        if cleaned is None:
             raise RuntimeError("No transcript available for gemini generation")
         content_path = generate_content_md(
-            cleaned_srt_path.read_text(encoding="utf-8"),
+            cleaned,
             workdir,
             args.title_hint or "",
             video_url,
+            cache_dir=None if args.no_cache else Path(os.path.expanduser(args.cache_dir)),
         )
 
     if content_path:
@@ -367,12 +506,12 @@ def main():
     if args.upload:
         if not content_path:
             raise RuntimeError("content.md required for upload")
-        md = content_path.read_text(encoding="utf-8")
-        validate_final_content(md, workdir, require_thumbnail=not args.thumbnail)
-        title = extract_section(md, "Título (final)")
-        description = extract_section(md, "Descripción (final)")
-        thumbnail = extract_section(md, "Thumbnail (final)") or args.thumbnail
-        publish_at = extract_section(md, "Programación (final)") or args.publish_at
+        sections = parse_sections(content_path.read_text(encoding="utf-8"))
+        validate_final_content(sections, workdir, require_thumbnail=not args.thumbnail)
+        title = sections.get("Título (final)", "")
+        description = sections.get("Descripción (final)", "")
+        thumbnail = sections.get("Thumbnail (final)", "") or args.thumbnail
+        publish_at = sections.get("Programación (final)", "") or args.publish_at
         schedule_input = (publish_at or "").strip()
         force_private = False
         explicit_private = schedule_input.lower() in {"private", "privado"}
@@ -386,9 +525,7 @@ def main():
         desc_file = workdir / "description.final.txt"
         desc_file.write_text(description, encoding="utf-8")
 
-        cmd = [
-            sys.executable,
-            str(Path(__file__).parent / "publish_youtube.py"),
+        publish_argv = [
             "--title",
             title.strip(),
             "--description-file",
@@ -397,11 +534,11 @@ def main():
             args.client_secret,
         ]
         if video_id:
-            cmd += ["--update-video-id", video_id]
+            publish_argv += ["--update-video-id", video_id]
         else:
-            cmd += ["--video", str(video_out)]
+            publish_argv += ["--video", str(video_out)]
         if thumbnail:
-            cmd += ["--thumbnail", thumbnail.strip()]
+            publish_argv += ["--thumbnail", thumbnail.strip()]
         scheduled_iso = None
         if schedule_input:
             timezone_name = args.timezone or detect_system_timezone()
@@ -410,19 +547,19 @@ def main():
             publish_dt = parse_local_datetime(schedule_input.strip(), timezone_name)
             scheduled_dt = publish_dt + timedelta(minutes=15)
             scheduled_iso = scheduled_dt.isoformat()
-            cmd += ["--timezone", timezone_name]
-            cmd += ["--publish-at", schedule_input.strip()]
+            publish_argv += ["--timezone", timezone_name]
+            publish_argv += ["--publish-at", schedule_input.strip()]
         if force_private:
-            cmd += ["--privacy-status", "private"]
+            publish_argv += ["--privacy-status", "private"]
         if args.privacy_status:
-            cmd += ["--privacy-status", args.privacy_status]
+            publish_argv += ["--privacy-status", args.privacy_status]
 
-        run(cmd)
+        video_id = publish_youtube.main(publish_argv)
 
         if scheduled_iso:
-            linkedin_text = extract_section(md, "Post LinkedIn (final)")
-            subject = extract_section(md, "Asunto newsletter (final)")
-            newsletter = extract_section(md, "Newsletter (final)")
+            linkedin_text = sections.get("Post LinkedIn (final)", "")
+            subject = sections.get("Asunto newsletter (final)", "")
+            newsletter = sections.get("Newsletter (final)", "")
 
             if not linkedin_text or not subject or not newsletter:
                 raise RuntimeError("Missing LinkedIn/Newsletter sections for scheduling")
@@ -433,20 +570,17 @@ def main():
             newsletter_path = workdir / "newsletter.final.md"
             newsletter_path.write_text(newsletter.strip(), encoding="utf-8")
 
-            social_cmd = [
-                sys.executable,
-                str(Path(__file__).parent / "schedule_socials.py"),
+            schedule_socials.main([
                 "--text-file",
                 str(linkedin_path),
                 "--scheduled-date",
                 scheduled_iso,
-            ]
-            run(social_cmd)
+                "--comment-url",
+                f"https://www.youtube.com/watch?v={video_id}",
+            ])
 
             campaign_name = f"YouTube: {title.strip()}"
-            news_cmd = [
-                sys.executable,
-                str(Path(__file__).parent / "schedule_newsletter.py"),
+            schedule_newsletter.main([
                 "--name",
                 campaign_name,
                 "--subject",
@@ -455,8 +589,7 @@ def main():
                 str(newsletter_path),
                 "--send-at",
                 scheduled_iso,
-            ]
-            run(news_cmd)
+            ])
 
     print(f"Workdir: {workdir}")
     print(f"Final video: {video_out}")
@@ -9,15 +9,29 @@ Requires env:
 
 import argparse
 import base64
+import http.client
+import io
 import json
 import os
 import sys
+import threading
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
 from datetime import datetime
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
 API_BASE = "https://api.zoom.us/v2"
 TOKEN_URL = "https://zoom.us/oauth/token"
+TOKEN_EXPIRY_MARGIN_S = 60
+
+# One keep-alive connection to the API, reused across the pagination requests.
+_LOCAL = threading.local()
 
 
 def die(msg):
@@ -25,6 +39,12 @@ def die(msg):
     sys.exit(1)
 
 
+def json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def get_env(name):
     val = os.environ.get(name)
     if not val:
@@ -32,11 +52,54 @@ def get_env(name):
     return val
 
 
+def token_cache_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "zoom-token.json")
+
+
+def read_cached_token(account_id, client_id):
+    try:
+        with open(token_cache_path(), "rb") as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if cached.get("account_id") != account_id or cached.get("client_id") != client_id:
+        return None
+    if time.time() >= cached.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN_S:
+        return None
+    return cached.get("access_token")
+
+
+def write_cached_token(account_id, client_id, token, expires_in):
+    path = token_cache_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    payload = {
+        "account_id": account_id,
+        "client_id": client_id,
+        "access_token": token,
+        "expires_at": time.time() + expires_in,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+    except OSError:
+        # The cache only saves a round-trip; never fail the command over it.
+        pass
+
+
 def get_token():
     account_id = get_env("ZOOM_ACCOUNT_ID")
     client_id = get_env("ZOOM_CLIENT_ID")
     client_secret = get_env("ZOOM_CLIENT_SECRET")
 
+    # Tokens last an hour; reuse the last one instead of a POST per invocation.
+    cached = read_cached_token(account_id, client_id)
+    if cached:
+        return cached
+
     basic = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
     params = urllib.parse.urlencode({
         "grant_type": "account_credentials",
@@ -48,18 +111,59 @@ def get_token():
         headers={"Authorization": f"Basic {basic}"},
     )
     with urllib.request.urlopen(req) as resp:
-        data = json.loads(resp.read().decode())
-    return data.get("access_token")
+        data = json_loads(resp.read())
+    token = data.get("access_token")
+    if token:
+        write_cached_token(account_id, client_id, token, data.get("expires_in", 3600))
+    return token
+
+
+def _drop_connection():
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        conn.close()
+    _LOCAL.conn = None
+
+
+def _send(method, url_path, headers, data=None):
+    """Send one request on this thread's keep-alive connection; return (response, body)."""
+    while True:
+        conn = getattr(_LOCAL, "conn", None)
+        if conn is None:
+            parts = urllib.parse.urlsplit(API_BASE)
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = _LOCAL.conn = conn_cls(parts.netloc)
+        reused = conn.sock is not None
+        sent = False
+        try:
+            conn.request(method, url_path, body=data, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (http.client.HTTPException, ConnectionError):
+            _drop_connection()
+            # A stale keep-alive connection gets one retry on a fresh one, but a DELETE or
+            # PATCH that already went out may have been applied, so only a GET is resent then.
+            if reused and (not sent or method == "GET"):
+                continue
+            raise
+        except Exception:
+            _drop_connection()
+            raise
+        if resp.will_close:
+            _drop_connection()
+        return resp, raw
 
 
 def api_request(method, path, token, params=None):
-    url = f"{API_BASE}{path}"
-    if params:
-        url += "?" + urllib.parse.urlencode(params)
+    query = "?" + urllib.parse.urlencode(params) if params else ""
+    url = f"{API_BASE}{path}{query}"
+    url_path = f"{urllib.parse.urlsplit(API_BASE).path}{path}{query}"
     headers = {"Authorization": f"Bearer {token}"}
-    req = urllib.request.Request(url, method=method, headers=headers)
-    with urllib.request.urlopen(req) as resp:
-        return resp.read().decode()
+    resp, raw = _send(method, url_path, headers)
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(raw))
+    return raw
 
 
 def parse_date(s):
@@ -88,12 +192,12 @@ def list_meetings(args, token):
 
     meetings = []
     while True:
-        payload = json.loads(api_request("GET", path, token, params=params))
+        payload = json_loads(api_request("GET", path, token, params=params))
         meetings.extend(payload.get("meetings", []))
         next_token = payload.get("next_page_token") or ""
         if not next_token:
             break
-        params = {**params, "next_page_token": next_token}
+        params["next_page_token"] = next_token
 
     if from_dt or to_dt:
         filtered = []
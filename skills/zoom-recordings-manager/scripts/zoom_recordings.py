@@ -9,16 +9,42 @@ Requires env:
 
 import argparse
 import base64
+import http.client
+import io
 import json
 import os
+import shutil
+import string
 import sys
+import threading
+import time
 import unicodedata
+import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None
+
 API_BASE = "https://api.zoom.us/v2"
 TOKEN_URL = "https://zoom.us/oauth/token"
+TOKEN_EXPIRY_MARGIN_S = 60
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+LIST_CONCURRENCY = 4
+RATE_LIMIT_RETRIES = 3
+
+# One keep-alive connection to the API per thread, reused across api_request()s.
+_LOCAL = threading.local()
+
+# ASCII-only after NFKD folding: keep [A-Za-z0-9 -_.()], '/' and ':' become '-', the rest '_'.
+_FILENAME_KEEP = frozenset(string.ascii_letters + string.digits + " -_.()")
+_FILENAME_TABLE = {
+    c: "-" if chr(c) in "/:" else (chr(c) if chr(c) in _FILENAME_KEEP else "_") for c in range(128)
+}
 
 
 def die(msg):
@@ -26,6 +52,12 @@ def die(msg):
     sys.exit(1)
 
 
+def json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def get_env(name):
     val = os.environ.get(name)
     if not val:
@@ -33,11 +65,54 @@ def get_env(name):
     return val
 
 
+def token_cache_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "zoom-token.json")
+
+
+def read_cached_token(account_id, client_id):
+    try:
+        with open(token_cache_path(), "rb") as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if cached.get("account_id") != account_id or cached.get("client_id") != client_id:
+        return None
+    if time.time() >= cached.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN_S:
+        return None
+    return cached.get("access_token")
+
+
+def write_cached_token(account_id, client_id, token, expires_in):
+    path = token_cache_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    payload = {
+        "account_id": account_id,
+        "client_id": client_id,
+        "access_token": token,
+        "expires_at": time.time() + expires_in,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+    except OSError:
+        # The cache only saves a round-trip; never fail the command over it.
+        pass
+
+
 def get_token():
     account_id = get_env("ZOOM_ACCOUNT_ID")
     client_id = get_env("ZOOM_CLIENT_ID")
     client_secret = get_env("ZOOM_CLIENT_SECRET")
 
+    # Tokens last an hour; reuse the last one instead of a POST per invocation.
+    cached = read_cached_token(account_id, client_id)
+    if cached:
+        return cached
+
     basic = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
     params = urllib.parse.urlencode({
         "grant_type": "account_credentials",
@@ -49,27 +124,72 @@ def get_token():
         headers={"Authorization": f"Basic {basic}"},
     )
     with urllib.request.urlopen(req) as resp:
-        data = json.loads(resp.read().decode())
-    return data.get("access_token")
+        data = json_loads(resp.read())
+    token = data.get("access_token")
+    if token:
+        write_cached_token(account_id, client_id, token, data.get("expires_in", 3600))
+    return token
+
+
+def _drop_connection():
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        conn.close()
+    _LOCAL.conn = None
+
+
+def _send(method, url_path, headers, data=None):
+    """Send one request on this thread's keep-alive connection; return (response, body)."""
+    while True:
+        conn = getattr(_LOCAL, "conn", None)
+        if conn is None:
+            parts = urllib.parse.urlsplit(API_BASE)
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = _LOCAL.conn = conn_cls(parts.netloc)
+        reused = conn.sock is not None
+        sent = False
+        try:
+            conn.request(method, url_path, body=data, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (http.client.HTTPException, ConnectionError):
+            _drop_connection()
+            # A stale keep-alive connection gets one retry on a fresh one, but a DELETE or
+            # PATCH that already went out may have been applied, so only a GET is resent then.
+            if reused and (not sent or method == "GET"):
+                continue
+            raise
+        except Exception:
+            _drop_connection()
+            raise
+        if resp.will_close:
+            _drop_connection()
+        return resp, raw
 
 
 def api_request(method, path, token, params=None, body=None):
-    url = f"{API_BASE}{path}"
-    if params:
-        url += "?" + urllib.parse.urlencode(params)
+    query = "?" + urllib.parse.urlencode(params) if params else ""
+    url = f"{API_BASE}{path}{query}"
+    url_path = f"{urllib.parse.urlsplit(API_BASE).path}{path}{query}"
     headers = {"Authorization": f"Bearer {token}"}
     data = None
     if body is not None:
         data = json.dumps(body).encode()
         headers["Content-Type"] = "application/json"
-    req = urllib.request.Request(url, method=method, headers=headers, data=data)
-    with urllib.request.urlopen(req) as resp:
-        return resp.read().decode()
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        resp, raw = _send(method, url_path, headers, data)
+        if resp.status < 400:
+            return raw
+        # Parallel listing can hit Zoom's rate limit; wait as told and retry.
+        if resp.status != 429 or attempt == RATE_LIMIT_RETRIES:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(raw))
+        retry_after = resp.headers.get("Retry-After", "")
+        time.sleep(int(retry_after) if retry_after.isdigit() else 2 ** attempt)
 
 
 def list_recordings_page(path, token, params):
-    out = api_request("GET", path, token, params=params)
-    return json.loads(out)
+    return json_loads(api_request("GET", path, token, params=params))
 
 
 def parse_date(s):
@@ -94,15 +214,7 @@ def iter_ranges(from_date, to_date, max_days=30):
 
 def sanitize_filename(name):
     name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
-    name = name.replace("/", "-").replace(":", "-")
-    name = " ".join(name.split())
-    out = []
-    for ch in name:
-        if ch.isalnum() or ch in (" ", "-", "_", ".", "(", ")"):
-            out.append(ch)
-        else:
-            out.append("_")
-    return "".join(out).strip()
+    return " ".join(name.split()).translate(_FILENAME_TABLE).strip()
 
 
 def match_filter(text, pattern):
@@ -111,10 +223,10 @@ def match_filter(text, pattern):
 
 
 def download_url(url, out_path, token):
-    if "access_token=" not in url:
-        sep = "&" if "?" in url else "?"
-        url = f"{url}{sep}access_token={token}"
-    urllib.request.urlretrieve(url, out_path)
+    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    # urlretrieve copies in 8 KiB reads; recordings are often GBs.
+    with urllib.request.urlopen(req) as resp, open(out_path, "wb") as f:
+        shutil.copyfileobj(resp, f, length=DOWNLOAD_CHUNK_SIZE)
 
 
 def capture_list_json(args, token):
@@ -127,25 +239,35 @@ def capture_list_json(args, token):
     if not args.from_date or not args.to_date:
         die("list requires --from and --to (YYYY-MM-DD)")
 
-    all_meetings = []
-    for start, end in iter_ranges(args.from_date, args.to_date, max_days=30):
+    def fetch_range(date_range):
+        start, end = date_range
         params = {"from": start, "to": end, "page_size": args.page_size}
         if args.page_number:
             params["page_number"] = args.page_number
 
         page = list_recordings_page(path, token, params)
-        all_meetings.extend(page.get("meetings", []))
+        meetings = list(page.get("meetings", []))
         next_token = page.get("next_page_token") or ""
         while next_token:
-            params = {"from": start, "to": end, "page_size": args.page_size, "next_page_token": next_token}
+            # Follow-up pages are addressed by the token alone.
+            params.pop("page_number", None)
+            params["next_page_token"] = next_token
             page = list_recordings_page(path, token, params)
-            all_meetings.extend(page.get("meetings", []))
+            meetings.extend(page.get("meetings", []))
             next_token = page.get("next_page_token") or ""
+        return meetings
 
+    # The 30-day windows are independent: page through them side by side.
+    # map() keeps range order, so the output order doesn't change.
+    ranges = list(iter_ranges(args.from_date, args.to_date, max_days=30))
     dedup = {}
-    for m in all_meetings:
-        dedup[m.get("uuid")] = m
+    with ThreadPoolExecutor(max_workers=min(LIST_CONCURRENCY, len(ranges) or 1)) as executor:
+        for meetings in executor.map(fetch_range, ranges):
+            for m in meetings:
+                dedup[m.get("uuid")] = m
     out = {"from": args.from_date, "to": args.to_date, "total_records": len(dedup), "meetings": list(dedup.values())}
+    if orjson is not None:
+        return orjson.dumps(out).decode()
     return json.dumps(out)
 
 
@@ -171,7 +293,7 @@ def delete_recording(args, token):
     else:
         path = f"/meetings/{meeting_id}/recordings"
     out = api_request("DELETE", path, token, params=params)
-    print(out)
+    print(out.decode())
 
 
 def download_mp4_filtered(args, token):
@@ -188,10 +310,12 @@ def download_mp4_filtered(args, token):
     t.page_number = args.page_number
     t.user = args.user
 
-    data = json.loads(capture_list_json(t, token))
+    data = json_loads(capture_list_json(t, token))
     meetings = data.get("meetings", [])
     os.makedirs(args.out_dir, exist_ok=True)
 
+    # out_path -> url; a later MP4 with the same name replaces the earlier one, as before.
+    downloads = {}
     for m in meetings:
         topic = m.get("topic", "")
         if not topic:
@@ -209,8 +333,17 @@ def download_mp4_filtered(args, token):
             if not url:
                 continue
             out_path = os.path.join(args.out_dir, f"{base}.mp4")
-            download_url(url, out_path, token)
-            print(f"Downloaded: {out_path}")
+            downloads[out_path] = url
+
+    # Each download waits on the Zoom CDN, so several streams fill the link better than one.
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(download_url, url, out_path, token): out_path
+            for out_path, url in downloads.items()
+        }
+        for future in as_completed(futures):
+            future.result()
+            print(f"Downloaded: {futures[future]}")
 
 
 
@@ -243,9 +376,12 @@ def main():
     p_dlf.add_argument("--out-dir", required=True)
     p_dlf.add_argument("--page-size", type=int, default=300)
     p_dlf.add_argument("--page-number", type=int, default=1)
+    p_dlf.add_argument("--concurrency", type=int, default=4, help="Parallel downloads (default: 4)")
 
 
     args = parser.parse_args()
+    if args.cmd == "download-mp4" and args.concurrency <= 0:
+        die("--concurrency must be > 0")
     token = get_token()
     if not token:
         die("Failed to obtain access token")